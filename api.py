@@ -1,13 +1,20 @@
-from fastapi import APIRouter, UploadFile, Form, HTTPException
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from enum import Enum
+from typing import List, Optional
+import json
 import os
 
+from config import Config
+
 from document_system import document_system
 from services.pdf_service import PDFClass
 from services.youtube_service import YouTubeClass
 from services.web_service import WebClass
 from services.text_service import TextClass
+from sources.http_client import connection_stats
+from sources.video_transcript import parse_playlist_export
+from summarizer.llm_cache import get_llm_cache
 
 # Initialize services
 pdf_service = PDFClass()
@@ -23,34 +30,156 @@ DocumentTypeEnum = Enum(
     {t.replace(" ", "_"): t for t in document_system.list_document_types()}
 )
 
+STREAM_FORMATS = ("ndjson", "sse")
+
+
+def check_stream_format(stream: Optional[str]):
+    if stream and stream not in STREAM_FORMATS:
+        raise HTTPException(status_code=400, detail=f"stream must be one of {', '.join(STREAM_FORMATS)}")
+
+
+def stream_events(events, stream: str = "ndjson") -> StreamingResponse:
+    """Send progress/delta events as NDJSON lines or Server-Sent Events as they are produced."""
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}  # keep proxies from buffering
+    if stream == "sse":
+        return StreamingResponse(
+            (f"event: {event['event']}\ndata: {json.dumps(event)}\n\n" async for event in events),
+            media_type="text/event-stream",
+            headers=headers
+        )
+    return StreamingResponse(
+        (json.dumps(event) + "\n" async for event in events),
+        media_type="application/x-ndjson",
+        headers=headers
+    )
+
 @router.post("/pdf")
-async def summarize_pdf(file: UploadFile, doc_type: DocumentTypeEnum = Form(...), pages: int = Form(2)):
+async def summarize_pdf(
+    file: UploadFile,
+    doc_type: DocumentTypeEnum = Form(...),
+    pages: int = Form(2),
+    stream: Optional[str] = Form(None),
+    no_cache: bool = Form(False)
+):
+    check_stream_format(stream)
+    if stream:
+        # Read the upload now; it is closed once this handler returns.
+        return stream_events(pdf_service.stream_pdf(file.filename, await file.read(), doc_type, pages, not no_cache), stream)
     try:
-        return await pdf_service.process_pdf(file, doc_type, pages)
+        return await pdf_service.process_pdf(file, doc_type, pages, not no_cache)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/pdf/batch")
+async def summarize_pdf_batch(
+    files: List[UploadFile],
+    doc_type: DocumentTypeEnum = Form(...),
+    pages: int = Form(2),
+    combined_report: bool = Form(False),
+    stream: bool = Form(True)
+):
+    if len(files) > Config.BATCH_MAX_FILES:
+        raise HTTPException(status_code=400, detail=f"At most {Config.BATCH_MAX_FILES} files per batch")
+    # Read uploads now; they are closed once this handler returns.
+    uploads = [(f.filename, await f.read()) for f in files]
+    events = pdf_service.process_pdf_batch(uploads, doc_type, pages, combined_report)
+    if stream:
+        return stream_events(events)
+    try:
+        async for event in events:
+            final = event
+        return final
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/youtube")
-async def summarize_youtube(url: str = Form(...), doc_type: DocumentTypeEnum = Form(...), pages: int = Form(2)):
+async def summarize_youtube(
+    url: str = Form(...),
+    doc_type: DocumentTypeEnum = Form(...),
+    pages: int = Form(2),
+    stream: Optional[str] = Form(None),
+    no_cache: bool = Form(False)
+):
+    check_stream_format(stream)
+    if stream:
+        return stream_events(youtube_service.stream_youtube(url, doc_type, pages, not no_cache), stream)
+    try:
+        return await youtube_service.process_youtube(url, doc_type, pages, not no_cache)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/youtube/batch")
+async def summarize_youtube_batch(
+    urls: List[str] = Form([]),
+    playlist: Optional[UploadFile] = File(None),
+    doc_type: DocumentTypeEnum = Form(...),
+    pages: int = Form(2),
+    stream: bool = Form(True)
+):
+    """
+    One summary for many videos. Pass `urls` (repeated fields or one per line)
+    and/or a `playlist` export file (yt-dlp JSON, Takeout CSV or a URL list).
+    """
+    video_urls = parse_playlist_export("\n".join(urls).encode())
+    if playlist is not None:
+        video_urls += [u for u in parse_playlist_export(await playlist.read()) if u not in video_urls]
+    if not video_urls:
+        raise HTTPException(status_code=400, detail="No YouTube video URLs or IDs found")
+    if len(video_urls) > Config.YOUTUBE_BATCH_MAX_VIDEOS:
+        raise HTTPException(status_code=400, detail=f"At most {Config.YOUTUBE_BATCH_MAX_VIDEOS} videos per batch")
+    events = youtube_service.process_youtube_batch(video_urls, doc_type, pages)
+    if stream:
+        return stream_events(events)
     try:
-        return await youtube_service.process_youtube(url, doc_type, pages)
+        async for event in events:
+            final = event
+        return final
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/web")
-async def summarize_web(query: str = Form(...), doc_type: DocumentTypeEnum = Form(...), pages: int = Form(2)):
+async def summarize_web(
+    query: str = Form(...),
+    doc_type: DocumentTypeEnum = Form(...),
+    pages: int = Form(2),
+    stream: Optional[str] = Form(None),
+    no_cache: bool = Form(False)
+):
+    check_stream_format(stream)
+    if stream:
+        return stream_events(web_service.stream_web(query, doc_type, pages, not no_cache), stream)
     try:
-        return await web_service.process_web(query, doc_type, pages)
+        return await web_service.process(query, doc_type, pages, not no_cache)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/text")
-async def summarize_text(text: str = Form(...), doc_type: DocumentTypeEnum = Form(...), pages: int = Form(2)):
+async def summarize_text(
+    text: str = Form(...),
+    doc_type: DocumentTypeEnum = Form(...),
+    pages: int = Form(2),
+    stream: Optional[str] = Form(None),
+    no_cache: bool = Form(False)
+):
+    check_stream_format(stream)
+    if stream:
+        return stream_events(text_service.stream_text(text, doc_type, pages, not no_cache), stream)
     try:
-        return await text_service.process_text(text, doc_type, pages)
+        return await text_service.process_text(text, doc_type, pages, not no_cache)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/http-stats")
+async def http_stats():
+    """Connection reuse counters for the shared outbound HTTP clients."""
+    return connection_stats()
+
+@router.get("/llm-cache-stats")
+async def llm_cache_stats():
+    """Hit rate and size of the LLM completion cache (pass no_cache=true on a request to bypass it)."""
+    cache = get_llm_cache()
+    return cache.stats() if cache else {"enabled": False}
+
 @router.get("/download/{filename}")
 async def download_file(filename: str):
     file_path = os.path.join("reports", filename)
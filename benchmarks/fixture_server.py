@@ -0,0 +1,239 @@
+# benchmarks/fixture_server.py
+"""
+Offline stand-in for DuckDuckGo and the sites it links to.
+
+    python -m benchmarks.fixture_server --port 8765 --latency 0.05 --error-rate 0.05 --slow-hosts 1
+    WEB_SEARCH_ENDPOINT=http://127.0.0.1:8765/search python test_web_workflow.py
+
+GET /search?q=...&max_results=N returns a DDGS-style JSON list of
+{"title", "href", "body"}. Results come from --results (recorded
+{query: [results]} JSON; hrefs starting with "/" are served from here) or
+are generated from the query. Pages are the saved .html files in --corpus,
+or synthetic articles when no corpus is given.
+
+Result links are spread over --hosts loopback aliases (127.0.0.1,
+127.0.0.2, ...) so per-host limits behave as they would on the open web.
+The server listens on exactly those addresses. Linux routes all of
+127.0.0.0/8 to lo; macOS only configures 127.0.0.1, so add the others
+with `sudo ifconfig lo0 alias 127.0.0.N up` or use --hosts 1.
+Every request waits --latency (+/- --jitter) seconds; requests to the first
+--slow-hosts hosts wait --slow-latency instead, and --error-rate of page
+requests fail with a 500.
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+_WORDS = (
+    "solar wind grid storage battery policy market cost efficiency research data analysis "
+    "model network system demand supply carbon emissions transition investment capacity"
+).split()
+
+
+def synthetic_page(seed: int) -> bytes:
+    """A news-style page: long navigation, an article, a link-heavy sidebar and comments."""
+    rng = random.Random(seed)
+
+    def sentence(n):
+        return " ".join(rng.choice(_WORDS) for _ in range(n)).capitalize() + "."
+
+    nav = "".join(f'<li><a href="/section/{i}">Section {i}</a></li>' for i in range(120))
+    article = "".join(
+        f"<p>{' '.join(sentence(rng.randint(8, 20)) for _ in range(rng.randint(3, 8)))}</p><h2>Part {i}</h2>"
+        for i in range(rng.randint(15, 50))
+    )
+    sidebar = "".join(f'<div class="promo"><a href="/p/{i}">{sentence(8)}</a></div>' for i in range(40))
+    comments = "".join(f'<div class="comment"><p>{sentence(15)}</p></div>' for _ in range(20))
+    return (
+        f"<html><head><title>Story {seed}</title><script>{'var x = 1;' * 300}</script></head><body>"
+        f"<header><nav><ul>{nav}</ul></nav></header><div id='main'><article><h1>Story {seed}</h1>"
+        f"{article}</article><aside>{sidebar}</aside><div id='comments'>{comments}</div></div>"
+        f"<footer>{nav}</footer></body></html>"
+    ).encode()
+
+
+class FixtureServer:
+    def __init__(
+        self,
+        port: int = 0,
+        corpus: Optional[Path] = None,
+        results: Optional[Path] = None,
+        hosts: int = 4,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        slow_hosts: int = 0,
+        slow_latency: float = 2.0,
+        error_rate: float = 0.0,
+        synthetic_pages: int = 50,
+        seed: int = 0
+    ):
+        if corpus:
+            self.pages: List[bytes] = [p.read_bytes() for p in sorted(corpus.glob("*.htm*"))]
+        else:
+            self.pages = [synthetic_page(i) for i in range(synthetic_pages)]
+        if not self.pages:
+            raise ValueError(f"No .html files in {corpus}")
+        self.recorded: Dict[str, List[dict]] = json.loads(results.read_text()) if results else {}
+        self.hosts = [f"127.0.0.{i + 1}" for i in range(hosts)]
+        self.slow_hosts = set(self.hosts[:slow_hosts])
+        self.latency, self.jitter, self.slow_latency = latency, jitter, slow_latency
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        # One listener per served loopback address, all on the same port; nothing else is exposed.
+        self.servers: List[ThreadingHTTPServer] = []
+        try:
+            for host in self.hosts:
+                try:
+                    httpd = ThreadingHTTPServer((host, port), self._handler())
+                except OSError as e:
+                    raise OSError(
+                        f"Cannot bind {host}:{port} ({e}); on macOS add the alias with "
+                        f"`sudo ifconfig lo0 alias {host} up` or use fewer --hosts"
+                    ) from e
+                httpd.daemon_threads = True
+                self.servers.append(httpd)
+                port = httpd.server_port  # the first bind picks the port when 0 is given
+        except OSError:
+            for httpd in self.servers:
+                httpd.server_close()
+            raise
+        self.port = port
+
+    @property
+    def search_url(self) -> str:
+        return f"http://{self.hosts[0]}:{self.port}/search"
+
+    def _page_url(self, index: int) -> str:
+        return f"http://{self.hosts[index % len(self.hosts)]}:{self.port}/pages/{index}"
+
+    def search(self, query: str, max_results: int) -> List[dict]:
+        if query in self.recorded:
+            results = []
+            for r in self.recorded[query][:max_results]:
+                href = r.get("href", "")
+                if href.startswith("/"):
+                    href = f"http://{self.hosts[len(results) % len(self.hosts)]}:{self.port}{href}"
+                results.append({**r, "href": href})
+            return results
+        start = int(hashlib.sha1(query.encode()).hexdigest(), 16) % len(self.pages)
+        return [
+            {
+                "title": f"Result {rank + 1} for {query}",
+                "href": self._page_url((start + rank) % len(self.pages)),
+                "body": f"Snippet {rank + 1} for {query}",
+            }
+            for rank in range(max_results)
+        ]
+
+    def _delay(self, host: str) -> float:
+        with self._rng_lock:
+            jitter = self._rng.uniform(-self.jitter, self.jitter)
+        base = self.slow_latency if host in self.slow_hosts else self.latency
+        return max(base + jitter, 0.0)
+
+    def _fails(self) -> bool:
+        with self._rng_lock:
+            return self._rng.random() < self.error_rate
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                host = (self.headers.get("Host") or "").split(":")[0]
+                time.sleep(server._delay(host))
+                if url.path == "/search":
+                    params = parse_qs(url.query)
+                    query = params.get("q", [""])[0]
+                    max_results = int(params.get("max_results", ["10"])[0])
+                    self._send(200, json.dumps(server.search(query, max_results)).encode(), "application/json")
+                elif url.path.startswith("/pages/") and url.path[7:].isdigit():
+                    index = int(url.path[7:])
+                    if index >= len(server.pages):
+                        self._send(404, b"not found", "text/plain")
+                    elif server._fails():
+                        self._send(500, b"fixture error", "text/plain")
+                    else:
+                        self._send(200, server.pages[index], "text/html; charset=utf-8")
+                else:
+                    self._send(404, b"not found", "text/plain")
+
+            def _send(self, status: int, body: bytes, content_type: str):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "FixtureServer":
+        for httpd in self.servers:
+            threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        for httpd in self.servers:
+            httpd.shutdown()
+            httpd.server_close()
+
+
+def add_server_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--corpus", type=Path, help="directory of saved .html pages (default: synthetic)")
+    parser.add_argument("--results", type=Path, help="recorded DDGS results as {query: [results]} JSON")
+    parser.add_argument("--hosts", type=int, default=4, help="loopback aliases to spread pages over")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.02, help="+/- random seconds on top of --latency")
+    parser.add_argument("--slow-hosts", type=int, default=0, help="how many hosts answer with --slow-latency")
+    parser.add_argument("--slow-latency", type=float, default=2.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of page requests that fail")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def server_from_args(args, port: int = 0) -> FixtureServer:
+    return FixtureServer(
+        port=port,
+        corpus=args.corpus,
+        results=args.results,
+        hosts=args.hosts,
+        latency=args.latency,
+        jitter=args.jitter,
+        slow_hosts=args.slow_hosts,
+        slow_latency=args.slow_latency,
+        error_rate=args.error_rate,
+        seed=args.seed
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    server = server_from_args(args, port=args.port)
+    print(f"Serving {len(server.pages)} pages on {', '.join(server.hosts)} port {server.port}")
+    print(f"WEB_SEARCH_ENDPOINT={server.search_url}")
+    server.start()
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
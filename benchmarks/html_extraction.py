@@ -0,0 +1,110 @@
+# benchmarks/html_extraction.py
+"""
+Compare the lxml density extractor with the original BeautifulSoup cascade.
+
+    # time both extractors over 20 generated pages (reproducible, no network)
+    python -m benchmarks.html_extraction --synthetic 20
+    # or snapshot real pages into a corpus (once)
+    python -m benchmarks.html_extraction --save https://en.wikipedia.org/wiki/Solar_power ...
+    # time both extractors over every saved page
+    python -m benchmarks.html_extraction --corpus benchmarks/corpus --repeat 5
+
+Generated pages come from benchmarks.fixture_server.synthetic_page and are
+used whenever the corpus directory holds no .html files.
+
+Prints per-page timings (mean / p50 / p95), the overall speed-up and how
+much of the original output's vocabulary the new output keeps.
+"""
+import argparse
+import hashlib
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.fixture_server import synthetic_page  # noqa: E402
+from sources.html_extractor import LXML_AVAILABLE, extract_main_content_lxml, extract_main_content_soup  # noqa: E402
+
+DEFAULT_CORPUS = Path(__file__).resolve().parent / "corpus"
+
+
+def save_pages(urls: List[str], corpus: Path):
+    from sources.http_client import get_client
+    from sources.web_search import HEADERS
+
+    corpus.mkdir(parents=True, exist_ok=True)
+    client = get_client()
+    for url in urls:
+        response = client.get(url, headers=HEADERS)
+        response.raise_for_status()
+        name = hashlib.sha1(url.encode()).hexdigest()[:12] + ".html"
+        (corpus / name).write_bytes(response.content)
+        print(f"saved {url} -> {corpus / name} ({len(response.content)} bytes)")
+
+
+def time_extractor(extract: Callable[[bytes], str], pages: Dict[str, bytes], repeat: int):
+    per_page, outputs = [], {}
+    for name, html in pages.items():
+        runs = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            outputs[name] = extract(html)
+            runs.append(time.perf_counter() - start)
+        per_page.append(min(runs))
+    return per_page, outputs
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def word_recall(reference: str, candidate: str) -> float:
+    ref = set(reference.lower().split())
+    return len(ref & set(candidate.lower().split())) / len(ref) if ref else 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS, help="directory of saved .html pages")
+    parser.add_argument("--save", nargs="+", metavar="URL", help="download these pages into the corpus first")
+    parser.add_argument(
+        "--synthetic", type=int, default=20, metavar="N",
+        help="generated pages to use when the corpus is empty (seeds 0..N-1)"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="runs per page; the fastest is kept")
+    args = parser.parse_args()
+
+    if args.save:
+        save_pages(args.save, args.corpus)
+    if not LXML_AVAILABLE:
+        sys.exit("lxml is not installed; nothing to compare against.")
+
+    pages = {p.name: p.read_bytes() for p in sorted(args.corpus.glob("*.htm*"))}
+    if not pages:
+        print(f"No .html files in {args.corpus}; using {args.synthetic} generated pages")
+        pages = {f"synthetic_{seed}.html": synthetic_page(seed) for seed in range(args.synthetic)}
+    if not pages:
+        sys.exit("Nothing to benchmark; pass --save URL ... or --synthetic N")
+
+    baseline_times, baseline_out = time_extractor(extract_main_content_soup, pages, args.repeat)
+    fast_times, fast_out = time_extractor(extract_main_content_lxml, pages, args.repeat)
+
+    size_mb = sum(len(html) for html in pages.values()) / 1e6
+    print(f"{len(pages)} pages, {size_mb:.1f} MB, best of {args.repeat} runs each\n")
+    print(f"{'extractor':<22}{'total s':>10}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for label, times in (("bs4 html.parser", baseline_times), ("lxml density", fast_times)):
+        print(
+            f"{label:<22}{sum(times):>10.3f}{statistics.mean(times) * 1000:>10.1f}"
+            f"{percentile(times, 50) * 1000:>10.1f}{percentile(times, 95) * 1000:>10.1f}"
+        )
+    print(f"\nspeed-up: {sum(baseline_times) / sum(fast_times):.1f}x")
+    recall = [word_recall(baseline_out[name], fast_out[name]) for name in pages]
+    print(f"vocabulary kept vs. baseline: mean {statistics.mean(recall):.0%}, min {min(recall):.0%}")
+
+
+if __name__ == "__main__":
+    main()
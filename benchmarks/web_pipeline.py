@@ -0,0 +1,110 @@
+# benchmarks/web_pipeline.py
+"""
+End-to-end benchmark of the web pipeline (search -> fetch -> extract) against
+the offline fixture server, so results are reproducible and nothing touches
+DuckDuckGo or live sites.
+
+    python -m benchmarks.web_pipeline --queries 50 --concurrency 4 --latency 0.05 --slow-hosts 1
+    python -m benchmarks.web_pipeline --server http://127.0.0.1:8765/search   # external fixture server
+
+Reports query and page throughput, p50/p95/p99 latency per query and per
+page, and error counts. The page and search caches are off for every run.
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.fixture_server import add_server_arguments, server_from_args  # noqa: E402
+from config import Config  # noqa: E402
+from sources.http_client import aclose_async_client  # noqa: E402
+from sources.web_search import WebSearchManager  # noqa: E402
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def run_benchmark(search_url: str, args) -> dict:
+    Config.HTTP_CACHE_ENABLED = False
+    Config.SEARCH_CACHE_ENABLED = False
+    manager = WebSearchManager(
+        max_results=args.max_results,
+        max_concurrency=args.fetch_concurrency,
+        per_host_delay=args.per_host_delay,
+        search_endpoint=search_url
+    )
+    queries = [f"benchmark query {i}" for i in range(args.queries)]
+    gate = asyncio.Semaphore(args.concurrency)
+    query_times, page_times, errors = [], [], 0
+
+    async def one(query: str):
+        nonlocal errors
+        async with gate:
+            start = time.perf_counter()
+            pages = await manager.asearch_pages(query)
+            query_times.append(time.perf_counter() - start)
+        for page in pages:
+            if page.error:
+                errors += 1
+            else:
+                page_times.append(page.fetch_seconds)
+
+    await one("warm-up")  # opens connections and loads parsers outside the timed run
+    query_times.clear()
+    page_times.clear()
+    errors = 0
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(q) for q in queries))
+    wall = time.perf_counter() - start
+    await aclose_async_client()
+    return {"wall": wall, "query_times": query_times, "page_times": page_times, "errors": errors}
+
+
+def report(result: dict):
+    wall, query_times, page_times = result["wall"], result["query_times"], result["page_times"]
+    pages = len(page_times)
+    print(f"{len(query_times)} queries, {pages} pages extracted, {result['errors']} page errors in {wall:.2f}s")
+    print(f"throughput: {len(query_times) / wall:.2f} queries/s, {pages / wall:.1f} pages/s\n")
+    print(f"{'latency (ms)':<16}{'mean':>9}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for label, times in (("per query", query_times), ("per page", page_times)):
+        if not times:
+            continue
+        print(
+            f"{label:<16}{statistics.mean(times) * 1000:>9.1f}{percentile(times, 50) * 1000:>9.1f}"
+            f"{percentile(times, 95) * 1000:>9.1f}{percentile(times, 99) * 1000:>9.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--server", help="search URL of a running fixture server (default: start one in-process)")
+    parser.add_argument("--queries", type=int, default=30)
+    parser.add_argument("--concurrency", type=int, default=4, help="queries in flight at once")
+    parser.add_argument("--max-results", type=int, default=10)
+    parser.add_argument("--fetch-concurrency", type=int, default=8, help="page fetches per query")
+    parser.add_argument("--per-host-delay", type=float, default=0.0)
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    server = None
+    search_url = args.server
+    if not search_url:
+        server = server_from_args(args).start()
+        search_url = server.search_url
+    try:
+        report(asyncio.run(run_benchmark(search_url, args)))
+    finally:
+        if server:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
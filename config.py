@@ -8,6 +8,76 @@ class Config:
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
     REPORTS_DIR = os.getenv("REPORTS_DIR", "reports")
 
+    # PDF extraction budgets (seconds) enforced in a killable worker process
+    PDF_PAGE_TIMEOUT = float(os.getenv("PDF_PAGE_TIMEOUT", "15"))
+    PDF_DOCUMENT_TIMEOUT = float(os.getenv("PDF_DOCUMENT_TIMEOUT", "120"))
+
+    # Shared outbound HTTP client (sources/http_client.py)
+    HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "15"))
+    HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+    HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "6"))
+    HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+    HTTP_USER_AGENT = os.getenv("HTTP_USER_AGENT", "search-analyzer/1.0")
+
+    # DDGS-compatible JSON search service to use instead of DuckDuckGo (benchmarks/fixture_server.py)
+    WEB_SEARCH_ENDPOINT = os.getenv("WEB_SEARCH_ENDPOINT", "")
+
+    # Web page downloads: pages are cut at the cap, larger PDFs are rejected
+    WEB_MAX_PAGE_BYTES = int(os.getenv("WEB_MAX_PAGE_BYTES", str(2 * 1024 * 1024)))
+    WEB_MAX_PDF_BYTES = int(os.getenv("WEB_MAX_PDF_BYTES", str(20 * 1024 * 1024)))
+
+    # On-disk page cache (sources/http_cache.py); overrides are "host=seconds,..."
+    HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "1") == "1"
+    HTTP_CACHE_PATH = os.getenv("HTTP_CACHE_PATH", os.path.join(".cache", "http_cache.sqlite3"))
+    HTTP_CACHE_DEFAULT_TTL = float(os.getenv("HTTP_CACHE_DEFAULT_TTL", "3600"))
+    HTTP_CACHE_TTL_OVERRIDES = os.getenv("HTTP_CACHE_TTL_OVERRIDES", "wikipedia.org=86400")
+    HTTP_CACHE_MAX_ENTRIES = int(os.getenv("HTTP_CACHE_MAX_ENTRIES", "5000"))
+
+    # DuckDuckGo result cache shared by all workers (sources/search_cache.py)
+    SEARCH_CACHE_ENABLED = os.getenv("SEARCH_CACHE_ENABLED", "1") == "1"
+    SEARCH_CACHE_PATH = os.getenv("SEARCH_CACHE_PATH", os.path.join(".cache", "search_cache.sqlite3"))
+    SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", "900"))
+    SEARCH_CACHE_STALE_TTL = float(os.getenv("SEARCH_CACHE_STALE_TTL", "86400"))
+
+    # Summarizer retrieval window, and how much web text to collect for it (0 fetches every result)
+    RETRIEVAL_MAX_TOKENS = int(os.getenv("RETRIEVAL_MAX_TOKENS", "6000"))
+    WEB_CONTENT_BUDGET_FACTOR = float(os.getenv("WEB_CONTENT_BUDGET_FACTOR", "2.0"))
+
+    # YouTube transcript fetching
+    YOUTUBE_MAX_WORKERS = int(os.getenv("YOUTUBE_MAX_WORKERS", "5"))
+    YOUTUBE_VIDEO_TIMEOUT = float(os.getenv("YOUTUBE_VIDEO_TIMEOUT", "20"))
+    YOUTUBE_BATCH_MAX_VIDEOS = int(os.getenv("YOUTUBE_BATCH_MAX_VIDEOS", "100"))
+
+    # Compressed transcript cache keyed by video ID and language (sources/transcript_cache.py)
+    TRANSCRIPT_CACHE_ENABLED = os.getenv("TRANSCRIPT_CACHE_ENABLED", "1") == "1"
+    TRANSCRIPT_CACHE_PATH = os.getenv("TRANSCRIPT_CACHE_PATH", os.path.join(".cache", "transcript_cache.sqlite3"))
+    TRANSCRIPT_CACHE_MAX_BYTES = int(os.getenv("TRANSCRIPT_CACHE_MAX_BYTES", str(100 * 1024 * 1024)))
+
+    # Transcript chunks span at most this much video; sparser chunks (music, silence) rank last
+    TRANSCRIPT_CHUNK_SECONDS = float(os.getenv("TRANSCRIPT_CHUNK_SECONDS", "120"))
+    TRANSCRIPT_MIN_WORDS_PER_SECOND = float(os.getenv("TRANSCRIPT_MIN_WORDS_PER_SECOND", "0.5"))
+
+    # Documents longer than one LLM call: outline once, then write the parts concurrently
+    LLM_PARALLEL_PARTS = os.getenv("LLM_PARALLEL_PARTS", "1") == "1"
+    LLM_MAX_PARALLEL_PARTS = int(os.getenv("LLM_MAX_PARALLEL_PARTS", "4"))  # also caps concurrent sections
+
+    # "parts" writes the document in page-sized parts; "sections" writes each template heading
+    # concurrently from chunks retrieved for that heading, retrying a failed section on its own
+    LLM_GENERATION_MODE = os.getenv("LLM_GENERATION_MODE", "parts")
+    SECTION_RETRIEVAL_MAX_TOKENS = int(os.getenv("SECTION_RETRIEVAL_MAX_TOKENS", "2000"))
+    LLM_SECTION_RETRIES = int(os.getenv("LLM_SECTION_RETRIES", "2"))
+
+    # Completion cache keyed by a hash of model, messages and parameters (summarizer/llm_cache.py)
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") == "1"
+    LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(".cache", "llm_cache.sqlite3"))
+    LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(7 * 86400)))
+    LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+
+    # Batch summarization
+    BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", "50"))
+    BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))
+
     @classmethod
     def verify_config(cls):
         # Non-fatal: prefer warning - but keep simple check
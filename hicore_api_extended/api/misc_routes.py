@@ -1,5 +1,7 @@
 from fastapi import APIRouter
 from ..app_state import AppState
+from ..utils.http_utils import connection_stats
+from ..utils.llm_cache import get_llm_cache
 
 router = APIRouter()
 
@@ -10,3 +12,14 @@ async def clear_state_endpoint(app_state: AppState):
     app_state.state.synthesis_storage = {}
     app_state.state.sessions = {}
     return {"message": "State cleared"}
+
+@router.get("/http_stats")
+async def http_stats_endpoint():
+    """Connection reuse for outbound HTTP calls since startup."""
+    return connection_stats()
+
+@router.get("/llm_cache_stats")
+async def llm_cache_stats_endpoint():
+    """Hit rate and size of the Azure completion cache since startup."""
+    cache = get_llm_cache()
+    return cache.stats() if cache else {"enabled": False}
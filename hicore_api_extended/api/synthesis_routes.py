@@ -8,15 +8,15 @@ from ..app_state import AppState
 router = APIRouter()
 
 @router.post("/generate_structured_summaries")
-async def generate_structured_summaries_endpoint(request: Request):
+async def generate_structured_summaries_endpoint(request: Request, no_cache: bool = False):
     app_state: AppState = request.app.state.app_state
-    results = await SummaryService.generate_structured_summaries(app_state=app_state,selected_idx=app_state.selected_indices)
+    results = await SummaryService.generate_structured_summaries(app_state=app_state,selected_idx=app_state.selected_indices,use_cache=not no_cache)
     return {"structured_summaries": results}
 
 @router.post("/generate_overall_synthesis")
-async def generate_overall_synthesis(request: Request):
+async def generate_overall_synthesis(request: Request, no_cache: bool = False):
     app_state: AppState = request.app.state.app_state
-    overall = await SummaryService.generate_overall_synthesis(app_state=app_state,selected_idx=app_state.selected_indices)
+    overall = await SummaryService.generate_overall_synthesis(app_state=app_state,selected_idx=app_state.selected_indices,use_cache=not no_cache)
     return {"synthesis": overall}
 
 @router.get("/download_synthesis")
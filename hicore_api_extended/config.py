@@ -25,6 +25,23 @@ class Config:
     # Application Settings
     REPORTS_DIR = os.getenv("REPORTS_DIR", "reports")
 
+    # Shared outbound HTTP session (utils/http_utils.py)
+    HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "20"))
+    HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+    HTTP_POOL_HOSTS = int(os.getenv("HTTP_POOL_HOSTS", "32"))
+    HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "6"))
+
+    # Remote PDF downloads
+    PDF_MAX_DOWNLOAD_BYTES = int(os.getenv("PDF_MAX_DOWNLOAD_BYTES", str(25 * 1024 * 1024)))
+    PDF_CONNECT_TIMEOUT = float(os.getenv("PDF_CONNECT_TIMEOUT", "5"))
+    PDF_READ_TIMEOUT = float(os.getenv("PDF_READ_TIMEOUT", "30"))
+
+    # Azure completion cache keyed by a hash of model, messages and parameters (utils/llm_cache.py)
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") == "1"
+    LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(".cache", "llm_cache.sqlite3"))
+    LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(7 * 86400)))
+    LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+
     @classmethod
     def verify_config(cls):
         """Verify that all required configurations are set."""
@@ -23,12 +23,19 @@ import json
 import time
 import tempfile
 import requests
+from requests.adapters import HTTPAdapter
 import traceback
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional
 from fastapi import FastAPI, Form, HTTPException
 from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 
+# Completion cache from utils/llm_cache.py; its LLM_CACHE_* settings are in config.py
+from utils.llm_cache import LLMCache, get_llm_cache
+# Downloads a PDF once and indexes its sections (utils/parsing.py) at extraction time
+from utils.pdf_utils import download_pdf_document
+
 # ---------- Optional libraries ----------
 try:
     import pdfplumber
@@ -78,12 +85,26 @@ AZURE_CFG = {
 SERPAPI_KEY = os.getenv("SERPAPI_KEY","90b40f0b46cad75f193c8fcce5798793c27f7b79d70e8b22c351bbcf1268e3b6")
 SEMANTIC_SCHOLAR_URL = "https://api.semanticscholar.org/graph/v1/paper/search"
 SEMANTIC_SCHOLAR_AUTHOR_URL = "https://api.semanticscholar.org/graph/v1/author/search"
+PDF_MAX_DOWNLOAD_BYTES = int(os.getenv("PDF_MAX_DOWNLOAD_BYTES", str(25 * 1024 * 1024)))
+PDF_CONNECT_TIMEOUT = float(os.getenv("PDF_CONNECT_TIMEOUT", "5"))
+PDF_READ_TIMEOUT = float(os.getenv("PDF_READ_TIMEOUT", "30"))
+HTTP_POOL_HOSTS = int(os.getenv("HTTP_POOL_HOSTS", "32"))
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "6"))
 
 # ---------- Global state ----------
 SESSIONS: Dict[str, Dict[str, Any]] = {}
 SEARCH_RESULTS: List[Dict[str, Any]] = []
 SELECTED_IDX: List[int] = []
 SYNTHESIS_STORAGE: Dict[str, str] = {}
+PDF_FETCH_TIMINGS: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()  # most recent 256 URLs
+
+# Shared keep-alive session: one urllib3 pool per host, capped at HTTP_MAX_CONNECTIONS_PER_HOST
+HTTP_ADAPTER = HTTPAdapter(pool_connections=HTTP_POOL_HOSTS, pool_maxsize=HTTP_MAX_CONNECTIONS_PER_HOST, pool_block=True)
+HTTP_SESSION = requests.Session()
+HTTP_SESSION.headers.update({"User-Agent": "hicore-bot/1.0"})
+HTTP_SESSION.mount("http://", HTTP_ADAPTER)
+HTTP_SESSION.mount("https://", HTTP_ADAPTER)
+
 
 # ---------- Utilities ----------
 def _is_azure_configured() -> bool:
@@ -102,20 +123,30 @@ def init_azure_client():
         print("Azure client init failed:", e)
         return None
 
-def call_azure_chat(prompt: str, max_tokens: int = 1000, temperature: float = 0.2) -> str:
+def call_azure_chat(prompt: str, max_tokens: int = 1000, temperature: float = 0.2, use_cache: bool = True) -> str:
     if _is_azure_configured():
+        request = {
+            "model": AZURE_CFG["deployment_name"],
+            "messages": [
+                {"role": "system", "content": "You are a helpful academic assistant. Provide citations where appropriate."},
+                {"role": "user", "content": prompt},
+            ],
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+        }
+        cache = get_llm_cache() if use_cache else None
+        key = LLMCache.make_key(request) if cache else None
+        if cache:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
         try:
             client = init_azure_client()
-            response = client.chat.completions.create(
-                model=AZURE_CFG["deployment_name"],
-                messages=[
-                    {"role": "system", "content": "You are a helpful academic assistant. Provide citations where appropriate."},
-                    {"role": "user", "content": prompt},
-                ],
-                max_tokens=max_tokens,
-                temperature=temperature,
-            )
-            return response.choices[0].message.content
+            response = client.chat.completions.create(**request)
+            text = response.choices[0].message.content
+            if cache and text:  # fallback summaries below are never cached
+                cache.put(key, text)
+            return text
         except Exception as e:
             print("Azure call error:", e)
             traceback.print_exc()
@@ -141,17 +172,60 @@ def parse_structured_sections(text: str) -> Dict[str, str]:
 
 def safe_request_get(url, timeout=15, headers=None):
     try:
-        return requests.get(url, timeout=timeout, headers=headers or {"User-Agent": "hicore-bot/1.0"})
+        return HTTP_SESSION.get(url, timeout=timeout, headers=headers)
     except Exception as e:
         print("HTTP GET failed:", url, e)
         return None
 
+def safe_request_stream(url, max_bytes, timeout=(5, 30), headers=None, chunk_size=64 * 1024):
+    """Stream a GET body into memory; returns None on error, non-200, or once it exceeds max_bytes."""
+    try:
+        with HTTP_SESSION.get(url, timeout=timeout, headers=headers, stream=True) as r:
+            if r.status_code != 200:
+                return None
+            declared = r.headers.get("Content-Length", "")
+            if declared.isdigit() and int(declared) > max_bytes:
+                print("HTTP GET skipped, body too large:", url, declared)
+                return None
+            body = bytearray()
+            for chunk in r.iter_content(chunk_size=chunk_size):
+                body += chunk
+                if len(body) > max_bytes:
+                    print("HTTP GET aborted, body exceeded", max_bytes, "bytes:", url)
+                    return None
+            return bytes(body)
+    except Exception as e:
+        print("HTTP GET failed:", url, e)
+        return None
+
+def http_connection_stats() -> Dict[str, Any]:
+    """Requests vs. newly opened connections for each pooled host."""
+    hosts = {}
+    pools = HTTP_ADAPTER.poolmanager.pools
+    for key in pools.keys():
+        pool = pools.get(key)
+        if pool is None:
+            continue
+        hosts[f"{key.key_scheme}://{key.key_host}:{key.key_port}"] = {
+            "requests": pool.num_requests,
+            "new_connections": pool.num_connections,
+            "reused": max(pool.num_requests - pool.num_connections, 0),
+        }
+    total_requests = sum(h["requests"] for h in hosts.values())
+    total_connections = sum(h["new_connections"] for h in hosts.values())
+    return {
+        "requests": total_requests,
+        "new_connections": total_connections,
+        "reuse_ratio": round(1 - total_connections / total_requests, 3) if total_requests else 0.0,
+        "hosts": hosts,
+    }
+
 # ---------- Paper search utilities ----------
 def semantic_scholar_search(topic: str, limit: int = 5) -> List[Dict[str, Any]]:
     out = []
     try:
         params = {"query": topic, "limit": limit, "fields": "title,year,authors,abstract,url,externalIds"}
-        r = requests.get(SEMANTIC_SCHOLAR_URL, params=params, timeout=20)
+        r = HTTP_SESSION.get(SEMANTIC_SCHOLAR_URL, params=params, timeout=20)
         r.raise_for_status()
         for d in r.json().get("data", []):
             out.append({
@@ -172,7 +246,7 @@ def semantic_scholar_author_search(topic: str, limit: int = 5) -> List[Dict[str,
     out = []
     try:
         params = {"query": topic, "limit": limit, "fields": "name,affiliations,homepage,url,paperCount,citationCount,hIndex"}
-        r = requests.get(SEMANTIC_SCHOLAR_AUTHOR_URL, params=params, timeout=20)
+        r = HTTP_SESSION.get(SEMANTIC_SCHOLAR_AUTHOR_URL, params=params, timeout=20)
         r.raise_for_status()
         for d in r.json().get("data", []):
             out.append({
@@ -192,7 +266,7 @@ def arxiv_search(topic: str, limit: int = 5) -> List[Dict[str, Any]]:
     out = []
     try:
         url = f"http://export.arxiv.org/api/query?search_query=all:{requests.utils.quote(topic)}&start=0&max_results={limit}"
-        r = requests.get(url, timeout=20)
+        r = HTTP_SESSION.get(url, timeout=20)
         r.raise_for_status()
         entries = re.split(r'<entry>|</entry>', r.text)
         for ent in entries:
@@ -218,7 +292,7 @@ def openalex_search(topic: str, limit: int = 5) -> List[Dict[str, Any]]:
     out = []
     try:
         url = f"https://api.openalex.org/works?filter=title.search:{requests.utils.quote(topic)}&per-page={limit}"
-        r = requests.get(url, timeout=20)
+        r = HTTP_SESSION.get(url, timeout=20)
         r.raise_for_status()
         for w in r.json().get("results", [])[:limit]:
             out.append({
@@ -236,40 +310,50 @@ def openalex_search(topic: str, limit: int = 5) -> List[Dict[str, Any]]:
     return out
 
 # ---------- PDF extraction ----------
+def _record_pdf_timing(url: str, **timing):
+    PDF_FETCH_TIMINGS[url] = timing
+    PDF_FETCH_TIMINGS.move_to_end(url)
+    while len(PDF_FETCH_TIMINGS) > 256:
+        PDF_FETCH_TIMINGS.popitem(last=False)
+
+def pdf_bytes_to_text(data: bytes) -> str:
+    text = ""
+    if pdfplumber:
+        try:
+            with pdfplumber.open(io.BytesIO(data)) as pdf:
+                for p in pdf.pages:
+                    t = p.extract_text()
+                    if t:
+                        text += t + "\n"
+        except Exception:
+            pass
+
+    if not text:
+        try:
+            import fitz
+            with fitz.open(stream=data, filetype="pdf") as doc:
+                for page in doc:
+                    text += page.get_text()
+        except Exception:
+            pass
+
+    return text
+
 def download_pdf_to_text(url: str) -> str:
     if not url:
         return ""
     try:
-        r = safe_request_get(url, timeout=30)
-        if not r or r.status_code != 200:
+        started = time.perf_counter()
+        data = safe_request_stream(url, max_bytes=PDF_MAX_DOWNLOAD_BYTES, timeout=(PDF_CONNECT_TIMEOUT, PDF_READ_TIMEOUT))
+        download_s = time.perf_counter() - started
+        if not data:
+            _record_pdf_timing(url, bytes=0, download_s=round(download_s, 3), parse_s=0.0)
             return ""
-        tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-        tmp.write(r.content)
-        tmp.flush()
-        tmp_path = tmp.name
-        tmp.close()
-
-        text = ""
-        if pdfplumber:
-            try:
-                with pdfplumber.open(tmp_path) as pdf:
-                    for p in pdf.pages:
-                        t = p.extract_text()
-                        if t:
-                            text += t + "\n"
-            except Exception:
-                pass
-
-        if not text:
-            try:
-                import fitz
-                with fitz.open(tmp_path) as doc:
-                    for page in doc:
-                        text += page.get_text()
-            except Exception:
-                pass
-
-        os.unlink(tmp_path)
+
+        parse_started = time.perf_counter()
+        text = pdf_bytes_to_text(data)
+        _record_pdf_timing(url, bytes=len(data), download_s=round(download_s, 3),
+                           parse_s=round(time.perf_counter() - parse_started, 3))
         return text or ""
     except Exception as e:
         print("download_pdf_to_text failed:", e)
@@ -344,14 +428,14 @@ async def select_papers_endpoint(indices_csv: str = Form(...)):
     return {"selected_indices": SELECTED_IDX}
 
 @app.post("/generate_structured_summaries")
-async def generate_structured_summaries_endpoint():
-    """Generates structured summaries for the selected papers."""
+async def generate_structured_summaries_endpoint(no_cache: bool = Form(False)):
+    """Generates structured summaries for the selected papers; no_cache=true regenerates them."""
     outputs = []
     for i in SELECTED_IDX:
         paper = SEARCH_RESULTS[i]
         full_text = paper.get("abstract", "")
         prompt = f"Extract structured summary from this abstract:\n{full_text}\n\nUse headers ### Abstract ### Methods ### Results ### Conclusion and include citations where possible."
-        llm_output = call_azure_chat(prompt, max_tokens=1000)
+        llm_output = call_azure_chat(prompt, max_tokens=1000, use_cache=not no_cache)
         structured = parse_structured_sections(llm_output)
         structured["title"] = paper.get("title")
         outputs.append(structured)
@@ -405,9 +489,13 @@ async def methodology_search(paper_indices: str = Form(...)):
     for i in idxs:
         if 0 <= i < len(SEARCH_RESULTS):
             p = SEARCH_RESULTS[i]
-            text = download_pdf_to_text(p.get("pdf_url")) if p.get("pdf_url") else p.get("abstract", "")
-            m = re.search(r'(?:Method(?:s|ology)|Materials and Methods)[\s\S]{0,2000}', text or "", flags=re.I)
-            snippet = m.group(0).strip() if m else (text[:800] if text else "")
+            doc = download_pdf_document(p.get("pdf_url")) if p.get("pdf_url") else None
+            text = doc.text if doc else p.get("abstract", "")
+            # Prefer the indexed Methods section; the regex scan can land on the TOC or references.
+            snippet = doc.section("methods")[:2000] if doc else ""
+            if not snippet:
+                m = re.search(r'(?:Method(?:s|ology)|Materials and Methods)[\s\S]{0,2000}', text or "", flags=re.I)
+                snippet = m.group(0).strip() if m else (text[:800] if text else "")
             snippets.append({"title": p.get("title"), "snippet": snippet})
             steps.extend(re.split(r'(?<=[.!?])\s+', snippet)[:5])
     flowchart_path = None
@@ -491,14 +579,14 @@ async def visualize_map(seed_indices: str = Form(...)):
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Failed to generate visualization: {e}")
 @app.post("/generate_overall_synthesis")
-async def generate_overall_synthesis():
-    """Synthesizes a general summary from all selected papers."""
+async def generate_overall_synthesis(no_cache: bool = Form(False)):
+    """Synthesizes a general summary from all selected papers; no_cache=true regenerates it."""
     combined_text = ""
     for i in SELECTED_IDX:
         paper = SEARCH_RESULTS[i]
         combined_text += f"Title: {paper.get('title')}\nAbstract: {paper.get('abstract')}\n\n"
     prompt = f"Synthesize across these papers, providing an overall summary and including citations.\n{combined_text}"
-    overall = call_azure_chat(prompt, max_tokens=1500)
+    overall = call_azure_chat(prompt, max_tokens=1500, use_cache=not no_cache)
     SYNTHESIS_STORAGE["latest"] = overall
     return {"synthesis": overall}
 
@@ -529,6 +617,17 @@ async def clear_state_endpoint():
     SEARCH_RESULTS, SELECTED_IDX, SYNTHESIS_STORAGE, SESSIONS = [], [], {}, {}
     return {"message": "State cleared"}
 
+@app.get("/http_stats")
+async def http_stats_endpoint():
+    """Connection reuse for outbound HTTP calls since startup."""
+    return http_connection_stats()
+
+@app.get("/llm_cache_stats")
+async def llm_cache_stats_endpoint():
+    """Hit rate and size of the Azure completion cache since startup."""
+    cache = get_llm_cache()
+    return cache.stats() if cache else {"enabled": False}
+
 # ---------- Entry ----------
 if __name__ == "__main__":
     import uvicorn
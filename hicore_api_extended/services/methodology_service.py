@@ -11,7 +11,7 @@ except ImportError:
     GRAPHVIZ_AVAILABLE = False
 
 from ..utils.azure_client import call_azure_chat
-from ..utils.pdf_utils import download_pdf_to_text
+from ..utils.pdf_utils import download_pdf_document
 from ..app_state import AppState
 
 class MethodologyService:
@@ -30,9 +30,13 @@ class MethodologyService:
         for i in indices:
             if 0 <= i < len(app_state.state.search_results):
                 p = app_state.state.search_results[i]
-                text = download_pdf_to_text(p.get("pdf_url")) if p.get("pdf_url") else p.get("abstract", "")
-                m = re.search(r'(?:Method(?:s|ology)|Materials and Methods)[\s\S]{0,2000}', text or "", flags=re.I)
-                snippet = m.group(0).strip() if m else (text[:800] if text else "")
+                doc = download_pdf_document(p.get("pdf_url")) if p.get("pdf_url") else None
+                text = doc.text if doc else p.get("abstract", "")
+                # Prefer the indexed Methods section; the regex scan can land on the TOC or references.
+                snippet = doc.section("methods")[:2000] if doc else ""
+                if not snippet:
+                    m = re.search(r'(?:Method(?:s|ology)|Materials and Methods)[\s\S]{0,2000}', text or "", flags=re.I)
+                    snippet = m.group(0).strip() if m else (text[:800] if text else "")
                 snippets.append({"title": p.get("title"), "snippet": snippet})
                 steps.extend(re.split(r'(?<=[.!?])\s+', snippet)[:5])
         
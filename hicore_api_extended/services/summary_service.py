@@ -6,25 +6,27 @@ from ..utils.azure_client import call_azure_chat
 
 class SummaryService:
     @staticmethod
-    def generate_structured_summaries(app_state: AppState, selected_idx: List[int]) -> List[Dict[str, Any]]:
+    def generate_structured_summaries(
+        app_state: AppState, selected_idx: List[int], use_cache: bool = True
+    ) -> List[Dict[str, Any]]:
         outputs = []
         for i in selected_idx:
             paper = app_state.search_results[i]
             full_text = paper.get("abstract", "")
             prompt = f"Extract structured summary from this abstract:\n{full_text}\n\nUse headers ### Abstract ### Methods ### Results ### Conclusion and include citations where possible."
-            llm_output = call_azure_chat(prompt, max_tokens=1000)
+            llm_output = call_azure_chat(prompt, max_tokens=1000, use_cache=use_cache)
             structured = parse_structured_sections(llm_output)
             structured["title"] = paper.get("title")
             outputs.append(structured)
         return outputs
 
     @staticmethod
-    def generate_overall_synthesis(app_state: AppState, selected_idx: List[int]) -> str:
+    def generate_overall_synthesis(app_state: AppState, selected_idx: List[int], use_cache: bool = True) -> str:
         combined_text = ""
         for i in selected_idx:
             paper = app_state.search_results[i]
             combined_text += f"Title: {paper.get('title')}\nAbstract: {paper.get('abstract')}\n\n"
         prompt = f"Synthesize across these papers, providing an overall summary and including citations.\n{combined_text}"
-        overall = call_azure_chat(prompt, max_tokens=1500)
+        overall = call_azure_chat(prompt, max_tokens=1500, use_cache=use_cache)
         app_state.synthesis_storage["latest"] = overall
         return overall
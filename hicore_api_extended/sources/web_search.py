@@ -3,11 +3,11 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Dict, Optional, List
 from ddgs import DDGS
-import requests
 from bs4 import BeautifulSoup
 import re
 import time
 from urllib.parse import urlparse
+from ..utils.http_utils import SESSION
 
 @dataclass
 class WebSearchConfig:
@@ -26,7 +26,7 @@ class WebSearchManager:
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             }
             
-            response = requests.get(url, headers=headers, timeout=15)
+            response = SESSION.get(url, headers=headers, timeout=15)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -1,6 +1,10 @@
 import re, traceback
-from config import AZURE_CFG
+from config import Config
 from openai import AzureOpenAI
+from .llm_cache import LLMCache, get_llm_cache
+
+AZURE_CFG = Config.AZURE_CFG
+SYSTEM_PROMPT = "You are a helpful academic assistant. Provide citations where appropriate."
 
 def _is_azure_configured() -> bool:
     return bool(AZURE_CFG.get("api_key") and AZURE_CFG.get("endpoint") and AZURE_CFG.get("deployment_name"))
@@ -18,20 +22,34 @@ def init_azure_client():
         print("Azure client init failed:", e)
         return None
 
-def call_azure_chat(prompt: str, max_tokens: int = 1000, temperature: float = 0.2) -> str:
+def call_azure_chat(prompt: str, max_tokens: int = 1000, temperature: float = 0.2, use_cache: bool = True) -> str:
+    """
+    Chat completion from the Azure deployment. Identical requests are answered from
+    the completion cache unless use_cache is False; fallback summaries are never cached.
+    """
     if _is_azure_configured():
+        request = {
+            "model": AZURE_CFG["deployment_name"],
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+        }
+        cache = get_llm_cache() if use_cache else None
+        key = LLMCache.make_key(request) if cache else None
+        if cache:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
         try:
             client = init_azure_client()
-            response = client.chat.completions.create(
-                model=AZURE_CFG["deployment_name"],
-                messages=[
-                    {"role": "system", "content": "You are a helpful academic assistant. Provide citations where appropriate."},
-                    {"role": "user", "content": prompt},
-                ],
-                max_tokens=max_tokens,
-                temperature=temperature,
-            )
-            return response.choices[0].message.content
+            response = client.chat.completions.create(**request)
+            text = response.choices[0].message.content
+            if cache and text:
+                cache.put(key, text)
+            return text
         except Exception as e:
             print("Azure call error:", e)
             traceback.print_exc()
@@ -1,8 +1,67 @@
 import requests
+from requests.adapters import HTTPAdapter
+from config import Config
 
-def safe_request_get(url, timeout=15, headers=None):
+# One keep-alive session for every outbound call; urllib3 keeps a connection pool per host
+# and blocks rather than opening more than HTTP_MAX_CONNECTIONS_PER_HOST to the same host.
+ADAPTER = HTTPAdapter(
+    pool_connections=Config.HTTP_POOL_HOSTS,
+    pool_maxsize=Config.HTTP_MAX_CONNECTIONS_PER_HOST,
+    pool_block=True,
+)
+SESSION = requests.Session()
+SESSION.headers.update({"User-Agent": "hicore-bot/1.0"})
+SESSION.mount("http://", ADAPTER)
+SESSION.mount("https://", ADAPTER)
+DEFAULT_TIMEOUT = (Config.HTTP_CONNECT_TIMEOUT, Config.HTTP_TIMEOUT)
+
+def connection_stats():
+    """Requests vs. newly opened connections for each pooled host."""
+    hosts = {}
+    pools = ADAPTER.poolmanager.pools
+    for key in pools.keys():
+        pool = pools.get(key)
+        if pool is None:
+            continue
+        name = f"{key.key_scheme}://{key.key_host}:{key.key_port}"
+        hosts[name] = {
+            "requests": pool.num_requests,
+            "new_connections": pool.num_connections,
+            "reused": max(pool.num_requests - pool.num_connections, 0),
+        }
+    total_requests = sum(h["requests"] for h in hosts.values())
+    total_connections = sum(h["new_connections"] for h in hosts.values())
+    return {
+        "requests": total_requests,
+        "new_connections": total_connections,
+        "reuse_ratio": round(1 - total_connections / total_requests, 3) if total_requests else 0.0,
+        "hosts": hosts,
+    }
+
+def safe_request_get(url, timeout=DEFAULT_TIMEOUT, headers=None, params=None):
+    try:
+        return SESSION.get(url, timeout=timeout, headers=headers, params=params)
+    except Exception as e:
+        print("HTTP GET failed:", url, e)
+        return None
+
+def safe_request_stream(url, max_bytes, timeout=(5, 30), headers=None, chunk_size=64 * 1024):
+    """Stream a GET body into memory; returns None on error, non-200, or once it exceeds max_bytes."""
     try:
-        return requests.get(url, timeout=timeout, headers=headers or {"User-Agent": "hicore-bot/1.0"})
+        with SESSION.get(url, timeout=timeout, headers=headers, stream=True) as r:
+            if r.status_code != 200:
+                return None
+            declared = r.headers.get("Content-Length", "")
+            if declared.isdigit() and int(declared) > max_bytes:
+                print("HTTP GET skipped, body too large:", url, declared)
+                return None
+            body = bytearray()
+            for chunk in r.iter_content(chunk_size=chunk_size):
+                body += chunk
+                if len(body) > max_bytes:
+                    print("HTTP GET aborted, body exceeded", max_bytes, "bytes:", url)
+                    return None
+            return bytes(body)
     except Exception as e:
         print("HTTP GET failed:", url, e)
         return None
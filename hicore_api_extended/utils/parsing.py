@@ -10,3 +10,40 @@ def parse_structured_sections(text: str):
         header = header.strip().replace(' ', '_').lower()
         result[header] = '###'.join(content).strip()
     return result
+
+# Canonical section name -> heading spellings seen in papers
+SECTION_ALIASES = {
+    "abstract": r"abstract|summary",
+    "introduction": r"introduction|background",
+    "methods": r"methods?|methodology|materials\s+and\s+methods|methods\s+and\s+materials|experimental(?:\s+(?:setup|design|section|procedures?))?|study\s+design",
+    "results": r"results(?:\s+and\s+discussion)?|findings",
+    "discussion": r"discussion",
+    "conclusion": r"conclusions?|concluding\s+remarks",
+    "references": r"references|bibliography|works\s+cited|literature\s+cited",
+}
+
+# A heading is a line holding only an optional "2." / "II." / "3.1" number and a known section name.
+# TOC entries end in a page number, so they do not match.
+_SECTION_HEADING = re.compile(
+    r"^[ \t]*(?:(?:\d+(?:\.\d+)*|[IVX]+)[.)]?[ \t]+)?(?:"
+    + "|".join(f"(?P<{name}>{pattern})" for name, pattern in SECTION_ALIASES.items())
+    + r")[ \t]*[:.]?[ \t]*$",
+    re.I | re.M,
+)
+
+def build_section_index(text: str):
+    """One pass over the text: canonical section name -> (start, end) offsets of its body."""
+    candidates = [(m.start(), m.end(), m.lastgroup) for m in _SECTION_HEADING.finditer(text or "")]
+    bounds = [start for start, _, _ in candidates[1:]] + [len(text or "")]
+
+    # The same heading can also appear in a table of contents or as a stray line;
+    # keep the occurrence followed by the longest body.
+    best = {}
+    for (start, body_start, name), end in zip(candidates, bounds):
+        if name not in best or end - body_start > best[name][1] - best[name][0]:
+            best[name] = (body_start, end)
+
+    refs = best.get("references")
+    if refs:
+        best = {name: span for name, span in best.items() if name == "references" or span[0] < refs[0]}
+    return best
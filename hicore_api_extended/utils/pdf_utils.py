@@ -1,45 +1,102 @@
-import os, tempfile
-from .http_utils import safe_request_get
+import io, time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Tuple
+from config import Config
+from .http_utils import safe_request_stream
+from .parsing import build_section_index
 
 try:
     import pdfplumber
 except:
     pdfplumber = None
 
-def download_pdf_to_text(url: str) -> str:
+# Most recent download/parse timings, keyed by URL
+PDF_FETCH_TIMINGS: "OrderedDict[str, dict]" = OrderedDict()
+MAX_TIMING_ENTRIES = 256
+
+@dataclass
+class PDFDocument:
+    text: str
+    sections: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+
+    def section(self, name: str) -> str:
+        """Body of a canonical section (see parsing.SECTION_ALIASES), or "" if not found."""
+        span = self.sections.get(name)
+        return self.text[span[0]:span[1]].strip() if span else ""
+
+# Extracted text + section index of recently downloaded PDFs, keyed by URL
+PDF_DOCUMENT_CACHE: "OrderedDict[str, PDFDocument]" = OrderedDict()
+MAX_CACHED_DOCUMENTS = 64
+
+def _record_timing(url: str, **timing):
+    PDF_FETCH_TIMINGS[url] = timing
+    PDF_FETCH_TIMINGS.move_to_end(url)
+    while len(PDF_FETCH_TIMINGS) > MAX_TIMING_ENTRIES:
+        PDF_FETCH_TIMINGS.popitem(last=False)
+
+def pdf_bytes_to_text(data: bytes) -> str:
+    text = ""
+    if pdfplumber:
+        try:
+            with pdfplumber.open(io.BytesIO(data)) as pdf:
+                for p in pdf.pages:
+                    t = p.extract_text()
+                    if t:
+                        text += t + "\n"
+        except Exception:
+            pass
+
+    if not text:
+        try:
+            import fitz
+            with fitz.open(stream=data, filetype="pdf") as doc:
+                for page in doc:
+                    text += page.get_text()
+        except Exception:
+            pass
+
+    return text
+
+def download_pdf_document(url: str) -> PDFDocument:
+    """Download and extract a PDF once, indexing its sections at extraction time."""
+    if url in PDF_DOCUMENT_CACHE:
+        PDF_DOCUMENT_CACHE.move_to_end(url)
+        return PDF_DOCUMENT_CACHE[url]
+
+    text = download_pdf_to_text(url, use_cache=False)
+    doc = PDFDocument(text=text, sections=build_section_index(text))
+    if text:
+        PDF_DOCUMENT_CACHE[url] = doc
+        while len(PDF_DOCUMENT_CACHE) > MAX_CACHED_DOCUMENTS:
+            PDF_DOCUMENT_CACHE.popitem(last=False)
+    return doc
+
+def download_pdf_to_text(url: str, use_cache: bool = True) -> str:
     if not url:
         return ""
+    if use_cache:
+        return download_pdf_document(url).text
     try:
-        r = safe_request_get(url, timeout=30)
-        if not r or r.status_code != 200:
+        started = time.perf_counter()
+        data = safe_request_stream(
+            url,
+            max_bytes=Config.PDF_MAX_DOWNLOAD_BYTES,
+            timeout=(Config.PDF_CONNECT_TIMEOUT, Config.PDF_READ_TIMEOUT),
+        )
+        download_s = time.perf_counter() - started
+        if not data:
+            _record_timing(url, bytes=0, download_s=round(download_s, 3), parse_s=0.0)
             return ""
-        tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-        tmp.write(r.content)
-        tmp.flush()
-        tmp_path = tmp.name
-        tmp.close()
-
-        text = ""
-        if pdfplumber:
-            try:
-                with pdfplumber.open(tmp_path) as pdf:
-                    for p in pdf.pages:
-                        t = p.extract_text()
-                        if t:
-                            text += t + "\n"
-            except Exception:
-                pass
-
-        if not text:
-            try:
-                import fitz
-                with fitz.open(tmp_path) as doc:
-                    for page in doc:
-                        text += page.get_text()
-            except Exception:
-                pass
-
-        os.unlink(tmp_path)
+
+        parse_started = time.perf_counter()
+        text = pdf_bytes_to_text(data)
+        _record_timing(
+            url,
+            bytes=len(data),
+            download_s=round(download_s, 3),
+            parse_s=round(time.perf_counter() - parse_started, 3),
+        )
         return text or ""
     except Exception as e:
         print("download_pdf_to_text failed:", e)
@@ -1,4 +1,5 @@
 # main.py
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -8,6 +9,7 @@ from dotenv import load_dotenv
 
 from config import Config
 from api import router as api_router
+from sources.http_client import aclose_async_client, close_client
 
 # Load environment variables
 load_dotenv()
@@ -16,6 +18,14 @@ SERPAPI_KEY = os.getenv("SERPAPI_KEY")
 AZURE_OPENAI_API_KEY = os.getenv("AZURE_OPENAI_API_KEY")
 AZURE_OPENAI_ENDPOINT = os.getenv("AZURE_OPENAI_ENDPOINT")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Pooled outbound connections belong to the serving loop; close them before it stops
+    await aclose_async_client()
+    close_client()
+
+
 def create_app() -> FastAPI:
     # Ensure config is valid before app starts
     Config.verify_config()
@@ -23,7 +33,8 @@ def create_app() -> FastAPI:
     app = FastAPI(
         title="Search Analyzer API",
         version="1.0",
-        description="Summarizer and document analysis service"
+        description="Summarizer and document analysis service",
+        lifespan=lifespan
     )
 
     # Root route for debugging in Azure
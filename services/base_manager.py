@@ -1,9 +1,10 @@
+import asyncio
 from fastapi.responses import JSONResponse
 from fastapi import UploadFile, Form
 from datetime import datetime
 import os
 from enum import Enum
-from typing import Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, Tuple
 from services.types import DocumentTypeEnum
 from fastapi import Form
 from services.types import DocumentTypeEnum
@@ -14,13 +15,81 @@ from summarizer.docx_generator import SummaryDocxBuilder
 
 class BaseAPIManager:
     def __init__(self):
-        from sources.retriever import VectorRetriever
         from summarizer.llm_summarizer import LLMSummarizer
         
-        self.retriever = VectorRetriever()
         self.summarizer = LLMSummarizer()
         self.document_types = DocumentTypeEnum
 
+    def new_retriever(self):
+        """
+        A fresh index for one request. Requests await the LLM concurrently, so they must
+        not share an index; the embedding model itself is loaded once and shared.
+        """
+        from sources.retriever import VectorRetriever
+        return VectorRetriever()
+
+    async def summarize_and_save(
+        self, retriever, query: str, doc_type: str, pages: int, prefix: str, use_cache: bool = True
+    ) -> dict:
+        summary = await self.summarizer.asummarize_with_structure(retriever, query, doc_type, pages, use_cache)
+        filename = await asyncio.to_thread(self.save_docx, summary, prefix, doc_type)
+        return {"summary": summary, "download_link": f"/download/{filename}"}
+
+    async def stream_summary(
+        self,
+        prepare: Callable[[], Awaitable[Tuple[Any, str, dict]]],
+        doc_type: str,
+        pages: int,
+        prefix: str,
+        use_cache: bool = True
+    ) -> AsyncIterator[dict]:
+        """
+        Events for one streamed summary: "started" at once, "generating" once `prepare`
+        has fetched and indexed the source (it returns retriever, summary query and the
+        response fields), "delta" events as the LLM writes, then "done" with the response
+        fields, the summary and the link to the finished DOCX. Failures end with "error".
+        """
+        yield {"event": "started"}
+        try:
+            retriever, query, response = await prepare()
+            yield {"event": "generating"}
+            summary = None
+            async for event in self.summarizer.astream_with_structure(retriever, query, doc_type, pages, use_cache):
+                if event["event"] == "summary":
+                    summary = event["summary"]
+                else:
+                    yield event
+            filename = await asyncio.to_thread(self.save_docx, summary, prefix, doc_type)
+            yield {"event": "done", **response, "summary": summary, "download_link": f"/download/{filename}"}
+        except Exception as e:
+            yield {"event": "error", "error": str(e)}
+
+    async def progress_events(self, work: Callable[[Callable[[dict], None]], Awaitable[Any]]) -> AsyncIterator[dict]:
+        """
+        Run `work(emit)` and yield every event it passes to `emit`, as they arrive.
+        `emit` may be called from worker threads. An exception from `work` is raised
+        once its earlier events are yielded; the work is cancelled if the consumer stops.
+        """
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+
+        def emit(event: Optional[dict]):
+            loop.call_soon_threadsafe(events.put_nowait, event)
+
+        async def run():
+            try:
+                await work(emit)
+            finally:
+                emit(None)
+
+        task = asyncio.create_task(run())
+        try:
+            while (event := await events.get()) is not None:
+                yield event
+            await task
+        finally:
+            task.cancel()
+
     def save_docx(self, summary: dict, prefix: str, doc_type: str) -> str:
         """Save summary as DOCX under reports directory with timestamped filename."""
         timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
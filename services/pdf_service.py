@@ -1,34 +1,98 @@
 #services/pdf_service.py
+import asyncio
+from typing import AsyncIterator, List, Tuple
 from fastapi import UploadFile
 from fastapi.responses import JSONResponse
 from .base_manager import BaseAPIManager
 from sources.pdf_loader import PDFManager
-from services.types import DocumentTypeEnum
+from services.types import DocumentTypeEnum, get_doc_type_str
 from fastapi import UploadFile, Form
 from fastapi import Form
 from services.types import DocumentTypeEnum
+from config import Config
 
 class PDFClass(BaseAPIManager):
-    async def process_pdf(self, file: UploadFile, doc_type: DocumentTypeEnum = Form(...), pages: int = 2):
+    async def _prepare_pdf(self, name: str, extraction, doc_type_str: str):
+        retriever = self.new_retriever()
+        await asyncio.to_thread(
+            retriever.process_text,
+            extraction.text,
+            {"source": "pdf", "query": name, "doc_type": doc_type_str}
+        )
+        return retriever, extraction.text, {"raw_text": extraction.text, "metadata": extraction.metadata}
+
+    async def process_pdf(
+        self, file: UploadFile, doc_type: DocumentTypeEnum = Form(...), pages: int = 2, use_cache: bool = True
+    ):
         try:
-            text = await PDFManager().extract_text(file=file)
+            extraction = await PDFManager().extract(file=file)
             doc_type_str = doc_type.value if hasattr(doc_type, 'value') else doc_type
-            
-            self.retriever.process_text(
-                text,
-                metadata={"source": "pdf", "query": file.filename, "doc_type": doc_type_str}
-            )
-            summary = self.summarizer.summarize_with_structure(
-                self.retriever, text, doc_type_str, pages
-            )
-            filename = self.save_docx(summary, "pdf", doc_type_str)
-            return {
-                "raw_text": text, 
-                "summary": summary, 
-                "download_link": f"/download/{filename}"
-            }
+            retriever, query, response = await self._prepare_pdf(file.filename, extraction, doc_type_str)
+            return {**response, **await self.summarize_and_save(retriever, query, doc_type_str, pages, "pdf", use_cache)}
         except Exception as e:
             return JSONResponse(
                 status_code=500, 
                 content={"error": str(e)}
             )
+
+    def stream_pdf(
+        self, name: str, pdf_bytes: bytes, doc_type: DocumentTypeEnum, pages: int = 2, use_cache: bool = True
+    ) -> AsyncIterator[dict]:
+        """Streamed summary of an uploaded PDF; takes the bytes because the upload closes when the handler returns."""
+        doc_type_str = get_doc_type_str(doc_type)
+
+        async def prepare():
+            extraction = await PDFManager().extract_bytes(pdf_bytes)
+            return await self._prepare_pdf(name, extraction, doc_type_str)
+
+        return self.stream_summary(prepare, doc_type_str, pages, "pdf", use_cache)
+
+    async def _summarize_pdf_bytes(self, name: str, pdf_bytes: bytes, doc_type_str: str, pages: int) -> dict:
+        """Extract, index and summarize one in-memory PDF with its own retriever."""
+        extraction = await PDFManager().extract_bytes(pdf_bytes)
+        retriever, query, _ = await self._prepare_pdf(name, extraction, doc_type_str)
+        summary = await self.summarizer.asummarize_with_structure(retriever, query, doc_type_str, pages)
+        return {"file": name, "summary": summary, "metadata": extraction.metadata}
+
+    async def process_pdf_batch(
+        self,
+        files: List[Tuple[str, bytes]],
+        doc_type: DocumentTypeEnum = Form(...),
+        pages: int = 2,
+        combined_report: bool = False
+    ) -> AsyncIterator[dict]:
+        """
+        Summarize many PDFs concurrently (at most Config.BATCH_MAX_CONCURRENCY at a time),
+        yielding progress events as files start and finish. The last event is "done" and
+        carries every per-file result plus the combined report link, if requested.
+        """
+        doc_type_str = get_doc_type_str(doc_type)
+        semaphore = asyncio.Semaphore(Config.BATCH_MAX_CONCURRENCY)
+        results: List[dict] = [{} for _ in files]
+
+        async def run(emit, index: int, name: str, pdf_bytes: bytes):
+            async with semaphore:
+                emit({"event": "started", "index": index, "file": name})
+                try:
+                    results[index] = await self._summarize_pdf_bytes(name, pdf_bytes, doc_type_str, pages)
+                    emit({"event": "completed", "index": index, **results[index]})
+                except Exception as e:
+                    results[index] = {"file": name, "error": str(e)}
+                    emit({"event": "failed", "index": index, **results[index]})
+
+        async def summarize_all(emit):
+            await asyncio.gather(*(run(emit, i, name, data) for i, (name, data) in enumerate(files)))
+
+        yield {"event": "accepted", "files": [name for name, _ in files]}
+        async for event in self.progress_events(summarize_all):
+            yield event
+
+        done = {"event": "done", "results": results}
+        succeeded = [r for r in results if "summary" in r]
+        if combined_report and succeeded:
+            combined = {
+                "content": "\n\n".join(f"# {r['file']}\n\n{r['summary'].get('content', '')}" for r in succeeded)
+            }
+            filename = await asyncio.to_thread(self.save_docx, combined, "pdf_batch", doc_type_str)
+            done["download_link"] = f"/download/{filename}"
+        yield done
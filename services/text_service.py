@@ -1,18 +1,36 @@
 #services/text_service.py
+import asyncio
+from typing import AsyncIterator
 from fastapi.responses import JSONResponse
 from .base_manager import BaseAPIManager
 from fastapi import Form
 from services.types import DocumentTypeEnum
 
 class TextClass(BaseAPIManager):
-    async def process_text(self, text: str, doc_type: DocumentTypeEnum = Form(...), pages: int = 2):
+    async def _prepare_text(self, text: str, doc_type: DocumentTypeEnum):
+        retriever = self.new_retriever()
+        await asyncio.to_thread(
+            retriever.process_text,
+            text,
+            {"source": "text", "query": text, "doc_type": doc_type.value}
+        )
+        return retriever, text, {"raw_text": text}
+
+    async def process_text(
+        self, text: str, doc_type: DocumentTypeEnum = Form(...), pages: int = 2, use_cache: bool = True
+    ):
         try:
-            self.retriever.process_text(     
-                text,
-                metadata={"source": "text", "query": text, "doc_type": doc_type.value}
-            )
-            summary = self.summarizer.summarize_with_structure(self.retriever, text, doc_type.value, pages)
-            filename = self.save_docx(summary, "text", doc_type.value)
-            return {"raw_text": text, "summary": summary, "download_link": f"/download/{filename}"}
+            retriever, query, response = await self._prepare_text(text, doc_type)
+            return {
+                **response,
+                **await self.summarize_and_save(retriever, query, doc_type.value, pages, "text", use_cache)
+            }
         except Exception as e:
             return JSONResponse(status_code=500, content={"error": str(e)})
+
+    def stream_text(
+        self, text: str, doc_type: DocumentTypeEnum, pages: int = 2, use_cache: bool = True
+    ) -> AsyncIterator[dict]:
+        return self.stream_summary(
+            lambda: self._prepare_text(text, doc_type), doc_type.value, pages, "text", use_cache
+        )
@@ -1,26 +1,81 @@
 #services/web_service.py
+import asyncio
 from fastapi.responses import JSONResponse
 from .base_manager import BaseAPIManager
 from sources.web_search import WebSearchManager
 from fastapi import Form
+from typing import AsyncIterator, Optional
+from config import Config
 from services.types import DocumentTypeEnum
 
+CHARS_PER_TOKEN = 4
+CHARS_PER_PAGE = 500 * 6  # the summarizer targets ~500 words per page
+
 class WebClass(BaseAPIManager):
-    async def process(self, query: str, doc_type: DocumentTypeEnum = Form(...), pages: int = 2):
+    @staticmethod
+    def content_budget(pages: int) -> Optional[int]:
+        """
+        Characters of web text worth fetching: what the summarizer's retrieval window
+        can take for this many pages, times WEB_CONTENT_BUDGET_FACTOR of headroom for ranking.
+        """
+        if Config.WEB_CONTENT_BUDGET_FACTOR <= 0:
+            return None
+        window = Config.RETRIEVAL_MAX_TOKENS * CHARS_PER_TOKEN
+        return int(min(window, pages * CHARS_PER_PAGE) * Config.WEB_CONTENT_BUDGET_FACTOR)
+
+    async def _prepare_web(self, query: str, doc_type: DocumentTypeEnum, pages: int):
+        search_manager = WebSearchManager()
+        results = await search_manager.asearch_pages(query, char_budget=self.content_budget(pages))
+        fetched = [page for page in results if page.text and not page.error]
+        # Index each page as its own document so retrieved chunks carry their source URL.
+        retriever = self.new_retriever()
+        await asyncio.to_thread(
+            retriever.process_documents,
+            [page.text for page in fetched],
+            [
+                {
+                    "source": "web",
+                    "query": query,
+                    "doc_type": doc_type.value,
+                    "url": page.url,
+                    "title": page.title,
+                    "rank": page.rank
+                }
+                for page in fetched
+            ]
+        )
+        text = search_manager.format_results(query, results)
+        return retriever, query, {
+            "query": query,
+            "raw_text": text[:1000] + "..." if len(text) > 1000 else text,
+            "results": [
+                {
+                    "rank": page.rank,
+                    "url": page.url,
+                    "title": page.title,
+                    "chars": len(page.text),
+                    "fetch_seconds": page.fetch_seconds,
+                    "error": page.error
+                }
+                for page in results
+            ]
+        }
+
+    async def process(
+        self, query: str, doc_type: DocumentTypeEnum = Form(...), pages: int = 2, use_cache: bool = True
+    ):
         try:
-            search_manager = WebSearchManager()
-            text = search_manager.run(query)
-            self.retriever.process_text(
-                text,
-                metadata={"source": "web", "query": query, "doc_type": doc_type.value}
-            )
-            summary = self.summarizer.summarize_with_structure(self.retriever, query, doc_type.value, pages)
-            filename = self.save_docx(summary, "web", doc_type.value)
+            retriever, summary_query, response = await self._prepare_web(query, doc_type, pages)
             return {
-                "query": query,
-                "raw_text": text[:1000] + "..." if len(text) > 1000 else text,
-                "summary": summary,
-                "download_link": f"/download/{filename}"
+                **response,
+                **await self.summarize_and_save(retriever, summary_query, doc_type.value, pages, "web", use_cache)
             }
         except Exception as e:
             return JSONResponse(status_code=500, content={"error": str(e)})
+
+    def stream_web(
+        self, query: str, doc_type: DocumentTypeEnum, pages: int = 2, use_cache: bool = True
+    ) -> AsyncIterator[dict]:
+        return self.stream_summary(
+            lambda: self._prepare_web(query, doc_type, pages), doc_type.value, pages, "web", use_cache
+        )
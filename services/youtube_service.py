@@ -1,19 +1,110 @@
 #services/youtube_service.py
+import asyncio
+from typing import AsyncIterator, List, Optional, Tuple
 from .base_manager import BaseAPIManager
-from sources.video_transcript import YouTubeTranscriptFetcher
-from fastapi import Form 
-from services.types import DocumentTypeEnum
+from sources.transcript import Transcript, chunk_transcript
+from sources.video_transcript import YouTubeTranscriptFetcher, YouTubeTranscriptManager
+from fastapi import Form
+from fastapi.responses import JSONResponse
+from services.types import DocumentTypeEnum, get_doc_type_str
+from config import Config
 
 class YouTubeClass(BaseAPIManager):
-    async def process_youtube(self, url: str, doc_type: DocumentTypeEnum = Form(...), pages: int = 2):
+    @staticmethod
+    def _transcript_chunks(
+        url: str, transcript: Transcript, metadata: dict, max_chars: int
+    ) -> Tuple[List[str], List[dict]]:
+        """Chunk on snippet timestamps so retrieved passages can be cited as t= offsets."""
+        chunks = chunk_transcript(transcript, max_chars=max_chars)
+        return [chunk.text for chunk in chunks], [
+            {**metadata, "url": YouTubeTranscriptFetcher.timestamp_url(url, chunk.start), **chunk.metadata()}
+            for chunk in chunks
+        ]
+
+    async def _prepare_youtube(self, url: str, doc_type: DocumentTypeEnum):
+        transcript = await asyncio.to_thread(YouTubeTranscriptFetcher.get_transcript, url)
+        retriever = self.new_retriever()
+        chunks, metadatas = self._transcript_chunks(
+            url, transcript, {"source": "video", "query": url, "doc_type": doc_type.value}, retriever.chunk_size
+        )
+        await asyncio.to_thread(retriever.process_chunks, chunks, metadatas)
+        return retriever, transcript.text, {"raw_text": transcript.text}
+
+    async def process_youtube(
+        self, url: str, doc_type: DocumentTypeEnum = Form(...), pages: int = 2, use_cache: bool = True
+    ):
         try:
-            text = YouTubeTranscriptFetcher().get_transcript_direct(url)
-            self.retriever.process_text(
-                text,
-                metadata={"source": "video", "query": url, "doc_type": doc_type.value}
-            )
-            summary = self.summarizer.summarize_with_structure(self.retriever, text, doc_type.value, pages)
-            filename = self.save_docx(summary, "youtube", doc_type.value)
-            return {"raw_text": text, "summary": summary, "download_link": f"/download/{filename}"}
+            retriever, query, response = await self._prepare_youtube(url, doc_type)
+            return {
+                **response,
+                **await self.summarize_and_save(retriever, query, doc_type.value, pages, "youtube", use_cache)
+            }
         except Exception as e:
             return JSONResponse(status_code=500, content={"error": str(e)})
+
+    def stream_youtube(
+        self, url: str, doc_type: DocumentTypeEnum, pages: int = 2, use_cache: bool = True
+    ) -> AsyncIterator[dict]:
+        return self.stream_summary(
+            lambda: self._prepare_youtube(url, doc_type), doc_type.value, pages, "youtube", use_cache
+        )
+
+    async def process_youtube_batch(
+        self,
+        urls: List[str],
+        doc_type: DocumentTypeEnum = Form(...),
+        pages: int = 2
+    ) -> AsyncIterator[dict]:
+        """
+        Summarize several videos as one document. Transcripts are fetched by
+        YouTubeTranscriptManager.fetch_each (at most Config.YOUTUBE_MAX_WORKERS at a time,
+        each limited to Config.YOUTUBE_VIDEO_TIMEOUT) and yielded as progress events. All
+        transcripts go into one index whose chunks record their video, and one summary
+        is written. The last event is "done" and carries per-video outcomes and the summary.
+        """
+        doc_type_str = get_doc_type_str(doc_type)
+        manager = YouTubeTranscriptManager(
+            max_workers=Config.YOUTUBE_MAX_WORKERS, video_timeout=Config.YOUTUBE_VIDEO_TIMEOUT
+        )
+        transcripts: List[Optional[Transcript]] = []
+        videos: List[dict] = []
+
+        async def fetch_all(emit):
+            nonlocal transcripts, videos
+            transcripts, videos = await asyncio.to_thread(
+                manager.fetch_each, [{"index": i, "url": url} for i, url in enumerate(urls)], emit
+            )
+
+        yield {"event": "accepted", "videos": urls}
+        async for event in self.progress_events(fetch_all):
+            yield event
+
+        done = {"event": "done", "videos": videos}
+        fetched = [(url, t) for url, t in zip(urls, transcripts) if t is not None]
+        if not fetched:
+            done["error"] = "No transcripts could be fetched"
+            yield done
+            return
+
+        yield {"event": "summarizing", "videos": len(fetched)}
+        try:
+            retriever = self.new_retriever()
+            chunks, metadatas = [], []
+            for index, (url, transcript) in enumerate(zip(urls, transcripts)):
+                if transcript is None:
+                    continue
+                video_chunks, video_metadatas = self._transcript_chunks(url, transcript, {
+                    "source": "video", "query": url, "doc_type": doc_type_str,
+                    "video_index": index, "video_id": YouTubeTranscriptFetcher.get_video_id(url)
+                }, retriever.chunk_size)
+                chunks.extend(video_chunks)
+                metadatas.extend(video_metadatas)
+
+            await asyncio.to_thread(retriever.process_chunks, chunks, metadatas)
+            text = "\n\n".join(t.text for _, t in fetched)
+            summary = await self.summarizer.asummarize_with_structure(retriever, text, doc_type_str, pages)
+            filename = await asyncio.to_thread(self.save_docx, summary, "youtube_batch", doc_type_str)
+            done.update(summary=summary, download_link=f"/download/{filename}")
+        except Exception as e:
+            done["error"] = str(e)
+        yield done
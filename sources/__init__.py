@@ -1,6 +1,18 @@
 # sources/__init__.py
-from .pdf_loader import PDFManager
-from .video_transcript import YouTubeTranscriptManager
-from .web_search import WebSearchManager
+import importlib
+
+# Loaded on first access so that light submodules (pdf_worker, run in extraction
+# worker processes) can be imported without pulling in the whole package.
+_EXPORTS = {
+    "PDFManager": ".pdf_loader",
+    "YouTubeTranscriptManager": ".video_transcript",
+    "WebSearchManager": ".web_search",
+}
 
 __all__ = ["PDFManager","YouTubeTranscriptManager","WebSearchManager"]
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,141 @@
+# sources/html_extractor.py
+"""
+Main-content extraction for downloaded web pages.
+
+With lxml installed the page is parsed once in C, boilerplate subtrees are
+stripped in place, and a single pass over paragraph nodes credits each
+paragraph's text to its parent (in full) and grandparent (half). The
+best-scoring container, discounted by its link density, is the main content.
+Without lxml, extraction falls back to the BeautifulSoup selector cascade.
+"""
+import re
+from typing import Optional
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+MAX_CONTENT_CHARS = 10000
+_MIN_CONTENT_CHARS = 100
+_MIN_PARAGRAPH_CHARS = 25
+_CANDIDATES_CHECKED = 5
+_BOILERPLATE_TAGS = ("script", "style", "noscript", "nav", "footer", "header", "aside", "form")
+_PARAGRAPH_TAGS = ("p", "pre", "blockquote")
+_SEMANTIC_BONUS = {"article": 1.5, "main": 1.25}
+
+_LINK_TAG = re.compile(rb"<link\b[^>]*>", re.I)
+_REL_CANONICAL = re.compile(rb"""\brel\s*=\s*["']?[^"'>]*\bcanonical\b""", re.I)
+_HREF = re.compile(rb"""\bhref\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.I)
+_HEAD_BYTES = 64 * 1024
+_WHITESPACE = re.compile(r"\s+")
+_CITATION = re.compile(r"\[.*?\]")
+
+_CONTENT_SELECTORS = [
+    'article',
+    'main',
+    '.content',
+    '.main-content',
+    '#content',
+    '.post-content',
+    '.entry-content',
+    '.article-content',
+    '.story-content',
+    '.text-content',
+    '#main-content',
+    '.body-content'
+]
+
+
+def clean_text(content: str) -> str:
+    """Collapse whitespace, drop [citation] markers and cap the length."""
+    content = _WHITESPACE.sub(" ", content)
+    content = _CITATION.sub("", content).strip()
+    return content[:MAX_CONTENT_CHARS] + '...' if len(content) > MAX_CONTENT_CHARS else content
+
+
+def find_canonical_url(html: bytes) -> Optional[str]:
+    """href of <link rel="canonical"> in the page head, found without a second parse."""
+    for tag in _LINK_TAG.findall(html[:_HEAD_BYTES]):
+        if _REL_CANONICAL.search(tag):
+            href = _HREF.search(tag)
+            if href:
+                value = next(group for group in href.groups() if group is not None)
+                return value.decode("utf-8", "replace").strip() or None
+    return None
+
+
+def _best_container(doc):
+    """Score paragraph containers in one pass and return the densest one, or None."""
+    scores = {}
+    for para in doc.iter(*_PARAGRAPH_TAGS):
+        text = para.text_content()
+        length = len(text.strip())
+        if length < _MIN_PARAGRAPH_CHARS:
+            continue
+        score = 1 + text.count(",") + min(length // 100, 3)
+        parent = para.getparent()
+        if parent is None:
+            continue
+        scores[parent] = scores.get(parent, 0) + score
+        grandparent = parent.getparent()
+        if grandparent is not None:
+            scores[grandparent] = scores.get(grandparent, 0) + score / 2
+
+    best, best_score = None, 0.0
+    top = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:_CANDIDATES_CHECKED]
+    for node, score in top:
+        text_len = len(node.text_content()) or 1
+        link_len = sum(len(a.text_content()) for a in node.iter("a"))
+        adjusted = score * _SEMANTIC_BONUS.get(node.tag, 1.0) * (1 - link_len / text_len)
+        if adjusted > best_score:
+            best, best_score = node, adjusted
+    return best
+
+
+def extract_main_content_lxml(html: bytes) -> str:
+    doc = lxml.html.document_fromstring(html)
+    etree.strip_elements(doc, *_BOILERPLATE_TAGS, with_tail=False)
+    best = _best_container(doc)
+    content = best.text_content() if best is not None else ""
+    if len(content.strip()) < _MIN_CONTENT_CHARS:
+        body = doc.find("body")
+        content = (body if body is not None else doc).text_content()
+    return clean_text(content)
+
+
+def extract_main_content_soup(html: bytes) -> str:
+    """The original BeautifulSoup selector cascade; used when lxml is missing."""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Remove unwanted elements
+    for element in soup(['script', 'style', 'nav', 'footer', 'header', 'aside', 'form']):
+        element.decompose()
+
+    content = None
+    for selector in _CONTENT_SELECTORS:
+        content_elem = soup.select_one(selector)
+        if content_elem:
+            content = content_elem.get_text()
+            break
+
+    if not content:
+        # Fallback: get all paragraphs
+        paragraphs = soup.find_all('p')
+        content = ' '.join([p.get_text() for p in paragraphs if len(p.get_text()) > 50])
+
+    if not content or len(content.strip()) < _MIN_CONTENT_CHARS:
+        content = soup.body.get_text() if soup.body else soup.get_text()
+
+    return clean_text(content)
+
+
+def extract_main_content(html: bytes) -> str:
+    """Main text of a page, using the fastest available parser."""
+    if LXML_AVAILABLE:
+        return extract_main_content_lxml(html)
+    return extract_main_content_soup(html)
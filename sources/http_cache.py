@@ -0,0 +1,190 @@
+# sources/http_cache.py
+"""
+On-disk cache for fetched web pages.
+
+Each entry keeps the raw body, the extracted text and the validators
+(ETag / Last-Modified), so a fresh hit skips both the download and the HTML
+parse, and a stale hit is revalidated with a conditional GET. Freshness comes
+from a per-host TTL override when one matches, otherwise from Cache-Control /
+Expires, otherwise from the default TTL.
+"""
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from config import Config
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    body: bytes
+    text: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+    expires_at: float
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return (now or time.time()) < self.expires_at
+
+    def validators(self) -> Dict[str, str]:
+        """Headers for a conditional GET."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def parse_ttl_overrides(spec: str) -> Dict[str, float]:
+    """Parse "wikipedia.org=86400,reuters.com=600" into {host: seconds}."""
+    overrides = {}
+    for item in spec.split(","):
+        host, sep, ttl = item.partition("=")
+        if sep and host.strip() and ttl.strip():
+            overrides[host.strip().lower()] = float(ttl)
+    return overrides
+
+
+def _cache_control(headers: httpx.Headers) -> Dict[str, Optional[str]]:
+    directives = {}
+    for part in headers.get("Cache-Control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"') or None
+    return directives
+
+
+class HTTPCache:
+    """SQLite-backed page cache, safe to share between threads."""
+
+    def __init__(
+        self,
+        path: str = Config.HTTP_CACHE_PATH,
+        default_ttl: float = Config.HTTP_CACHE_DEFAULT_TTL,
+        ttl_overrides: Optional[Dict[str, float]] = None,
+        max_entries: int = Config.HTTP_CACHE_MAX_ENTRIES
+    ):
+        self.path = path
+        self.default_ttl = default_ttl
+        self.ttl_overrides = (
+            ttl_overrides if ttl_overrides is not None
+            else parse_ttl_overrides(Config.HTTP_CACHE_TTL_OVERRIDES)
+        )
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                "url TEXT PRIMARY KEY, body BLOB, text TEXT, etag TEXT, last_modified TEXT, "
+                "stored_at REAL, expires_at REAL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS pages_stored_at ON pages (stored_at)")
+
+    def _override_for(self, url: str) -> Optional[float]:
+        host = (urlparse(url).hostname or "").lower()
+        for domain, ttl in self.ttl_overrides.items():
+            if host == domain or host.endswith("." + domain):
+                return ttl
+        return None
+
+    def ttl_for(self, url: str, headers: httpx.Headers) -> Optional[float]:
+        """Seconds the response stays fresh; None when it must not be stored."""
+        directives = _cache_control(headers)
+        if "no-store" in directives:
+            return None
+        override = self._override_for(url)
+        if override is not None:
+            return override
+        if "no-cache" in directives:
+            return 0.0
+        for name in ("s-maxage", "max-age"):
+            value = directives.get(name)
+            if value and value.isdigit():
+                return float(value)
+        if "Expires" in headers:
+            try:
+                return max(parsedate_to_datetime(headers["Expires"]).timestamp() - time.time(), 0.0)
+            except (TypeError, ValueError):
+                return 0.0
+        return self.default_ttl
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, body, text, etag, last_modified, stored_at, expires_at FROM pages WHERE url = ?",
+                (url,)
+            ).fetchone()
+        return CacheEntry(*row) if row else None
+
+    def store(
+        self, url: str, response: httpx.Response, text: str, body: Optional[bytes] = None
+    ) -> Optional[CacheEntry]:
+        """Cache a 200 response together with its extracted text; `body` defaults to response.content."""
+        ttl = self.ttl_for(url, response.headers)
+        if response.status_code != 200 or ttl is None:
+            return None
+        now = time.time()
+        entry = CacheEntry(
+            url=url,
+            body=response.content if body is None else body,
+            text=text,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            stored_at=now,
+            expires_at=now + ttl,
+        )
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (entry.url, entry.body, entry.text, entry.etag, entry.last_modified, entry.stored_at, entry.expires_at)
+            )
+            self._conn.execute(
+                "DELETE FROM pages WHERE url IN (SELECT url FROM pages ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+        return entry
+
+    def revalidated(self, entry: CacheEntry, response: httpx.Response) -> CacheEntry:
+        """Extend a cached entry after a 304 Not Modified."""
+        ttl = self.ttl_for(entry.url, response.headers)
+        entry.expires_at = time.time() + (ttl or 0.0)
+        entry.etag = response.headers.get("ETag", entry.etag)
+        entry.last_modified = response.headers.get("Last-Modified", entry.last_modified)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE pages SET etag = ?, last_modified = ?, expires_at = ? WHERE url = ?",
+                (entry.etag, entry.last_modified, entry.expires_at, entry.url)
+            )
+        return entry
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM pages")
+
+
+_shared_cache: Optional[HTTPCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_http_cache() -> Optional[HTTPCache]:
+    """Process-wide page cache, or None when HTTP_CACHE_ENABLED is off."""
+    global _shared_cache
+    if not Config.HTTP_CACHE_ENABLED:
+        return None
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = HTTPCache()
+        return _shared_cache
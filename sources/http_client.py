@@ -0,0 +1,255 @@
+# sources/http_client.py
+"""
+Process-wide pooled HTTP clients for all outbound fetches.
+
+get_client() returns a shared httpx.Client, get_async_client() a shared
+httpx.AsyncClient for the running event loop. Both keep connections alive,
+speak HTTP/2 when the optional `h2` package is installed, cap connections per
+host and record connection reuse (see connection_stats()). Close them with
+close_client() and, before the loop stops, aclose_async_client().
+"""
+import asyncio
+import importlib.util
+import threading
+import weakref
+from collections import defaultdict
+from typing import Dict, Optional
+
+import httpx
+
+from config import Config
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class _ConnectionStats:
+    """Counts requests and newly opened TCP connections per host."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests: Dict[str, int] = defaultdict(int)
+        self.connections: Dict[str, int] = defaultdict(int)
+
+    def record_request(self, host: str):
+        with self._lock:
+            self.requests[host] += 1
+
+    def record_connection(self, host: str):
+        with self._lock:
+            self.connections[host] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            hosts = {
+                host: {
+                    "requests": count,
+                    "new_connections": self.connections.get(host, 0),
+                    "reused": count - self.connections.get(host, 0),
+                }
+                for host, count in self.requests.items()
+            }
+        total_requests = sum(h["requests"] for h in hosts.values())
+        total_connections = sum(h["new_connections"] for h in hosts.values())
+        return {
+            "http2": HTTP2_AVAILABLE,
+            "requests": total_requests,
+            "new_connections": total_connections,
+            "reuse_ratio": round(1 - total_connections / total_requests, 3) if total_requests else 0.0,
+            "hosts": hosts,
+        }
+
+    def reset(self):
+        with self._lock:
+            self.requests.clear()
+            self.connections.clear()
+
+
+STATS = _ConnectionStats()
+
+
+class _ReleasingStream(httpx.SyncByteStream):
+    """Response body that frees its per-host slot once the body is closed."""
+
+    def __init__(self, stream, release):
+        self._stream = stream
+        self._release = release
+
+    def __iter__(self):
+        yield from self._stream
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            if self._release:
+                self._release()
+                self._release = None
+
+
+class _AsyncReleasingStream(httpx.AsyncByteStream):
+    def __init__(self, stream, release):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._release:
+                self._release()
+                self._release = None
+
+
+class _PerHostTransport(httpx.BaseTransport):
+    """Wraps the pooled transport with a per-host concurrency cap and reuse tracing."""
+
+    def __init__(self, inner: httpx.BaseTransport, per_host: int):
+        self._inner = inner
+        self._per_host = per_host
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _slot(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if host not in self._slots:
+                self._slots[host] = threading.BoundedSemaphore(self._per_host)
+            return self._slots[host]
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        slot = self._slot(host)
+        slot.acquire()
+        try:
+            STATS.record_request(host)
+            request.extensions["trace"] = _sync_tracer(host)
+            response = self._inner.handle_request(request)
+        except BaseException:
+            slot.release()
+            raise
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_ReleasingStream(response.stream, slot.release),
+            extensions=response.extensions,
+        )
+
+    def close(self):
+        self._inner.close()
+
+
+class _AsyncPerHostTransport(httpx.AsyncBaseTransport):
+    def __init__(self, inner: httpx.AsyncBaseTransport, per_host: int):
+        self._inner = inner
+        self._per_host = per_host
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        slot = self._slots.get(host)
+        if slot is None:
+            slot = self._slots[host] = asyncio.Semaphore(self._per_host)
+        await slot.acquire()
+        try:
+            STATS.record_request(host)
+            request.extensions["trace"] = _async_tracer(host)
+            response = await self._inner.handle_async_request(request)
+        except BaseException:
+            slot.release()
+            raise
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_AsyncReleasingStream(response.stream, slot.release),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self):
+        await self._inner.aclose()
+
+
+def _sync_tracer(host: str):
+    def trace(event_name: str, info: dict):
+        if event_name == "connection.connect_tcp.complete":
+            STATS.record_connection(host)
+    return trace
+
+
+def _async_tracer(host: str):
+    async def trace(event_name: str, info: dict):
+        if event_name == "connection.connect_tcp.complete":
+            STATS.record_connection(host)
+    return trace
+
+
+def _client_options() -> dict:
+    return {
+        "timeout": httpx.Timeout(Config.HTTP_TIMEOUT, connect=Config.HTTP_CONNECT_TIMEOUT),
+        "follow_redirects": True,
+        "headers": {"User-Agent": Config.HTTP_USER_AGENT},
+    }
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=Config.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=Config.HTTP_MAX_CONNECTIONS,
+        keepalive_expiry=Config.HTTP_KEEPALIVE_EXPIRY,
+    )
+
+
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+# One async client per event loop: pooled connections cannot be shared across loops.
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def get_client() -> httpx.Client:
+    """Shared blocking client."""
+    global _client
+    with _client_lock:
+        if _client is None or _client.is_closed:
+            transport = httpx.HTTPTransport(http2=HTTP2_AVAILABLE, limits=_limits())
+            _client = httpx.Client(
+                transport=_PerHostTransport(transport, Config.HTTP_MAX_CONNECTIONS_PER_HOST),
+                **_client_options()
+            )
+        return _client
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Shared async client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        transport = httpx.AsyncHTTPTransport(http2=HTTP2_AVAILABLE, limits=_limits())
+        client = httpx.AsyncClient(
+            transport=_AsyncPerHostTransport(transport, Config.HTTP_MAX_CONNECTIONS_PER_HOST),
+            **_client_options()
+        )
+        _async_clients[loop] = client
+    return client
+
+
+def close_client():
+    """Close the shared blocking client; the next get_client() opens a fresh one."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+async def aclose_async_client():
+    """Close the running loop's async client; call before the loop shuts down."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def connection_stats() -> dict:
+    """Requests, new connections and reuse ratio since startup, overall and per host."""
+    return STATS.snapshot()
@@ -1,6 +1,9 @@
 # sources/pdf_loader.py
 import io
+import asyncio
+import multiprocessing
 import tempfile
+import time
 from enum import Enum
 from typing import Optional, Union, List
 from fastapi import UploadFile
@@ -9,13 +12,26 @@ from langchain_community.document_loaders import PyPDFLoader
 from pydantic import BaseModel
 
 # Local imports
+from config import Config
+from .pdf_worker import extract_pages
 from .retriever import RetrievalMethod, VectorRetriever
+from .text_normalizer import TextNormalizer
+
+# Workers start from a clean single-threaded server process rather than forking
+# this multi-threaded one, where a lock held by another thread would be copied
+# held into the child; Windows only has spawn.
+if "forkserver" in multiprocessing.get_all_start_methods():
+    _MP_CONTEXT = multiprocessing.get_context("forkserver")
+    _MP_CONTEXT.set_forkserver_preload(["sources.pdf_worker", "PyPDF2"])
+else:
+    _MP_CONTEXT = multiprocessing.get_context("spawn")
 
 
 class PDFExtractionResult(BaseModel):
     """Result of PDF text extraction."""
     text: str
     metadata: dict = {}
+    pages: List[str] = []
 
 
 class PDFExtractor:
@@ -45,11 +61,109 @@ class PDFExtractor:
                     
             return PDFExtractionResult(
                 text="\n".join(text_parts),
-                metadata=metadata
+                metadata=metadata,
+                pages=text_parts
             )
         except Exception as e:
             raise RuntimeError(f"Error reading PDF: {e}")
 
+    @staticmethod
+    def extract_text_with_deadlines(
+        pdf_bytes: bytes,
+        page_timeout: Optional[float] = None,
+        document_timeout: Optional[float] = None
+    ) -> PDFExtractionResult:
+        """
+        Extract text with PyPDF2 in a killable worker process.
+
+        A page that takes longer than page_timeout is skipped and the worker is
+        restarted on the next page; once document_timeout is spent the remaining
+        pages are skipped. Skipped pages are listed in metadata["skipped_pages"].
+        """
+        page_timeout = page_timeout or Config.PDF_PAGE_TIMEOUT
+        document_timeout = document_timeout or Config.PDF_DOCUMENT_TIMEOUT
+        started = time.monotonic()
+        deadline = started + document_timeout
+
+        page_texts = {}
+        skipped_pages = []
+        page_count = None
+        next_page = 0
+
+        while page_count is None or next_page < page_count:
+            parent_conn, child_conn = _MP_CONTEXT.Pipe(duplex=False)
+            worker = _MP_CONTEXT.Process(
+                target=extract_pages,
+                args=(PdfReader, pdf_bytes, next_page, child_conn),
+                daemon=True
+            )
+            worker.start()
+            child_conn.close()
+            reason = None
+            ready = False
+            try:
+                while page_count is None or next_page < page_count:
+                    # Process start-up counts against the document budget, not the page's.
+                    wait = deadline - time.monotonic()
+                    if ready:
+                        wait = min(page_timeout, wait)
+                    if wait <= 0 or not parent_conn.poll(wait):
+                        reason = "page_timeout" if time.monotonic() < deadline else "document_timeout"
+                        break
+                    try:
+                        message = parent_conn.recv()
+                    except EOFError:
+                        reason = "worker_exited"
+                        break
+
+                    kind = message[0]
+                    if kind == "ready":
+                        ready = True
+                    elif kind == "count":
+                        page_count = message[1]
+                    elif kind == "page":
+                        if message[2].strip():
+                            page_texts[message[1]] = message[2]
+                        next_page = message[1] + 1
+                    elif kind == "error":
+                        print(f"Error extracting text from page {message[1]+1}: {message[2]}")
+                        skipped_pages.append({"page": message[1] + 1, "reason": f"error: {message[2]}"})
+                        next_page = message[1] + 1
+                    elif kind == "fatal":
+                        raise RuntimeError(f"Error reading PDF: {message[1]}")
+            finally:
+                if worker.is_alive():
+                    worker.kill()
+                worker.join()
+                parent_conn.close()
+
+            if reason is None:
+                break
+            if page_count is None:
+                raise RuntimeError(f"Error reading PDF: could not open document ({reason})")
+            if reason == "document_timeout":
+                skipped_pages.extend(
+                    {"page": i + 1, "reason": reason} for i in range(next_page, page_count)
+                )
+                break
+            print(f"Skipping page {next_page+1}: {reason}")
+            skipped_pages.append({"page": next_page + 1, "reason": reason})
+            next_page += 1
+
+        metadata = {
+            "source": "bytes",
+            "extraction_method": "PyPDF2",
+            "page_count": page_count or 0,
+            "skipped_pages": skipped_pages,
+            "extraction_time": round(time.monotonic() - started, 3)
+        }
+        pages = [page_texts[i] for i in sorted(page_texts)]
+        return PDFExtractionResult(
+            text="\n".join(pages),
+            metadata=metadata,
+            pages=pages
+        )
+
     @staticmethod
     def extract_text_with_langchain(file_path: str) -> PDFExtractionResult:
         """Extract text using LangChain's PyPDFLoader."""
@@ -63,40 +177,80 @@ class PDFExtractor:
                 "page_count": len(documents)
             }
             
-            text = "\n".join(
+            pages = [
                 doc.page_content 
                 for doc in documents 
                 if doc.page_content.strip()
-            )
+            ]
             
             return PDFExtractionResult(
-                text=text,
-                metadata=metadata
+                text="\n".join(pages),
+                metadata=metadata,
+                pages=pages
             )
         except Exception as e:
             raise RuntimeError(f"Error extracting text with LangChain: {e}")
 
 class PDFManager:
-    def __init__(self, use_langchain: bool = False):
+    def __init__(
+        self,
+        use_langchain: bool = False,
+        page_timeout: Optional[float] = None,
+        document_timeout: Optional[float] = None,
+        normalize: bool = True
+    ):
         self.use_langchain = use_langchain
+        self.page_timeout = page_timeout
+        self.document_timeout = document_timeout
+        self.normalize = normalize
 
-    async def extract_text(
-        self, 
-        file_path: Optional[str] = None, 
+    async def extract(
+        self,
+        file_path: Optional[str] = None,
         file: Optional[UploadFile] = None
-    ) -> str:   # <-- return string, not model
+    ) -> PDFExtractionResult:
+        """
+        Extract text and metadata off the event loop, enforcing extraction deadlines,
+        then normalize it for chunking (see TextNormalizer).
+        """
         if not file_path and not file:
             raise ValueError("Either file_path or file must be provided")
 
+        if file_path and self.use_langchain:
+            result = await asyncio.to_thread(PDFExtractor.extract_text_with_langchain, file_path)
+            return self._normalize(result)
+
         if file_path:
-            if self.use_langchain:
-                result = PDFExtractor.extract_text_with_langchain(file_path)
-            else:
-                with open(file_path, "rb") as f:
-                    pdf_bytes = f.read()
-                result = PDFExtractor.extract_text_from_pdf_bytes(pdf_bytes)
+            with open(file_path, "rb") as f:
+                pdf_bytes = f.read()
         else:
             pdf_bytes = await file.read()
-            result = PDFExtractor.extract_text_from_pdf_bytes(pdf_bytes)
+        return await self.extract_bytes(pdf_bytes)
+
+    async def extract_bytes(self, pdf_bytes: bytes) -> PDFExtractionResult:
+        """Same as extract(), for PDF content already held in memory."""
+        return await asyncio.to_thread(self.extract_bytes_sync, pdf_bytes)
 
+    def extract_bytes_sync(self, pdf_bytes: bytes) -> PDFExtractionResult:
+        """Blocking extract_bytes(), for callers that are already off the event loop."""
+        result = PDFExtractor.extract_text_with_deadlines(
+            pdf_bytes,
+            self.page_timeout,
+            self.document_timeout
+        )
+        return self._normalize(result)
+
+    def _normalize(self, result: PDFExtractionResult) -> PDFExtractionResult:
+        if self.normalize and result.pages:
+            normalized = TextNormalizer().normalize_pages(result.pages)
+            result.text = normalized.text
+            result.metadata["normalization"] = normalized.metadata
+        return result
+
+    async def extract_text(
+        self, 
+        file_path: Optional[str] = None, 
+        file: Optional[UploadFile] = None
+    ) -> str:   # <-- return string, not model
+        result = await self.extract(file_path=file_path, file=file)
         return result.text
\ No newline at end of file
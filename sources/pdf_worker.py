@@ -0,0 +1,25 @@
+# sources/pdf_worker.py
+"""
+Child-process side of PDFExtractor.extract_text_with_deadlines.
+
+Kept to the standard library so worker processes start without importing the
+app; the PDF reader class is passed in by the parent.
+"""
+import io
+
+
+def extract_pages(reader_cls, pdf_bytes: bytes, start_page: int, conn) -> None:
+    """Extract pages from start_page onwards, sending each page back over conn."""
+    conn.send(("ready",))
+    try:
+        reader = reader_cls(io.BytesIO(pdf_bytes))
+        conn.send(("count", len(reader.pages)))
+        for i in range(start_page, len(reader.pages)):
+            try:
+                conn.send(("page", i, reader.pages[i].extract_text() or ""))
+            except Exception as e:
+                conn.send(("error", i, str(e)))
+    except Exception as e:
+        conn.send(("fatal", str(e)))
+    finally:
+        conn.close()
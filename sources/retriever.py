@@ -1,6 +1,7 @@
 # sources/retriever.py
 # Fix faiss import issue on Windows
 import sys
+import threading
 try:
     import faiss  # normal import
 except ImportError:
@@ -15,6 +16,13 @@ from langchain_community.vectorstores import FAISS
 from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 
+from config import Config
+
+# Embedding models are expensive to load, so every retriever in the process shares them.
+_EMBEDDINGS: Dict[str, HuggingFaceEmbeddings] = {}
+_EMBEDDINGS_LOCK = threading.Lock()
+
+
 class RetrievalMethod(str, Enum):
     TFIDF = "tfidf"
     EMBEDDINGS = "embeddings"
@@ -48,13 +56,16 @@ class VectorRetriever:
         )
 
     def _initialize_embeddings(self):
-        """Initialize the embedding model."""
+        """Initialize the embedding model, reusing an already-loaded one if available."""
         if self.embeddings is None:
-            self.embeddings = HuggingFaceEmbeddings(
-                model_name=self.model_name,
-                model_kwargs={'device': 'cpu'},
-                encode_kwargs={'normalize_embeddings': True}
-            )
+            with _EMBEDDINGS_LOCK:
+                if self.model_name not in _EMBEDDINGS:
+                    _EMBEDDINGS[self.model_name] = HuggingFaceEmbeddings(
+                        model_name=self.model_name,
+                        model_kwargs={'device': 'cpu'},
+                        encode_kwargs={'normalize_embeddings': True}
+                    )
+                self.embeddings = _EMBEDDINGS[self.model_name]
 
     def process_text(self, text: str, metadata: Optional[dict] = None) -> List[str]:
         """Process text into chunks and prepare for search."""
@@ -75,6 +86,32 @@ class VectorRetriever:
         
         return chunks
 
+    def process_documents(self, texts: List[str], metadatas: List[dict]) -> List[str]:
+        """Chunk several documents into one index, each chunk keeping its own document's metadata."""
+        chunks, chunk_metadatas = [], []
+        for text, metadata in zip(texts, metadatas):
+            if not text.strip():
+                continue
+            doc_chunks = self.text_splitter.split_text(text)
+            chunks.extend(doc_chunks)
+            chunk_metadatas.extend([metadata] * len(doc_chunks))
+        return self.process_chunks(chunks, chunk_metadatas)
+
+    def process_chunks(self, chunks: List[str], metadatas: List[dict]) -> List[str]:
+        """Index chunks that were already cut (e.g. on transcript timestamps) without re-splitting them."""
+        if not chunks:
+            return []
+
+        if self.retrieval_method == RetrievalMethod.FAISS:
+            self._initialize_embeddings()
+            self.vectorstore = FAISS.from_texts(
+                chunks,
+                embedding=self.embeddings,
+                metadatas=metadatas
+            )
+
+        return chunks
+
     def search(self, query: str, k: int = 3) -> List[SearchResult]:
         """Search for relevant text chunks."""
         if self.vectorstore is None:
@@ -124,16 +161,25 @@ class VectorRetriever:
             return []
 
         top_chunks = self.vectorstore.similarity_search(query, k=20)  # retrieve more than needed
+        # Sparse transcript chunks (music, long pauses) only fill whatever budget the others leave.
+        top_chunks.sort(key=lambda doc: self._is_sparse(getattr(doc, "metadata", None) or {}))
         selected_chunks = []
         total_chars = 0
         for doc in top_chunks:
             text = doc.page_content if hasattr(doc, "page_content") else str(doc)
+            metadata = getattr(doc, "metadata", None) or {}
+            if "start" in metadata:
+                text = f"[t={int(metadata['start'])}s] {text}"
             if total_chars + len(text) > max_tokens * 4:  # rough char->token estimate
                 break
             selected_chunks.append(text)
             total_chars += len(text)
         return selected_chunks
 
+    @staticmethod
+    def _is_sparse(metadata: dict) -> bool:
+        return metadata.get("words_per_second", Config.TRANSCRIPT_MIN_WORDS_PER_SECOND) < Config.TRANSCRIPT_MIN_WORDS_PER_SECOND
+
     def get_relevant_documents(self, query: str, k: int = 3):
         """Return Document objects (langchain style)."""
         if self.vectorstore is None:
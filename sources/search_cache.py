@@ -0,0 +1,118 @@
+# sources/search_cache.py
+"""
+TTL cache for DuckDuckGo result lists, shared by every worker process through
+one SQLite file.
+
+Entries younger than `ttl` are served as-is. Entries between `ttl` and
+`ttl + stale_ttl` are served immediately while a single background refresh
+(claimed across processes) replaces them. Anything older is fetched inline.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, List, Optional
+
+from config import Config
+
+REFRESH_CLAIM_SECONDS = 60  # a crashed refresher's claim expires after this
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+class SearchCache:
+    def __init__(
+        self,
+        path: str = Config.SEARCH_CACHE_PATH,
+        ttl: float = Config.SEARCH_CACHE_TTL,
+        stale_ttl: float = Config.SEARCH_CACHE_STALE_TTL
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")  # readers in other workers don't block writers
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS searches ("
+                "key TEXT PRIMARY KEY, results TEXT, fetched_at REAL, refresh_claimed_at REAL)"
+            )
+
+    @staticmethod
+    def make_key(namespace: str, query: str, max_results: int) -> str:
+        return f"{namespace}:{max_results}:{normalize_query(query)}"
+
+    def _read(self, key: str):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT results, fetched_at FROM searches WHERE key = ?", (key,)
+            ).fetchone()
+
+    def _write(self, key: str, results: List[dict]):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO searches (key, results, fetched_at, refresh_claimed_at) VALUES (?, ?, ?, NULL)",
+                (key, json.dumps(results), time.time())
+            )
+
+    def _claim_refresh(self, key: str) -> bool:
+        """True for exactly one caller (in any worker) until the refresh finishes or the claim expires."""
+        now = time.time()
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE searches SET refresh_claimed_at = ? "
+                "WHERE key = ? AND (refresh_claimed_at IS NULL OR refresh_claimed_at < ?)",
+                (now, key, now - REFRESH_CLAIM_SECONDS)
+            )
+        return cursor.rowcount == 1
+
+    def _release_claim(self, key: str):
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE searches SET refresh_claimed_at = NULL WHERE key = ?", (key,))
+
+    def _refresh(self, key: str, fetch: Callable[[], List[dict]]):
+        try:
+            self._write(key, fetch())
+        except Exception as e:
+            print(f"Background search refresh failed for {key}: {e}")
+            self._release_claim(key)
+
+    def get_or_fetch(self, key: str, fetch: Callable[[], List[dict]]) -> List[dict]:
+        row = self._read(key)
+        if row:
+            results, fetched_at = json.loads(row[0]), row[1]
+            age = time.time() - fetched_at
+            if age < self.ttl:
+                return results
+            if age < self.ttl + self.stale_ttl:
+                if self._claim_refresh(key):
+                    threading.Thread(target=self._refresh, args=(key, fetch), daemon=True).start()
+                return results
+        results = fetch()
+        self._write(key, results)
+        return results
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM searches")
+
+
+_shared_cache: Optional[SearchCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_search_cache() -> Optional[SearchCache]:
+    """Process-wide search cache, or None when SEARCH_CACHE_ENABLED is off."""
+    global _shared_cache
+    if not Config.SEARCH_CACHE_ENABLED:
+        return None
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = SearchCache()
+        return _shared_cache
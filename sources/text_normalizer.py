@@ -0,0 +1,112 @@
+# sources/text_normalizer.py
+import math
+import re
+from collections import Counter
+from typing import List, Tuple
+from pydantic import BaseModel
+
+# Compiled once; each pass below is a single regex sweep over the whole document.
+_HYPHEN_BREAK = re.compile(r"(?<=[A-Za-z])-[ \t]*\n[ \t]*(?=[a-z])")
+# Matched against single lines at page edges only; a bare number inside the body (a year, a table cell) stays.
+_PAGE_NUMBER_LINE = re.compile(r"^[ \t]*(?:page[ \t]+)?[-–]?[ \t]*\d{1,4}[ \t]*(?:(?:of|/)[ \t]*\d{1,4})?[ \t]*[-–]?[ \t]*$", re.I)
+_INLINE_WHITESPACE = re.compile(r"[ \t\f\v\u00a0]+")
+_TRAILING_WHITESPACE = re.compile(r"[ \t]+$", re.M)
+_LEADING_WHITESPACE = re.compile(r"^[ \t]+", re.M)
+_BLANK_LINES = re.compile(r"\n{3,}")
+_DIGITS = re.compile(r"\d+")
+
+CHARS_PER_TOKEN = 4  # same rough estimate VectorRetriever uses
+
+
+class NormalizationResult(BaseModel):
+    """Normalized text plus a report of what was stripped."""
+    text: str
+    metadata: dict = {}
+
+
+class TextNormalizer:
+    """Cleans extracted PDF text before chunking so LLM prompts don't pay for layout noise."""
+
+    def __init__(self, repeat_ratio: float = 0.5, edge_lines: int = 3, min_pages: int = 3):
+        self.repeat_ratio = repeat_ratio
+        self.edge_lines = edge_lines
+        self.min_pages = min_pages
+
+    @staticmethod
+    def _line_key(line: str) -> str:
+        """Header/footer identity: case-folded, with page numbers masked."""
+        return _DIGITS.sub("#", " ".join(line.split()).lower())
+
+    def _edge_indices(self, lines: List[str]) -> List[int]:
+        """Indices of the first and last few non-empty lines of a page."""
+        non_empty = [i for i, line in enumerate(lines) if line.strip()]
+        # On short pages the "edges" would swallow the body, so only look at the outermost lines.
+        edge = self.edge_lines if len(non_empty) > 2 * self.edge_lines else 1
+        return sorted(set(non_empty[:edge] + non_empty[-edge:]))
+
+    def _strip_running_lines(self, pages: List[str]) -> Tuple[List[str], int]:
+        """Drop header/footer lines that repeat at the page edges of most pages."""
+        if len(pages) < self.min_pages:
+            return pages, 0
+
+        page_lines = [page.splitlines() for page in pages]
+        counts = Counter()
+        for lines in page_lines:
+            counts.update({self._line_key(lines[i]) for i in self._edge_indices(lines)})
+
+        threshold = max(2, math.ceil(self.repeat_ratio * len(pages)))
+        running = {key for key, n in counts.items() if n >= threshold and key.strip("# ")}
+        if not running:
+            return pages, 0
+
+        removed = 0
+        cleaned = []
+        for lines in page_lines:
+            drop = {i for i in self._edge_indices(lines) if self._line_key(lines[i]) in running}
+            removed += len(drop)
+            cleaned.append("\n".join(line for i, line in enumerate(lines) if i not in drop))
+        return cleaned, removed
+
+    @staticmethod
+    def _strip_page_numbers(pages: List[str]) -> Tuple[List[str], int]:
+        """Drop a page-number line when it is the first or last non-empty line of its page."""
+        removed = 0
+        cleaned = []
+        for page in pages:
+            lines = page.splitlines()
+            non_empty = [i for i, line in enumerate(lines) if line.strip()]
+            drop = {i for i in non_empty[:1] + non_empty[-1:] if _PAGE_NUMBER_LINE.match(lines[i])}
+            removed += len(drop)
+            cleaned.append("\n".join(line for i, line in enumerate(lines) if i not in drop))
+        return cleaned, removed
+
+    def normalize_pages(self, pages: List[str]) -> NormalizationResult:
+        """Normalize a document given as per-page text."""
+        chars_before = sum(len(p) for p in pages) + max(len(pages) - 1, 0)
+        pages, running_lines = self._strip_running_lines(pages)
+        pages, page_numbers = self._strip_page_numbers(pages)
+
+        text = "\n".join(pages)
+        text, hyphenations = _HYPHEN_BREAK.subn("", text)
+        text = _INLINE_WHITESPACE.sub(" ", text)
+        text = _TRAILING_WHITESPACE.sub("", text)
+        text = _LEADING_WHITESPACE.sub("", text)
+        text = _BLANK_LINES.sub("\n\n", text).strip()
+
+        chars_removed = chars_before - len(text)
+        return NormalizationResult(
+            text=text,
+            metadata={
+                "chars_before": chars_before,
+                "chars_after": len(text),
+                "chars_removed": chars_removed,
+                "est_tokens_removed": chars_removed // CHARS_PER_TOKEN,
+                "running_lines_removed": running_lines,
+                "page_numbers_removed": page_numbers,
+                "hyphenations_joined": hyphenations,
+            }
+        )
+
+    def normalize(self, text: str) -> NormalizationResult:
+        """Normalize a single block of text (no cross-page header detection)."""
+        return self.normalize_pages([text])
@@ -0,0 +1,131 @@
+# sources/transcript.py
+"""
+Compact in-memory form of a video transcript.
+
+The snippet texts are joined into one string, and each snippet's character
+offset, start and duration are kept in parallel typed arrays. Consumers
+therefore get plain text for summarizing and timings for locating passages,
+without holding one Python object per snippet.
+
+chunk_transcript() cuts the text on snippet boundaries into chunks that
+carry their start and end times.
+"""
+import struct
+from array import array
+from dataclasses import dataclass, field
+from typing import Iterable, List
+
+from config import Config
+
+_HEADER = struct.Struct("<I")
+
+
+@dataclass
+class Transcript:
+    text: str = ""
+    offsets: array = field(default_factory=lambda: array("I"))    # start of each snippet in `text`
+    starts: array = field(default_factory=lambda: array("d"))     # seconds
+    durations: array = field(default_factory=lambda: array("d"))  # seconds
+
+    @classmethod
+    def from_snippets(cls, snippets: Iterable) -> "Transcript":
+        """Build from FetchedTranscriptSnippet objects or raw {"text", "start", "duration"} dicts."""
+        parts = []
+        offsets, starts, durations = array("I"), array("d"), array("d")
+        position = 0
+        for snippet in snippets:
+            if isinstance(snippet, dict):
+                text, start, duration = snippet.get("text", ""), snippet.get("start", 0), snippet.get("duration", 0)
+            else:
+                text, start, duration = snippet.text, snippet.start, snippet.duration
+            text = " ".join(text.split())
+            if not text:
+                continue
+            offsets.append(position)
+            starts.append(float(start or 0))
+            durations.append(float(duration or 0))
+            parts.append(text)
+            position += len(text) + 1
+        return cls(" ".join(parts), offsets, starts, durations)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def snippet_end(self, index: int) -> int:
+        """End of snippet `index` in `text` (exclusive)."""
+        return self.offsets[index + 1] - 1 if index + 1 < len(self.offsets) else len(self.text)
+
+    def to_bytes(self) -> bytes:
+        return (
+            _HEADER.pack(len(self.offsets))
+            + self.offsets.tobytes() + self.starts.tobytes() + self.durations.tobytes()
+            + self.text.encode("utf-8")
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Transcript":
+        (count,) = _HEADER.unpack_from(data)
+        position = _HEADER.size
+        arrays = []
+        for typecode in ("I", "d", "d"):
+            values = array(typecode)
+            size = count * values.itemsize
+            values.frombytes(data[position:position + size])
+            arrays.append(values)
+            position += size
+        return cls(data[position:].decode("utf-8"), *arrays)
+
+
+_SENTENCE_ENDS = (".", "!", "?", "\u2026")
+
+
+@dataclass
+class TranscriptChunk:
+    text: str
+    start: float
+    end: float
+    words_per_second: float
+
+    def metadata(self) -> dict:
+        return {"start": round(self.start, 2), "end": round(self.end, 2), "words_per_second": round(self.words_per_second, 2)}
+
+
+def chunk_transcript(
+    transcript: Transcript,
+    max_chars: int = 1000,
+    max_seconds: float = Config.TRANSCRIPT_CHUNK_SECONDS,
+    min_fill: float = 0.5
+) -> List[TranscriptChunk]:
+    """
+    Group whole snippets into chunks of at most `max_chars` characters and
+    `max_seconds` of video. Once a chunk is `min_fill` full it is closed at
+    the next snippet that ends a sentence, so chunks rarely stop mid-thought.
+    """
+    chunks: List[TranscriptChunk] = []
+    first = None
+    end_time = 0.0
+
+    def close(last: int):
+        text = transcript.text[transcript.offsets[first]:transcript.snippet_end(last)]
+        start = transcript.starts[first]
+        seconds = max(end_time - start, 1e-6)
+        chunks.append(TranscriptChunk(text, start, end_time, len(text.split()) / seconds))
+
+    for i in range(len(transcript)):
+        snippet_end = transcript.starts[i] + transcript.durations[i]
+        if first is not None:
+            length = transcript.snippet_end(i) - transcript.offsets[first]
+            if length > max_chars or snippet_end - transcript.starts[first] > max_seconds:
+                close(i - 1)
+                first = None
+        if first is None:
+            first, end_time = i, snippet_end
+        end_time = max(end_time, snippet_end)
+
+        length = transcript.snippet_end(i) - transcript.offsets[first]
+        if length >= max_chars * min_fill and transcript.text[transcript.snippet_end(i) - 1] in _SENTENCE_ENDS:
+            close(i)
+            first = None
+    if first is not None:
+        close(len(transcript) - 1)
+    return chunks
@@ -0,0 +1,91 @@
+# sources/transcript_cache.py
+"""
+Persistent cache of YouTube transcripts keyed by (video ID, language).
+
+Transcripts (text plus snippet timings) are stored zlib-compressed in SQLite. When the compressed total
+passes `max_bytes`, the least recently read transcripts are evicted.
+"""
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Optional
+
+from config import Config
+from .transcript import Transcript
+
+
+class TranscriptCache:
+    def __init__(self, path: str = Config.TRANSCRIPT_CACHE_PATH, max_bytes: int = Config.TRANSCRIPT_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS transcripts ("
+                "video_id TEXT, language TEXT, data BLOB, size INTEGER, last_access REAL, "
+                "PRIMARY KEY (video_id, language))"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS transcripts_last_access ON transcripts (last_access)")
+
+    def get(self, video_id: str, language: str) -> Optional[Transcript]:
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT data FROM transcripts WHERE video_id = ? AND language = ?", (video_id, language)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE transcripts SET last_access = ? WHERE video_id = ? AND language = ?",
+                (time.time(), video_id, language)
+            )
+        return Transcript.from_bytes(zlib.decompress(row[0]))
+
+    def put(self, video_id: str, language: str, transcript: Transcript):
+        data = zlib.compress(transcript.to_bytes(), 6)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO transcripts VALUES (?, ?, ?, ?, ?)",
+                (video_id, language, data, len(data), time.time())
+            )
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently read transcripts until the compressed total fits in max_bytes."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM transcripts").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT video_id, language, size FROM transcripts ORDER BY last_access").fetchall()
+        for video_id, language, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM transcripts WHERE video_id = ? AND language = ?", (video_id, language))
+            total -= size
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM transcripts").fetchone()[0]
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM transcripts")
+
+
+_shared_cache: Optional[TranscriptCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_transcript_cache() -> Optional[TranscriptCache]:
+    """Process-wide transcript cache, or None when TRANSCRIPT_CACHE_ENABLED is off."""
+    global _shared_cache
+    if not Config.TRANSCRIPT_CACHE_ENABLED:
+        return None
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = TranscriptCache()
+        return _shared_cache
@@ -0,0 +1,87 @@
+# sources/url_dedup.py
+"""
+Duplicate detection for web search results.
+
+canonicalize_url() maps tracking-parameter, AMP, mobile and http/https
+variants of a URL to one key, so duplicates are dropped before fetching.
+content_fingerprint() / is_near_duplicate() catch syndication mirrors that
+only show up once their text is known.
+"""
+import re
+from typing import FrozenSet, List
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid",
+    "ref", "ref_src", "ref_url", "referrer", "spm", "cmpid", "_ga", "_gl",
+    "amp", "outputtype", "smid", "ocid",
+}
+TRACKING_PREFIXES = ("utm_", "pk_", "hsa_", "__hs", "vero_", "oly_")
+_HOST_PREFIXES = ("www.", "m.", "mobile.", "amp.")
+_AMP_PATH = re.compile(r"(?:/amp/?|\.amp)$|^/amp(?=/)", re.I)
+_REPEATED_SLASHES = re.compile(r"/{2,}")
+_WORD = re.compile(r"\w+")
+
+SHINGLE_WORDS = 5
+MAX_FINGERPRINT_WORDS = 3000
+NEAR_DUPLICATE_THRESHOLD = 0.8
+
+
+def _is_tracking(param: str) -> bool:
+    param = param.lower()
+    return param in TRACKING_PARAMS or param.startswith(TRACKING_PREFIXES)
+
+
+def canonicalize_url(url: str) -> str:
+    """Dedup key for a URL: https, bare lower-case host, no AMP suffix, tracking params or fragment."""
+    parts = urlsplit(url.strip())
+    scheme = "https" if parts.scheme.lower() in ("http", "https") else parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    for prefix in _HOST_PREFIXES:
+        if host.startswith(prefix) and host.count(".") > 1:
+            host = host[len(prefix):]
+            break
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    netloc = host if port in (None, 80, 443) else f"{host}:{port}"
+
+    path = _AMP_PATH.sub("", _REPEATED_SLASHES.sub("/", parts.path)) or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not _is_tracking(k))
+    return urlunsplit((scheme, netloc, path, urlencode(query), ""))
+
+
+def dedupe_results(results: List[dict], url_key: str = "href") -> List[dict]:
+    """Drop search results whose URL canonicalizes to one already seen, keeping rank order."""
+    seen = set()
+    unique = []
+    for result in results:
+        key = canonicalize_url(result.get(url_key) or "")
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(result)
+    return unique
+
+
+def content_fingerprint(text: str) -> FrozenSet[int]:
+    """Hashed word shingles of the (leading part of the) text."""
+    words = _WORD.findall(text.lower())[:MAX_FINGERPRINT_WORDS]
+    if len(words) < SHINGLE_WORDS:
+        return frozenset([hash(" ".join(words))]) if words else frozenset()
+    return frozenset(
+        hash(" ".join(words[i:i + SHINGLE_WORDS])) for i in range(len(words) - SHINGLE_WORDS + 1)
+    )
+
+
+def is_near_duplicate(a: FrozenSet[int], b: FrozenSet[int], threshold: float = NEAR_DUPLICATE_THRESHOLD) -> bool:
+    """
+    True when most of the shorter text's shingles appear in the other, which also
+    catches a mirror that carries a truncated copy of the article.
+    """
+    if not a or not b:
+        return False
+    return len(a & b) / min(len(a), len(b)) >= threshold
@@ -1,17 +1,45 @@
 # sources/video_transcript.py
+import csv
+import json
+import math
 import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 from ddgs import DDGS
+from typing import Callable, Dict, List, Optional, Tuple
+from pydantic import BaseModel
 from youtube_transcript_api import YouTubeTranscriptApi
 
+from config import Config
+from .search_cache import SearchCache, get_search_cache
+from .transcript import Transcript
+from .transcript_cache import get_transcript_cache
+
+DEFAULT_TRANSCRIPT_LANGUAGE = "en"
+_BARE_VIDEO_ID = re.compile(r"^[0-9A-Za-z_-]{11}$")
+
 
 class YouTubeSearch:
     """Handles searching for YouTube videos using DuckDuckGo."""
 
-    def __init__(self, max_results: int = 10):
+    def __init__(self, max_results: int = 10, search_cache: Optional[SearchCache] = None):
         self.max_results = max_results
+        self._search_cache = search_cache
+
+    @property
+    def search_cache(self) -> Optional[SearchCache]:
+        """The given cache, else the shared one, opened on first search rather than at construction."""
+        return self._search_cache if self._search_cache is not None else get_search_cache()
 
     def search(self, query: str) -> list[dict]:
+        if not self.search_cache:
+            return self._ddgs_search(query)
+        key = SearchCache.make_key("youtube", query, self.max_results)
+        return self.search_cache.get_or_fetch(key, lambda: self._ddgs_search(query))
+
+    def _ddgs_search(self, query: str) -> list[dict]:
         results = []
         with DDGS() as ddgs:
             for i, r in enumerate(ddgs.text(f"site:youtube.com {query}", max_results=self.max_results)):
@@ -28,6 +56,7 @@ class YouTubeSearch:
 
 class YouTubeTranscriptFetcher:
 
+    @staticmethod
     def get_video_id(url):
         """
         Extracts the video ID from a YouTube URL.
@@ -39,51 +68,198 @@ class YouTubeTranscriptFetcher:
         else:
             raise ValueError("Invalid YouTube URL")
 
-    def get_transcript_direct(url):
+    @staticmethod
+    def timestamp_url(url, seconds: float) -> str:
+        """Watch URL that starts playback at `seconds`."""
+        video_id = YouTubeTranscriptFetcher.get_video_id(url)
+        return f"https://www.youtube.com/watch?v={video_id}&t={int(seconds)}s"
 
-        video_id = get_video_id(url)
-        try:
-            transcript_api = YouTubeTranscriptApi()
+    @staticmethod
+    def get_transcript(url, language: str = DEFAULT_TRANSCRIPT_LANGUAGE) -> Transcript:
+        """
+        Transcript of a video with snippet timings, served from the transcript
+        cache when this video and language have been fetched before.
+        """
+        video_id = YouTubeTranscriptFetcher.get_video_id(url)
+        cache = get_transcript_cache()
+        if cache:
+            cached = cache.get(video_id, language)
+            if cached is not None:
+                return cached
+        transcript_api = YouTubeTranscriptApi()
+        if language == DEFAULT_TRANSCRIPT_LANGUAGE:
             result = transcript_api.fetch(video_id)
-            
-            # Let's inspect the object structure
-            print(f"Object type: {type(result)}")
-            print(f"Object attributes: {[attr for attr in dir(result) if not attr.startswith('_')]}")
-            
-            # Try to access the transcript data
-            if hasattr(result, '_transcript_data'):
-                transcript_data = result._transcript_data
-                if isinstance(transcript_data, list):
-                    return " ".join([entry.get('text', '') for entry in transcript_data])
-            
-            # If that doesn't work, try to convert to string and parse
-            result_str = str(result)
-            if 'FetchedTranscriptSnippet(text=' in result_str:
-                # Extract text parts using regex
-                text_matches = re.findall(r"text='(.*?)'", result_str)
-                return " ".join(text_matches)
-            
-            return result_str
-                
+        else:
+            result = transcript_api.fetch(video_id, languages=[language])
+        transcript = Transcript.from_snippets(result)
+        if cache and transcript.text:
+            cache.put(video_id, language, transcript)
+        return transcript
+
+    @staticmethod
+    def get_transcript_direct(url, language: str = DEFAULT_TRANSCRIPT_LANGUAGE):
+        """Transcript text, or an "Error: ..." string; an invalid URL still raises ValueError."""
+        YouTubeTranscriptFetcher.get_video_id(url)
+        try:
+            return YouTubeTranscriptFetcher.get_transcript(url, language).text
         except Exception as e:
             return f"Error: {e}"
-            
+
+
+def _video_id_or_none(value) -> Optional[str]:
+    value = str(value or "").strip()
+    if _BARE_VIDEO_ID.match(value):
+        return value
+    if "youtu" in value:
+        try:
+            return YouTubeTranscriptFetcher.get_video_id(value)
+        except ValueError:
+            return None
+    return None
+
+
+def parse_playlist_export(data: bytes) -> List[str]:
+    """
+    Watch URLs for the videos in a playlist export, in playlist order without repeats.
+    Accepts yt-dlp JSON (`--flat-playlist -J`), a JSON list of URLs/IDs/objects,
+    a Google Takeout playlist CSV, or plain text with one URL per line.
+    """
+    text = data.decode("utf-8-sig", "replace")
+    try:
+        parsed = json.loads(text)
+    except ValueError:
+        parsed = None
+
+    if parsed is not None:
+        entries = parsed.get("entries", []) if isinstance(parsed, dict) else parsed
+        values = [
+            (e.get("url") or e.get("webpage_url") or e.get("id")) if isinstance(e, dict) else e
+            for e in entries or []
+        ]
+    else:
+        values = [cell for row in csv.reader(text.splitlines()) for cell in row]
+
+    urls, seen = [], set()
+    for value in values:
+        video_id = _video_id_or_none(value)
+        if video_id and video_id not in seen:
+            seen.add(video_id)
+            urls.append(f"https://www.youtube.com/watch?v={video_id}")
+    return urls
+
+
+class TranscriptSearchResult(BaseModel):
+    """Transcripts found for a search, plus per-video outcome and timing."""
+    text: str
+    metadata: dict = {}
+
 
 class YouTubeTranscriptManager:
     """Coordinates search and transcript fetching, outputs plain text only."""
 
-    def __init__(self, max_results: int = 5):
+    def __init__(
+        self,
+        max_results: int = 5,
+        max_workers: int = Config.YOUTUBE_MAX_WORKERS,
+        video_timeout: float = Config.YOUTUBE_VIDEO_TIMEOUT
+    ):
         self.searcher = YouTubeSearch(max_results=max_results)
         self.fetcher = YouTubeTranscriptFetcher()
+        self.max_workers = max_workers
+        self.video_timeout = video_timeout
 
-    def get_transcripts_from_search(self, query: str) -> str:
-        results = self.searcher.search(query)
-        transcripts = []
+    def fetch_each(
+        self, videos: List[dict], on_event: Optional[Callable[[dict], None]] = None
+    ) -> Tuple[List[Optional[Transcript]], List[dict]]:
+        """
+        Fetch the transcript of each {"url": ...} video on a bounded thread pool. Returns
+        the transcripts in input order (None where a video failed or timed out) and one
+        outcome per video: its input fields plus ok, seconds and chars or error.
+
+        A video times out video_timeout after its fetch starts, and the whole call ends
+        after ceil(videos / max_workers) * video_timeout even if hung fetches hold every
+        worker; videos that never started are reported as timed out. on_event, if given,
+        receives {"event": "started"} as a fetch begins (from a worker thread) and
+        {"event": "completed"} or {"event": "failed"} with the outcome as each one ends.
+        """
+        start = time.monotonic()
+        workers = max(1, self.max_workers)
+        deadline = start + math.ceil(len(videos) / workers) * self.video_timeout
+        emit = on_event or (lambda event: None)
+        lock = threading.Lock()
+        started: Dict[int, float] = {}
+        finished = set()
+        transcripts: List[Optional[Transcript]] = [None] * len(videos)
+        outcomes = [dict(video) for video in videos]
+
+        def fetch(index: int) -> Transcript:
+            with lock:
+                if index in finished:  # timed out while queued
+                    raise RuntimeError("timeout")
+                started[index] = time.monotonic()
+                emit({"event": "started", "index": index, "url": videos[index]["url"]})
+            transcript = self.fetcher.get_transcript(videos[index]["url"])
+            if not transcript.text:
+                raise RuntimeError("empty transcript")
+            return transcript
 
-        for r in results:
-            text = self.fetcher.get_transcript_direct(r["href"])
-            if text:
-                transcripts.append(text)
+        def finish(index: int, now: float, **outcome):
+            with lock:
+                finished.add(index)
+                outcomes[index].update(outcome, seconds=round(now - started.get(index, now), 3))
+                emit({"event": "completed" if outcome["ok"] else "failed", "index": index, **outcomes[index]})
 
+        pool = ThreadPoolExecutor(max_workers=workers)
+        try:
+            pending = {pool.submit(fetch, i): i for i in range(len(videos))}
+            while pending:
+                # Wake up for the next completion, the earliest per-video deadline or the overall one.
+                deadlines = [started[i] + self.video_timeout for i in pending.values() if i in started]
+                timeout = max(min(deadlines + [deadline]) - time.monotonic(), 0)
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+                now = time.monotonic()
+                for future in done:
+                    i = pending.pop(future)
+                    try:
+                        transcripts[i] = future.result()
+                        finish(i, now, ok=True, chars=len(transcripts[i].text))
+                    except Exception as e:
+                        finish(i, now, ok=False, error=str(e) or type(e).__name__)
+                for future, i in list(pending.items()):
+                    if now >= deadline or (i in started and now - started[i] >= self.video_timeout):
+                        del pending[future]
+                        finish(i, now, ok=False, error="timeout")
+        finally:
+            # A timed-out fetch cannot be interrupted; it finishes in the background.
+            pool.shutdown(wait=False, cancel_futures=True)
+        return transcripts, outcomes
+
+    def fetch_transcripts(self, videos: List[dict]) -> TranscriptSearchResult:
+        """
+        Fetch transcripts for search hits concurrently (see fetch_each). Failed and
+        timed-out videos are reported in the metadata and left out; the rest are
+        joined in the original rank order.
+        """
+        start = time.monotonic()
+        transcripts, outcomes = self.fetch_each([
+            {"rank": v.get("rank", i + 1), "title": v.get("title", ""), "url": v["href"]}
+            for i, v in enumerate(videos)
+        ])
+        return TranscriptSearchResult(
+            text="\n\n".join(t.text for t in transcripts if t),
+            metadata={
+                "videos": outcomes,
+                "succeeded": sum(1 for o in outcomes if o.get("ok")),
+                "failed": sum(1 for o in outcomes if not o.get("ok")),
+                "elapsed": round(time.monotonic() - start, 3),
+            }
+        )
+
+    def search_transcripts(self, query: str) -> TranscriptSearchResult:
+        """Search YouTube and fetch the hits' transcripts concurrently."""
+        return self.fetch_transcripts(self.searcher.search(query))
+
+    def get_transcripts_from_search(self, query: str) -> str:
         # Pure transcript text only, joined with spacing
-        return "\n\n".join(transcripts)
+        return self.search_transcripts(query).text
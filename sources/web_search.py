@@ -1,108 +1,361 @@
 # sources/web_search.py
+import asyncio
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Optional, List
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
 from ddgs import DDGS
-import requests
-from bs4 import BeautifulSoup
+import httpx
 import re
 import time
-from urllib.parse import urlparse
+from pydantic import BaseModel
+from urllib.parse import urljoin, urlparse
+
+from config import Config
+from .html_extractor import clean_text, extract_main_content, find_canonical_url
+from .http_cache import HTTPCache, get_http_cache
+from .http_client import aclose_async_client, get_client, get_async_client
+from .pdf_loader import PDFManager
+from .search_cache import SearchCache, get_search_cache
+from .url_dedup import canonicalize_url, content_fingerprint, dedupe_results, is_near_duplicate
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+HTML_TYPES = ("application/xhtml+xml", "application/xml")
+PDF_TYPES = ("application/pdf", "application/x-pdf")
+_WORD = re.compile(r"\w+")
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+")
+
+class WebPage(BaseModel):
+    """One fetched search result."""
+    rank: int
+    url: str
+    title: str = ""
+    text: str = ""
+    fetch_seconds: float = 0.0
+    error: Optional[str] = None
+    canonical_url: Optional[str] = None  # from <link rel="canonical">
+    duplicates: List[str] = []  # later-ranked URLs collapsed into this page
+
 
 @dataclass
 class WebSearchConfig:
     max_results: int = 5          # fewer is safer for demo
     max_snippet_length: int = 600
 
+
+class HostRateLimiter:
+    """Spaces out request starts to the same host by at least min_interval seconds."""
+
+    def __init__(self, min_interval: float = 1.0):
+        self.min_interval = min_interval
+        self._next_slot: Dict[str, float] = {}
+        self._lock = asyncio.Lock()
+
+    async def wait(self, host: str):
+        async with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class ContentBudget:
+    """
+    Tracks how much unique, query-relevant text the fetched pages have supplied.
+    A page counts only if it mentions a query term; only sentences not already
+    seen on another page count toward the budget.
+    """
+
+    def __init__(self, char_budget: int, query: str = ""):
+        self.char_budget = char_budget
+        self.terms = {t for t in _WORD.findall(query.lower()) if len(t) > 2}
+        self.collected = 0
+        self._seen = set()
+
+    def add(self, page: "WebPage") -> bool:
+        """Count a page; True once the budget is met."""
+        text = page.text.lower()
+        if page.error or not text or (self.terms and not any(t in text for t in self.terms)):
+            return self.satisfied
+        for sentence in _SENTENCE_BREAK.split(text):
+            key = " ".join(sentence.split())
+            if key and key not in self._seen:
+                self._seen.add(key)
+                self.collected += len(key)
+        return self.satisfied
+
+    @property
+    def satisfied(self) -> bool:
+        return self.collected >= self.char_budget
+
+
 class WebSearchManager:
-    def __init__(self, max_results: int = 10, max_snippet_length: int = 600):
+    def __init__(
+        self,
+        max_results: int = 10,
+        max_snippet_length: int = 600,
+        max_concurrency: int = 8,
+        per_host_delay: float = 1.0,
+        timeout: Optional[float] = None,
+        cache: Optional[HTTPCache] = None,
+        search_cache: Optional[SearchCache] = None,
+        max_page_bytes: int = Config.WEB_MAX_PAGE_BYTES,
+        max_pdf_bytes: int = Config.WEB_MAX_PDF_BYTES,
+        search_endpoint: Optional[str] = None
+    ):
         self.max_results = max_results
         self.max_snippet_length = max_snippet_length
+        self.max_concurrency = max_concurrency
+        self.per_host_delay = per_host_delay
+        self.timeout = timeout  # None: the shared client's default
+        self._cache = cache
+        self._search_cache = search_cache
+        self.max_page_bytes = max_page_bytes
+        self.max_pdf_bytes = max_pdf_bytes
+        # Empty: live DuckDuckGo. Set to a stand-in service for offline runs and benchmarks.
+        self.search_endpoint = search_endpoint if search_endpoint is not None else Config.WEB_SEARCH_ENDPOINT
+
+    # The shared caches are opened on first use, not when the manager is built,
+    # so importing or constructing services never touches the disk.
+    @property
+    def cache(self) -> Optional[HTTPCache]:
+        return self._cache if self._cache is not None else get_http_cache()
+
+    @property
+    def search_cache(self) -> Optional[SearchCache]:
+        return self._search_cache if self._search_cache is not None else get_search_cache()
 
     def extract_page_content(self, url: str) -> str:
         """Extract main content from a webpage"""
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            response = requests.get(url, headers=headers, timeout=15)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove unwanted elements
-            for element in soup(['script', 'style', 'nav', 'footer', 'header', 'aside', 'form']):
-                element.decompose()
-            
-            # Try to extract main content
-            content_selectors = [
-                'article',
-                'main',
-                '.content',
-                '.main-content',
-                '#content',
-                '.post-content',
-                '.entry-content',
-                '.article-content',
-                '.story-content',
-                '.text-content',
-                '#main-content',
-                '.body-content'
-            ]
-            
-            content = None
-            for selector in content_selectors:
-                content_elem = soup.select_one(selector)
-                if content_elem:
-                    content = content_elem.get_text()
-                    break
-            
-            if not content:
-                # Fallback: get all paragraphs
-                paragraphs = soup.find_all('p')
-                content = ' '.join([p.get_text() for p in paragraphs if len(p.get_text()) > 50])
-            
-            if not content or len(content.strip()) < 100:
-                content = soup.body.get_text() if soup.body else soup.get_text()
-            
-            # Clean up the text
-            content = re.sub(r'\s+', ' ', content)
-            content = re.sub(r'\[.*?\]', '', content)  # Remove citations
-            content = content.strip()
-            
-            return content[:10000] + '...' if len(content) > 10000 else content
-            
+            entry = self.cache.get(url) if self.cache else None
+            if entry and entry.is_fresh():
+                return entry.text
+            with get_client().stream(
+                "GET", url, headers=self._request_headers(entry), **self._timeout_kwargs()
+            ) as response:
+                if entry and response.status_code == 304:
+                    return self.cache.revalidated(entry, response).text
+                response.raise_for_status()
+                kind, cap = self._content_kind(response)
+                body = self._read_capped(response.iter_bytes(), kind, cap)
+            return self._parse_and_store(url, response, body, kind)
         except Exception as e:
             return f"Error extracting content: {str(e)}"
 
-    def run(self, query: str) -> str:
-        """Perform search and return formatted results with full content"""
-        results = []
+    async def _download_and_extract(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        semaphore: asyncio.Semaphore,
+        limiter: HostRateLimiter
+    ) -> Tuple[str, Optional[str]]:
+        """Extracted text and rel=canonical URL of one page; raises on failure."""
+        entry = await asyncio.to_thread(self.cache.get, url) if self.cache else None
+        if entry and entry.is_fresh():
+            return entry.text, self._canonical_url(url, entry.body)
+        await limiter.wait(urlparse(url).netloc)
+        async with semaphore:
+            async with client.stream(
+                "GET", url, headers=self._request_headers(entry), **self._timeout_kwargs()
+            ) as response:
+                if entry and response.status_code == 304:
+                    entry = await asyncio.to_thread(self.cache.revalidated, entry, response)
+                    return entry.text, self._canonical_url(url, entry.body)
+                response.raise_for_status()
+                kind, cap = self._content_kind(response)
+                body = await self._aread_capped(response.aiter_bytes(), kind, cap)
+        # Parsing is CPU-bound; keep the loop free for the other downloads.
+        text = await asyncio.to_thread(self._parse_and_store, url, response, body, kind)
+        return text, self._canonical_url(url, body) if kind == "html" else None
+
+    async def _fetch_page(
+        self,
+        client: httpx.AsyncClient,
+        rank: int,
+        result: dict,
+        semaphore: asyncio.Semaphore,
+        limiter: HostRateLimiter
+    ) -> WebPage:
+        url = result.get("href", "")
+        start = time.monotonic()
+        text, canonical_url, error = "", None, None
         try:
-            with DDGS() as ddgs:
-                search_results = list(ddgs.text(query, max_results=self.max_results))
-                
-                for i, r in enumerate(search_results):
-                    if i >= self.max_results:
-                        break
-                    
-                    # Extract full page content instead of just using snippet
-                    full_content = self.extract_page_content(r.get("href", ""))
-                    time.sleep(1)  # Respectful delay between requests
-                    
-                    results.append({
-                        "rank": i + 1,
-                        "title": r.get("title", ""),
-                        "href": r.get("href", ""),
-                        "body": full_content  # Using full extracted content
-                    })
-                    
+            text, canonical_url = await self._download_and_extract(client, url, semaphore, limiter)
         except Exception as e:
-            # Return error message in the same format
-            return f"Search query: {query}\nError: {str(e)}\nFetched at (UTC): {datetime.utcnow().isoformat()}"
-        
-        # Format the output exactly as before but with full content
+            error = str(e)
+        return WebPage(
+            rank=rank,
+            url=url,
+            title=result.get("title", ""),
+            text=text,
+            fetch_seconds=round(time.monotonic() - start, 3),
+            error=error,
+            canonical_url=canonical_url
+        )
+
+    async def fetch_pages(
+        self,
+        search_results: List[dict],
+        query: str = "",
+        char_budget: Optional[int] = None
+    ) -> List[WebPage]:
+        """
+        Fetch DDGS results concurrently into per-page records, in rank order.
+        With a char_budget, pages are counted in rank order as they arrive (see ContentBudget):
+        a page that finishes early waits for every higher-ranked one, so a slow top result
+        is never crowded out. Fetches still outstanding once the budget is met are
+        cancelled and left out of the result.
+        """
+        # The same article under tracking params, AMP or mobile URLs is only fetched once.
+        search_results = dedupe_results(search_results)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        limiter = HostRateLimiter(self.per_host_delay)
+        client = get_async_client()
+        tasks = [
+            asyncio.create_task(self._fetch_page(client, i + 1, r, semaphore, limiter))
+            for i, r in enumerate(search_results)
+        ]
+        if char_budget is None:
+            return self.collapse_duplicates(await asyncio.gather(*tasks))
+
+        budget = ContentBudget(char_budget, query)
+        try:
+            for task in tasks:
+                if budget.add(await task):
+                    break
+        finally:
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        return self.collapse_duplicates([task.result() for task in tasks if not task.cancelled()])
+
+    @staticmethod
+    def collapse_duplicates(pages: List[WebPage]) -> List[WebPage]:
+        """
+        Fold later-ranked copies into the first page of each article: same canonical URL
+        (including rel=canonical) or near-identical text, e.g. a syndication mirror.
+        """
+        kept: List[WebPage] = []
+        by_key: Dict[str, WebPage] = {}
+        fingerprints = []
+        for page in pages:
+            keys = {canonicalize_url(u) for u in (page.url, page.canonical_url) if u}
+            original = next((by_key[k] for k in keys if k in by_key), None)
+            fingerprint = content_fingerprint(page.text) if not page.error else frozenset()
+            if original is None:
+                original = next((p for p, fp in fingerprints if is_near_duplicate(fp, fingerprint)), None)
+            if original is not None:
+                original.duplicates.append(page.url)
+                continue
+            kept.append(page)
+            by_key.update(dict.fromkeys(keys, page))
+            if fingerprint:
+                fingerprints.append((page, fingerprint))
+        return kept
+
+    def _content_kind(self, response: httpx.Response) -> Tuple[str, int]:
+        """
+        Decide from the headers, before any body is read, whether this is a page ("html")
+        or a PDF ("pdf") and how many bytes of it to accept; anything else is rejected.
+        """
+        content_type = response.headers.get("Content-Type", "text/html").split(";")[0].strip().lower()
+        if content_type in PDF_TYPES:
+            kind, cap = "pdf", self.max_pdf_bytes
+        elif content_type.startswith("text/") or content_type in HTML_TYPES:
+            kind, cap = "html", self.max_page_bytes
+        else:
+            raise ValueError(f"Unsupported content type: {content_type}")
+        declared = response.headers.get("Content-Length", "")
+        if kind == "pdf" and declared.isdigit() and int(declared) > cap:
+            raise ValueError(f"PDF too large: {declared} bytes (limit {cap})")
+        return kind, cap
+
+    @staticmethod
+    def _append_capped(body: bytearray, chunk: bytes, kind: str, cap: int) -> bool:
+        """
+        Add a chunk; False once the cap is exceeded. A page is cut at the cap (its first
+        bytes hold far more text than we keep), a truncated PDF is useless so it fails.
+        """
+        body += chunk
+        if len(body) <= cap:
+            return True
+        if kind == "pdf":
+            raise ValueError(f"PDF exceeded {cap} bytes")
+        del body[cap:]
+        return False
+
+    def _read_capped(self, chunks: Iterator[bytes], kind: str, cap: int) -> bytes:
+        body = bytearray()
+        for chunk in chunks:
+            if not self._append_capped(body, chunk, kind, cap):
+                break
+        return bytes(body)
+
+    async def _aread_capped(self, chunks: AsyncIterator[bytes], kind: str, cap: int) -> bytes:
+        body = bytearray()
+        async for chunk in chunks:
+            if not self._append_capped(body, chunk, kind, cap):
+                break
+        return bytes(body)
+
+    def _parse_and_store(self, url: str, response: httpx.Response, body: bytes, kind: str) -> str:
+        if kind == "pdf":
+            content = clean_text(PDFManager().extract_bytes_sync(body).text)
+        else:
+            content = extract_main_content(body)
+        if self.cache:
+            self.cache.store(url, response, content, body)
+        return content
+
+    @staticmethod
+    def _canonical_url(url: str, body: bytes) -> Optional[str]:
+        canonical = find_canonical_url(body) if body else None
+        return urljoin(url, canonical) if canonical else None
+
+    @staticmethod
+    def _request_headers(entry) -> dict:
+        """Browser headers, plus validators for a conditional GET when a stale copy is cached."""
+        return {**HEADERS, **entry.validators()} if entry else HEADERS
+
+    def _timeout_kwargs(self) -> dict:
+        return {"timeout": self.timeout} if self.timeout is not None else {}
+
+    def search(self, query: str) -> List[dict]:
+        fetch = self._endpoint_search if self.search_endpoint else self._ddgs_search
+        if not self.search_cache:
+            return fetch(query)
+        namespace = f"web@{self.search_endpoint}" if self.search_endpoint else "web"
+        key = SearchCache.make_key(namespace, query, self.max_results)
+        return self.search_cache.get_or_fetch(key, lambda: fetch(query))
+
+    def _endpoint_search(self, query: str) -> List[dict]:
+        """Query a DDGS-compatible JSON endpoint, e.g. benchmarks/fixture_server.py."""
+        response = get_client().get(
+            self.search_endpoint,
+            params={"q": query, "max_results": self.max_results},
+            **self._timeout_kwargs()
+        )
+        response.raise_for_status()
+        return response.json()[:self.max_results]
+
+    def _ddgs_search(self, query: str) -> List[dict]:
+        with DDGS() as ddgs:
+            return list(ddgs.text(query, max_results=self.max_results))[:self.max_results]
+
+    async def asearch_pages(self, query: str, char_budget: Optional[int] = None) -> List[WebPage]:
+        """
+        Search and return one record per result page, with its full extracted text.
+        Pass char_budget to stop fetching once enough relevant text has arrived.
+        """
+        search_results = await asyncio.to_thread(self.search, query)
+        return await self.fetch_pages(search_results, query, char_budget)
+
+    def format_results(self, query: str, pages: List[WebPage]) -> str:
+        """Human-readable listing of the pages, each cut to max_snippet_length."""
         lines = [
             f"Search query: {query}",
             f"Fetched at (UTC): {datetime.utcnow().isoformat()}",
@@ -110,17 +363,35 @@ class WebSearchManager:
             "Top search results:",
             ""
         ]
-        
-        for r in results:
-            # Use the full content but truncate for display if needed
-            content = r["body"]
+
+        for page in pages:
+            content = page.text if not page.error else f"Error extracting content: {page.error}"
             if len(content) > self.max_snippet_length:
                 display_content = content[:self.max_snippet_length] + "..."
             else:
                 display_content = content
-            
-            lines.append(f"{r['rank']}. {r['title']} ({r['href']})")
+
+            lines.append(f"{page.rank}. {page.title} ({page.url})")
             lines.append(f"Content: {display_content}")
             lines.append("")
-        
+
         return "\n".join(lines)
+
+    async def arun(self, query: str) -> str:
+        """Perform search and return formatted results with full content, fetching pages concurrently"""
+        try:
+            pages = await self.asearch_pages(query)
+        except Exception as e:
+            # Return error message in the same format
+            return f"Search query: {query}\nError: {str(e)}\nFetched at (UTC): {datetime.utcnow().isoformat()}"
+        return self.format_results(query, pages)
+
+    def run(self, query: str) -> str:
+        """Blocking wrapper around arun() for scripts; async callers should await arun()."""
+        async def run_and_close():
+            try:
+                return await self.arun(query)
+            finally:
+                await aclose_async_client()  # the loop ends with asyncio.run, so its client must too
+
+        return asyncio.run(run_and_close())
@@ -1,95 +1,445 @@
 # summarizer/llm_summarizer.py
-from typing import Dict, Any, List
-from openai import OpenAI
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
+from openai import AsyncOpenAI, OpenAI
 import os
 import math
+import time
 
+from config import Config
 from document_system import document_system
 from sources.retriever import VectorRetriever
+from summarizer.llm_cache import LLMCache, get_llm_cache
+
+SYSTEM_PROMPT = "You are a helpful writing assistant that produces detailed, structured, long-form documents."
+PAGES_PER_CALL = 8  # safe upper bound for one call (~4k words)
+MAX_TOKENS_PER_CALL = 16000  # enough for ~5k words
+OUTLINE_MAX_TOKENS = 1500
+SECTION_TOPIC_CHARS = 300  # how much of the query steers each heading's retrieval
+SECTION_RETRY_DELAY = 1.0
 
 
 class LLMSummarizer:
     def __init__(self, model_name="gpt-4o-mini"):
         # Use OpenAI client (needs OPENAI_API_KEY in environment or passed directly)
         self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        # The API services await this one, so a long generation never blocks the event loop
+        self.async_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
         self.model_name = model_name
 
-    def summarize_with_structure(
-        self, retriever: VectorRetriever, query: str, doc_type: str, pages: int = 2
-    ) -> Dict[str, Any]:
-        """
-        Retrieve chunks from retriever, build prompts, and call GPT-4o-mini.
-        Optimized for producing long outputs (multi-page, multi-thousand word).
-        """
-
+    @staticmethod
+    def _headings(doc_type: str) -> List[str]:
         # Get the document type template
         dt = document_system.get_document_type(doc_type)
-        headings = dt.structure if dt else []
+        return dt.structure if dt else []
+
+    def _material(self, retriever: VectorRetriever, query: str, doc_type: str) -> Tuple[List[str], List[str]]:
+        """Headings of the document type and the retrieved chunks to write from."""
+        headings = self._headings(doc_type)
 
         # Collect top chunks from retriever
-        chunks = retriever.get_top_chunks_for_model(query, max_tokens=6000)
+        chunks = retriever.get_top_chunks_for_model(query, max_tokens=Config.RETRIEVAL_MAX_TOKENS)
+        return headings, chunks
 
-        # Word target (approx 500 words per page)
-        target_words_total = pages * 500
+    @staticmethod
+    def _citation_note(chunks: List[str]) -> str:
+        # Video chunks carry "[t=Ns]" offsets the writer can cite
+        if any(chunk.startswith("[t=") for chunk in chunks):
+            return "Passages marked [t=Ns] come from a video at that offset; cite them inline as (t=Ns).\n"
+        return ""
 
-        # Decide iterations
-        pages_per_call = 8  # safe upper bound for one call (~4k words)
-        iterations = math.ceil(pages / pages_per_call)
-        words_per_iter = pages_per_call * 500
+    def _outline_prompt(self, doc_type: str, headings: List[str], chunks: List[str], pages: int, parts: int) -> str:
+        return (
+            f"Plan a '{doc_type}' document of about {pages} pages with the following sections:\n"
+            + "\n".join(f"- {h}" for h in headings)
+            + "\n\n"
+            f"It will be written as {parts} consecutive parts of about {PAGES_PER_CALL} pages each, "
+            f"by writers working at the same time who only see this outline. "
+            f"For each part write a line 'Part N:' followed by short bullet points naming the sections "
+            f"and key points it must cover, so that the parts do not overlap and together cover everything. "
+            f"Only Part 1 has the introduction and only Part {parts} has the conclusion. "
+            f"Reply with the outline only.\n\n"
+            f"Material:\n" + "\n\n".join(chunks)
+        )
 
-        all_outputs: List[str] = []
+    def _part_prompts(
+        self, doc_type: str, headings: List[str], chunks: List[str], pages: int, outline: Optional[str] = None
+    ) -> List[str]:
+        """
+        One prompt per generation call. With an outline every part is written
+        independently against it; without one each part continues the last.
+        """
+        iterations = math.ceil(pages / PAGES_PER_CALL)
+        words_per_iter = PAGES_PER_CALL * 500
+        citation_note = self._citation_note(chunks)
+
+        prompts: List[str] = []
         for i in range(iterations):
             # Distribute chunks across iterations
             chunk_text = "\n\n".join(chunks[i::iterations]) if chunks else ""
 
-            continuation_note = (
-                f"This is Part {i+1} of {iterations}. Continue writing where the last part stopped. "
-                "Do NOT repeat introductions or conclusions until the final part.\n\n"
-                if i > 0 else ""
-            )
+            if outline:
+                part_note = (
+                    f"The whole document follows this outline:\n{outline}\n\n"
+                    f"Write ONLY Part {i+1} of {iterations}, covering exactly what the outline assigns to it. "
+                    + ("Start with the introduction. " if i == 0 else "Do NOT write an introduction; start directly with this part's content. ")
+                    + ("End with the conclusion.\n\n" if i == iterations - 1 else "Do NOT write a conclusion.\n\n")
+                )
+            else:
+                part_note = (
+                    f"This is Part {i+1} of {iterations}. Continue writing where the last part stopped. "
+                    "Do NOT repeat introductions or conclusions until the final part.\n\n"
+                    if i > 0 else ""
+                )
 
             # Build prompt
-            prompt = (
+            prompts.append(
                 f"Write a '{doc_type}' document with the following sections:\n"
                 + "\n".join(f"- {h}" for h in headings)
                 + "\n\n"
-                f"{continuation_note}"
+                f"{part_note}"
                 f"Base your content on this material. Expand thoroughly with multiple paragraphs, "
                 f"examples, analysis, and detailed explanations.\n"
-                f"Write AT LEAST {words_per_iter} words (around {pages_per_call} pages). "
+                f"Write AT LEAST {words_per_iter} words (around {PAGES_PER_CALL} pages). "
                 f"Do not stop early. Do not summarize; fully elaborate.\n\n"
+                f"{citation_note}"
                 f"Material:\n{chunk_text}\n\n"
                 f"Ensure this part is cohesive and continues smoothly into the next one."
             )
+        return prompts
 
-            response = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[
-                    {"role": "system", "content": "You are a helpful writing assistant that produces detailed, structured, long-form documents."},
-                    {"role": "user", "content": prompt},
-                ],
-                max_tokens=16000,  # enough for ~5k words
-            )
-
-            part_text = response.choices[0].message.content.strip()
-            all_outputs.append(part_text)
+    def _section_material(self, retriever: VectorRetriever, query: str, headings: List[str]) -> List[List[str]]:
+        """For each heading, the chunks most relevant to that heading within its share of the window."""
+        topic = query[:SECTION_TOPIC_CHARS]
+        return [
+            retriever.get_top_chunks_for_model(f"{heading}: {topic}", max_tokens=Config.SECTION_RETRIEVAL_MAX_TOKENS)
+            for heading in headings
+        ]
 
-        combined_text = "\n\n".join(all_outputs)
+    def _section_request(
+        self, doc_type: str, headings: List[str], index: int, chunks: List[str], pages: int
+    ) -> Tuple[str, int]:
+        """Prompt and max_tokens for writing heading `index` on its own."""
+        heading = headings[index]
+        words = max(150, pages * 500 // len(headings))
+        prompt = (
+            f"You are writing one section of a '{doc_type}' document whose sections are:\n"
+            + "\n".join(f"- {h}" for h in headings)
+            + "\n\n"
+            f"Write ONLY the section '{heading}', starting with the line '## {heading}'. "
+            f"Other sections are written separately, so do not introduce or summarize the rest "
+            f"of the document unless that is this section's purpose.\n"
+            f"Base it on this material and expand with explanation, examples and analysis. "
+            f"Write about {words} words.\n\n"
+            f"{self._citation_note(chunks)}"
+            f"Material:\n" + "\n\n".join(chunks)
+        )
+        return prompt, min(MAX_TOKENS_PER_CALL, words * 2 + 256)
 
+    def _section_result(
+        self, doc_type: str, headings: List[str], pages: int, sections: List[str],
+        material: List[List[str]], attempts: List[int]
+    ) -> Dict[str, Any]:
         return {
             "document_type": doc_type,
             "headings": headings,
-            "content": combined_text,
+            "content": "\n\n".join(sections),
             "model": self.model_name,
             "metadata": {
                 "pages_requested": pages,
-                "iterations": iterations,
-                "pages_per_call": pages_per_call,
-                "target_words": target_words_total,
-                "max_tokens_per_call": 16000,
+                "mode": "sections",
+                "target_words": pages * 500,  # approx 500 words per page
+                "sections": [
+                    {"heading": h, "chunks": len(c), "attempts": a} for h, c, a in zip(headings, material, attempts)
+                ],
             },
         }
 
+    def _write_section(self, prompt: str, max_tokens: int, use_cache: bool = True) -> Tuple[str, int]:
+        """Write one section, retrying only this call on failure. Returns (text, attempts)."""
+        for attempt in range(1, Config.LLM_SECTION_RETRIES + 2):
+            try:
+                return self._complete(prompt, max_tokens, use_cache), attempt
+            except Exception as e:
+                if attempt > Config.LLM_SECTION_RETRIES:
+                    raise
+                print(f"Section generation failed (attempt {attempt}), retrying: {e}")
+                time.sleep(SECTION_RETRY_DELAY * attempt)
+
+    async def _awrite_section(self, prompt: str, max_tokens: int, use_cache: bool = True) -> Tuple[str, int]:
+        for attempt in range(1, Config.LLM_SECTION_RETRIES + 2):
+            try:
+                return await self._acomplete(prompt, max_tokens, use_cache), attempt
+            except Exception as e:
+                if attempt > Config.LLM_SECTION_RETRIES:
+                    raise
+                print(f"Section generation failed (attempt {attempt}), retrying: {e}")
+                await asyncio.sleep(SECTION_RETRY_DELAY * attempt)
+
+    def summarize_sections(
+        self, retriever: VectorRetriever, query: str, doc_type: str, pages: int = 2, use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Write every heading of the document type as its own concurrent call, each with
+        the chunks retrieved for that heading, and assemble them in template order.
+        """
+        headings = self._headings(doc_type)
+        material = self._section_material(retriever, query, headings)
+        requests = [self._section_request(doc_type, headings, i, c, pages) for i, c in enumerate(material)]
+        with ThreadPoolExecutor(max_workers=max(1, min(Config.LLM_MAX_PARALLEL_PARTS, len(requests)))) as pool:
+            written = list(pool.map(lambda r: self._write_section(*r, use_cache), requests))
+        return self._section_result(
+            doc_type, headings, pages, [text for text, _ in written], material, [n for _, n in written]
+        )
+
+    async def asummarize_sections(
+        self, retriever: VectorRetriever, query: str, doc_type: str, pages: int = 2, use_cache: bool = True
+    ) -> Dict[str, Any]:
+        headings = self._headings(doc_type)
+        material = await asyncio.to_thread(self._section_material, retriever, query, headings)
+        semaphore = asyncio.Semaphore(max(1, Config.LLM_MAX_PARALLEL_PARTS))
+
+        async def write(index: int, chunks: List[str]) -> Tuple[str, int]:
+            async with semaphore:
+                return await self._awrite_section(
+                    *self._section_request(doc_type, headings, index, chunks, pages), use_cache
+                )
+
+        written = await asyncio.gather(*(write(i, c) for i, c in enumerate(material)))
+        return self._section_result(
+            doc_type, headings, pages, [text for text, _ in written], material, [n for _, n in written]
+        )
+
+    @staticmethod
+    def _section_mode(doc_type: str) -> bool:
+        return Config.LLM_GENERATION_MODE == "sections" and bool(LLMSummarizer._headings(doc_type))
+
+    @staticmethod
+    def _parallel(pages: int) -> bool:
+        return Config.LLM_PARALLEL_PARTS and math.ceil(pages / PAGES_PER_CALL) > 1
+
+    def _request(self, prompt: str, max_tokens: int = MAX_TOKENS_PER_CALL) -> Dict[str, Any]:
+        return {
+            "model": self.model_name,
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+            "max_tokens": max_tokens,
+        }
+
+    @staticmethod
+    def _cache_key(request: Dict[str, Any], use_cache: bool) -> Tuple[Optional[LLMCache], Optional[str]]:
+        """(cache, key) for a request; cache is None when caching is off or bypassed."""
+        cache = get_llm_cache() if use_cache else None
+        return cache, LLMCache.make_key(request) if cache else None
+
+    def _complete(self, prompt: str, max_tokens: int = MAX_TOKENS_PER_CALL, use_cache: bool = True) -> str:
+        request = self._request(prompt, max_tokens)
+        cache, key = self._cache_key(request, use_cache)
+        text = cache.get(key) if cache else None
+        if text is None:
+            response = self.client.chat.completions.create(**request)
+            text = response.choices[0].message.content.strip()
+            if cache and text:
+                cache.put(key, text)
+        return text
+
+    async def _acomplete(self, prompt: str, max_tokens: int = MAX_TOKENS_PER_CALL, use_cache: bool = True) -> str:
+        request = self._request(prompt, max_tokens)
+        cache, key = self._cache_key(request, use_cache)
+        # SQLite reads and eviction stay off the event loop
+        text = await asyncio.to_thread(cache.get, key) if cache else None
+        if text is None:
+            response = await self.async_client.chat.completions.create(**request)
+            text = response.choices[0].message.content.strip()
+            if cache and text:
+                await asyncio.to_thread(cache.put, key, text)
+        return text
+
+    def _result(
+        self, doc_type: str, headings: List[str], pages: int, outputs: List[str], outline: Optional[str] = None
+    ) -> Dict[str, Any]:
+        metadata = {
+            "pages_requested": pages,
+            "iterations": len(outputs),
+            "pages_per_call": PAGES_PER_CALL,
+            "target_words": pages * 500,  # approx 500 words per page
+            "max_tokens_per_call": MAX_TOKENS_PER_CALL,
+            "parallel": outline is not None,
+        }
+        if outline is not None:
+            metadata["outline"] = outline
+        return {
+            "document_type": doc_type,
+            "headings": headings,
+            "content": "\n\n".join(outputs),
+            "model": self.model_name,
+            "metadata": metadata,
+        }
+
+    def summarize_with_structure(
+        self, retriever: VectorRetriever, query: str, doc_type: str, pages: int = 2, use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Retrieve chunks from retriever, build prompts, and call GPT-4o-mini.
+        Optimized for producing long outputs (multi-page, multi-thousand word).
+        Documents longer than one call are outlined first and their parts written
+        in parallel (see Config.LLM_PARALLEL_PARTS). With LLM_GENERATION_MODE=sections
+        each heading is written on its own instead (see summarize_sections).
+        Identical calls are answered from the completion cache unless use_cache is False.
+        """
+        if self._section_mode(doc_type):
+            return self.summarize_sections(retriever, query, doc_type, pages, use_cache)
+        headings, chunks = self._material(retriever, query, doc_type)
+        if not self._parallel(pages):
+            prompts = self._part_prompts(doc_type, headings, chunks, pages)
+            return self._result(doc_type, headings, pages, [self._complete(p, use_cache=use_cache) for p in prompts])
+
+        parts = math.ceil(pages / PAGES_PER_CALL)
+        outline = self._complete(
+            self._outline_prompt(doc_type, headings, chunks, pages, parts), OUTLINE_MAX_TOKENS, use_cache
+        )
+        prompts = self._part_prompts(doc_type, headings, chunks, pages, outline)
+        with ThreadPoolExecutor(max_workers=max(1, min(Config.LLM_MAX_PARALLEL_PARTS, parts))) as pool:
+            outputs = list(pool.map(lambda p: self._complete(p, use_cache=use_cache), prompts))  # map keeps part order
+        return self._result(doc_type, headings, pages, outputs, outline)
+
+    async def asummarize_with_structure(
+        self, retriever: VectorRetriever, query: str, doc_type: str, pages: int = 2, use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        summarize_with_structure for async callers: retrieval (CPU-bound query embedding)
+        runs on a worker thread and the LLM calls are awaited on AsyncOpenAI.
+        """
+        if self._section_mode(doc_type):
+            return await self.asummarize_sections(retriever, query, doc_type, pages, use_cache)
+        headings, chunks = await asyncio.to_thread(self._material, retriever, query, doc_type)
+        if not self._parallel(pages):
+            outputs = []
+            for prompt in self._part_prompts(doc_type, headings, chunks, pages):
+                outputs.append(await self._acomplete(prompt, use_cache=use_cache))
+            return self._result(doc_type, headings, pages, outputs)
+
+        parts = math.ceil(pages / PAGES_PER_CALL)
+        outline = await self._acomplete(
+            self._outline_prompt(doc_type, headings, chunks, pages, parts), OUTLINE_MAX_TOKENS, use_cache
+        )
+        semaphore = asyncio.Semaphore(max(1, Config.LLM_MAX_PARALLEL_PARTS))
+
+        async def write(prompt: str) -> str:
+            async with semaphore:
+                return await self._acomplete(prompt, use_cache=use_cache)
+
+        outputs = await asyncio.gather(*(write(p) for p in self._part_prompts(doc_type, headings, chunks, pages, outline)))
+        return self._result(doc_type, headings, pages, list(outputs), outline)
+
+    async def _astream_calls(
+        self, requests: List[Tuple[str, int]], limit: int, retries: int, attempts: List[int], use_cache: bool = True
+    ) -> AsyncIterator[Tuple[int, str]]:
+        """
+        Run the calls with stream=True, at most `limit` at a time, and yield (index, delta)
+        in call order: the earliest unfinished call streams live while later ones buffer.
+        A call is retried (up to `retries` times) only if it failed before sending anything.
+        A cached call arrives as one delta; a streamed one is cached once it completes.
+        """
+        queues = [asyncio.Queue() for _ in requests]
+        semaphore = asyncio.Semaphore(max(1, limit))
+
+        async def run(index: int, prompt: str, max_tokens: int):
+            async with semaphore:
+                try:
+                    request = self._request(prompt, max_tokens)
+                    cache, key = self._cache_key(request, use_cache)
+                    cached = await asyncio.to_thread(cache.get, key) if cache else None
+                    if cached is not None:
+                        await queues[index].put(cached)
+                    while cached is None:
+                        sent = []
+                        try:
+                            stream = await self.async_client.chat.completions.create(**request, stream=True)
+                            async for chunk in stream:
+                                delta = chunk.choices[0].delta.content if chunk.choices else None
+                                if delta:
+                                    sent.append(delta)
+                                    await queues[index].put(delta)
+                            text = "".join(sent).strip()
+                            if cache and text:
+                                await asyncio.to_thread(cache.put, key, text)
+                            break
+                        except Exception as e:
+                            if sent or attempts[index] > retries:
+                                raise
+                            print(f"Streaming generation failed (attempt {attempts[index]}), retrying: {e}")
+                            attempts[index] += 1
+                            await asyncio.sleep(SECTION_RETRY_DELAY * (attempts[index] - 1))
+                except Exception as e:
+                    await queues[index].put(e)
+                await queues[index].put(None)
+
+        tasks = [asyncio.create_task(run(i, prompt, max_tokens)) for i, (prompt, max_tokens) in enumerate(requests)]
+        try:
+            for index, queue in enumerate(queues):
+                while True:
+                    item = await queue.get()
+                    if item is None:
+                        break
+                    if isinstance(item, Exception):
+                        raise item
+                    yield index, item
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def astream_with_structure(
+        self, retriever: VectorRetriever, query: str, doc_type: str, pages: int = 2, use_cache: bool = True
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        asummarize_with_structure that yields {"event": "delta", "text": ...} as tokens
+        arrive, in document order, so clients see text within a second or two. Parallel
+        modes still run concurrently; parts after the one being streamed are buffered.
+        Yields {"event": "outline"} once an outline is ready, and finally
+        {"event": "summary", "summary": ...} with the same dict the non-streaming path returns.
+        """
+        outline = None
+        sections = self._section_mode(doc_type)
+        if sections:
+            headings = self._headings(doc_type)
+            material = await asyncio.to_thread(self._section_material, retriever, query, headings)
+            requests = [self._section_request(doc_type, headings, i, c, pages) for i, c in enumerate(material)]
+            limit, retries = Config.LLM_MAX_PARALLEL_PARTS, Config.LLM_SECTION_RETRIES
+        else:
+            headings, chunks = await asyncio.to_thread(self._material, retriever, query, doc_type)
+            limit, retries = 1, 0
+            if self._parallel(pages):
+                parts = math.ceil(pages / PAGES_PER_CALL)
+                outline = await self._acomplete(
+                    self._outline_prompt(doc_type, headings, chunks, pages, parts), OUTLINE_MAX_TOKENS, use_cache
+                )
+                yield {"event": "outline", "outline": outline}
+                limit = Config.LLM_MAX_PARALLEL_PARTS
+            requests = [(p, MAX_TOKENS_PER_CALL) for p in self._part_prompts(doc_type, headings, chunks, pages, outline)]
+
+        outputs = ["" for _ in requests]
+        attempts = [1 for _ in requests]
+        async for index, delta in self._astream_calls(requests, limit, retries, attempts, use_cache):
+            if not outputs[index]:
+                delta = delta.lstrip()
+                if not delta:
+                    continue
+                if index > 0:
+                    delta = "\n\n" + delta
+            outputs[index] += delta
+            yield {"event": "delta", "text": delta}
+
+        outputs = [output.strip() for output in outputs]
+        if sections:
+            summary = self._section_result(doc_type, headings, pages, outputs, material, attempts)
+        else:
+            summary = self._result(doc_type, headings, pages, outputs, outline)
+        yield {"event": "summary", "summary": summary}
+
 
 # For backward compatibility
 def summarize_with_structure(
@@ -2,6 +2,9 @@ import os
 import sys
 import pytest
 import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -22,7 +25,11 @@ os.environ["OPENAI_API_KEY"] = "test_api_key"
 @pytest.fixture(autouse=True)
 def mock_settings():
     """Mock the settings for testing."""
-    with patch('config.Config.REPORTS_DIR', str(TEST_REPORTS_DIR)):
+    with patch('config.Config.REPORTS_DIR', str(TEST_REPORTS_DIR)), \
+         patch('config.Config.HTTP_CACHE_ENABLED', False), \
+         patch('config.Config.SEARCH_CACHE_ENABLED', False), \
+         patch('config.Config.TRANSCRIPT_CACHE_ENABLED', False), \
+         patch('config.Config.LLM_CACHE_ENABLED', False):
         yield
 
 @pytest.fixture
@@ -59,6 +66,48 @@ async def async_client(test_app):
     async with TestClient(test_app) as client:
         yield client
 
+@pytest.fixture
+def local_http_server():
+    """
+    Serve canned responses on 127.0.0.1. Register routes with
+    server.routes[path] = {"body": b"...", "status": 200, "headers": {...}, "delay": 0.0};
+    every request is recorded in server.requests as (path, headers, monotonic start time).
+    """
+    routes = {}
+    requests_seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, so connection reuse is observable
+
+        def do_GET(self):
+            requests_seen.append((self.path, dict(self.headers), time.monotonic()))
+            route = routes.get(self.path)
+            if route is None:
+                self.send_error(404)
+                return
+            time.sleep(route.get("delay", 0))
+            body = route.get("body", b"")
+            self.send_response(route.get("status", 200))
+            headers = {"Content-Type": "text/html; charset=utf-8", "Content-Length": str(len(body))}
+            headers.update(route.get("headers", {}))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    server.routes = routes
+    server.requests = requests_seen
+    server.url = f"http://127.0.0.1:{server.server_port}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
 # Common test data
 TEST_DOC_TYPES = [
     "Research Paper Summary",
@@ -0,0 +1,42 @@
+"""
+Stand-ins for PyPDF2's reader, importable by extraction worker processes
+without loading the app.
+"""
+import threading
+import time
+
+# Held by another thread in tests; a forked worker would inherit it locked.
+READER_LOCK = threading.Lock()
+
+
+class FakePage:
+    def __init__(self, text: str, delay: float = 0):
+        self.text = text
+        self.delay = delay
+
+    def extract_text(self):
+        if self.delay:
+            time.sleep(self.delay)
+        if self.text is None:
+            raise ValueError("broken content stream")
+        return self.text
+
+
+class FakeReader:
+    pages = [
+        FakePage("Page one text"),
+        FakePage("Page two never finishes", delay=30),
+        FakePage(None),
+        FakePage("Page four text"),
+    ]
+
+    def __init__(self, stream):
+        pass
+
+
+class LockingReader:
+    pages = [FakePage(f"Page {i} text") for i in range(1, 6)]
+
+    def __init__(self, stream):
+        with READER_LOCK:
+            pass
@@ -0,0 +1,59 @@
+"""
+Tests for main-content extraction in sources.html_extractor.
+"""
+from unittest.mock import patch
+
+from sources import html_extractor
+from sources.html_extractor import extract_main_content, extract_main_content_soup
+
+PARAGRAPH = "Solar capacity grew quickly, driven by falling panel costs, new storage and policy support."
+
+PAGE = f"""
+<html><head><script>var tracking = 1;</script><style>p {{ color: red }}</style></head>
+<body>
+  <header><nav><a href="/">Home</a> <a href="/news">News</a></nav></header>
+  <div class="sidebar">
+    <p><a href="/a">{PARAGRAPH}</a></p><p><a href="/b">{PARAGRAPH}</a></p><p><a href="/c">{PARAGRAPH}</a></p>
+  </div>
+  <div class="story">
+    <h1>Solar report</h1>
+    {"".join(f"<p>{PARAGRAPH} Point {i}.</p>" for i in range(3))}
+  </div>
+  <footer>Copyright</footer>
+</body></html>
+""".encode()
+
+
+def test_densest_text_block_wins_over_link_lists():
+    text = extract_main_content(PAGE)
+
+    assert text.startswith("Solar report")
+    assert "Point 2." in text
+    assert "Home" not in text
+    assert "tracking" not in text
+    assert "Copyright" not in text
+
+
+def test_short_pages_fall_back_to_body_text():
+    text = extract_main_content(b"<html><body><h1>Tiny</h1><p>Short note.</p></body></html>")
+
+    assert text == "TinyShort note."
+
+
+def test_output_is_cleaned_and_capped():
+    paragraph = f"<p>{PARAGRAPH} [12]</p>" * 200
+    text = extract_main_content(f"<html><body><article>{paragraph}</article></body></html>".encode())
+
+    assert "[12]" not in text
+    assert "  " not in text
+    assert len(text) == html_extractor.MAX_CONTENT_CHARS + 3
+    assert text.endswith("...")
+
+
+def test_soup_cascade_is_used_without_lxml():
+    with patch("sources.html_extractor.LXML_AVAILABLE", False), \
+         patch("sources.html_extractor.extract_main_content_soup", wraps=extract_main_content_soup) as soup:
+        text = extract_main_content(b"<html><body><article>" + PARAGRAPH.encode() * 2 + b"</article></body></html>")
+
+    soup.assert_called_once()
+    assert text.startswith("Solar capacity grew quickly")
@@ -0,0 +1,68 @@
+"""
+Tests for the on-disk page cache used by WebSearchManager.
+"""
+import httpx
+import pytest
+from unittest.mock import patch
+
+from sources.http_cache import HTTPCache
+from sources.web_search import WebSearchManager
+
+ARTICLE = b"<html><body><article>" + b"Cached article text. " * 20 + b"</article></body></html>"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return HTTPCache(path=str(tmp_path / "pages.sqlite3"), default_ttl=60, ttl_overrides={})
+
+
+def test_fresh_hit_skips_download_and_parse(local_http_server, cache):
+    local_http_server.routes["/page"] = {"body": ARTICLE, "headers": {"Cache-Control": "max-age=300"}}
+    manager = WebSearchManager(cache=cache)
+    url = f"{local_http_server.url}/page"
+
+    first = manager.extract_page_content(url)
+    with patch("sources.web_search.extract_main_content") as mock_parse:
+        second = manager.extract_page_content(url)
+
+    assert second == first
+    assert first.startswith("Cached article text.")
+    assert len(local_http_server.requests) == 1
+    mock_parse.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_revalidated_with_conditional_get(local_http_server, cache):
+    local_http_server.routes["/page"] = {"body": ARTICLE, "headers": {"Cache-Control": "no-cache", "ETag": '"v1"'}}
+    manager = WebSearchManager(per_host_delay=0, cache=cache)
+    url = f"{local_http_server.url}/page"
+
+    results = [{"title": "Page", "href": url}]
+
+    [first] = await manager.fetch_pages(results)
+    local_http_server.routes["/page"] = {"status": 304, "headers": {"Cache-Control": "max-age=300", "ETag": '"v1"'}}
+    [second] = await manager.fetch_pages(results)
+    [third] = await manager.fetch_pages(results)
+
+    assert first.error is None
+    assert first.text.startswith("Cached article text.")
+    assert first.text == second.text == third.text
+    assert len(local_http_server.requests) == 2  # the third call was a fresh hit
+    assert local_http_server.requests[1][1]["If-None-Match"] == '"v1"'
+
+
+def test_ttl_rules(cache):
+    cache.ttl_overrides = {"wikipedia.org": 86400}
+
+    assert cache.ttl_for("https://en.wikipedia.org/wiki/X", httpx.Headers({"Cache-Control": "max-age=10"})) == 86400
+    assert cache.ttl_for("https://news.example/a", httpx.Headers({"Cache-Control": "public, max-age=120"})) == 120
+    assert cache.ttl_for("https://news.example/a", httpx.Headers({"Cache-Control": "no-store"})) is None
+    assert cache.ttl_for("https://news.example/a", httpx.Headers({})) == 60
+
+
+def test_errors_are_not_cached(local_http_server, cache):
+    manager = WebSearchManager(cache=cache)
+    url = f"{local_http_server.url}/missing"
+
+    assert manager.extract_page_content(url).startswith("Error extracting content")
+    assert cache.get(url) is None
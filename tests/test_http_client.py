@@ -0,0 +1,78 @@
+"""
+Tests for the shared pooled HTTP clients.
+"""
+import asyncio
+import pytest
+from unittest.mock import patch
+
+from sources import http_client
+
+
+@pytest.fixture(autouse=True)
+def reset_stats():
+    http_client.STATS.reset()
+    yield
+
+
+def test_sync_client_reuses_connections(local_http_server):
+    local_http_server.routes["/"] = {"body": b"ok"}
+
+    client = http_client.get_client()
+    for _ in range(5):
+        assert client.get(local_http_server.url + "/").text == "ok"
+
+    stats = http_client.connection_stats()
+    host = stats["hosts"]["127.0.0.1"]
+    assert host["requests"] == 5
+    assert host["new_connections"] == 1
+    assert host["reused"] == 4
+    assert client is http_client.get_client()
+
+
+@pytest.mark.asyncio
+async def test_async_client_caps_concurrent_requests_per_host(local_http_server):
+    active = 0
+    peak = 0
+    local_http_server.routes["/slow"] = {"body": b"ok", "delay": 0.2}
+
+    async def fetch(client):
+        nonlocal active, peak
+        async with client.stream("GET", local_http_server.url + "/slow") as response:
+            active += 1
+            peak = max(peak, active)
+            await response.aread()
+            await asyncio.sleep(0.05)
+            active -= 1
+
+    with patch("sources.http_client.Config.HTTP_MAX_CONNECTIONS_PER_HOST", 2):
+        client = http_client.get_async_client()
+        await asyncio.gather(*(fetch(client) for _ in range(6)))
+        await client.aclose()
+
+    assert peak == 2
+    assert http_client.connection_stats()["requests"] == 6
+
+
+@pytest.mark.asyncio
+async def test_async_client_reuses_host_slots_and_closes_with_its_loop(local_http_server):
+    local_http_server.routes["/"] = {"body": b"ok"}
+    client = http_client.get_async_client()
+
+    with patch("sources.http_client.asyncio.Semaphore", wraps=asyncio.Semaphore) as semaphore:
+        for _ in range(3):
+            assert (await client.get(local_http_server.url + "/")).text == "ok"
+    assert semaphore.call_count == 1
+
+    await http_client.aclose_async_client()
+    assert client.is_closed
+    assert http_client.get_async_client() is not client
+    await http_client.aclose_async_client()
+
+
+def test_app_shutdown_closes_the_shared_clients(test_app):
+    from fastapi.testclient import TestClient
+
+    with TestClient(test_app):
+        client = http_client.get_client()
+    assert client.is_closed
+    assert http_client.get_client() is not client
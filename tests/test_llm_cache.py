@@ -0,0 +1,176 @@
+"""
+Tests for the LLM completion cache.
+"""
+import random
+import string
+import threading
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from summarizer.llm_cache import LLMCache
+from summarizer.llm_summarizer import LLMSummarizer
+
+TEST_DOC_TYPE = "Blog Post"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LLMCache(path=str(tmp_path / "llm.sqlite3"), ttl=3600, max_bytes=1024 * 1024)
+
+
+@pytest.fixture
+def retriever():
+    retriever = MagicMock()
+    retriever.get_top_chunks_for_model.return_value = ["chunk one", "chunk two"]
+    return retriever
+
+
+def _completion(text):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+
+def _request(prompt="Summarize this", **params):
+    return {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": prompt}], "max_tokens": 100, **params}
+
+
+def test_key_covers_model_messages_and_parameters():
+    key = LLMCache.make_key(_request())
+
+    assert key == LLMCache.make_key(dict(reversed(list(_request().items()))))
+    assert key != LLMCache.make_key(_request("Summarize that"))
+    assert key != LLMCache.make_key(_request(max_tokens=200))
+    assert key != LLMCache.make_key(_request(temperature=0.2))
+    assert key != LLMCache.make_key({**_request(), "model": "gpt-4o"})
+
+
+def test_round_trip_and_hit_rate(cache):
+    key = LLMCache.make_key(_request())
+    assert cache.get(key) is None
+    cache.put(key, "A summary with ünïcode")
+
+    assert cache.get(key) == "A summary with ünïcode"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"], stats["entries"]) == (1, 1, 0.5, 1)
+
+
+def test_entries_expire_after_the_ttl(tmp_path):
+    cache = LLMCache(path=str(tmp_path / "llm.sqlite3"), ttl=60, max_bytes=1024 * 1024)
+    with patch("summarizer.llm_cache.time.time", return_value=1000.0):
+        cache.put("key", "old summary")
+    with patch("summarizer.llm_cache.time.time", return_value=1059.0):
+        assert cache.get("key") == "old summary"
+    with patch("summarizer.llm_cache.time.time", return_value=1061.0):
+        assert cache.get("key") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_read_entries_are_evicted(tmp_path):
+    def noise(seed):
+        rng = random.Random(seed)
+        return "".join(rng.choice(string.ascii_letters + string.digits) for _ in range(3000))
+
+    cache = LLMCache(path=str(tmp_path / "llm.sqlite3"), ttl=3600, max_bytes=6000)
+    cache.put("a", noise(1))
+    cache.put("b", noise(2))
+    cache.get("a")
+    cache.put("c", noise(3))
+
+    assert cache.stats()["bytes"] <= 6000
+    assert cache.get("b") is None
+    assert cache.get("a") == noise(1)
+    assert cache.get("c") == noise(3)
+
+
+def test_identical_summaries_call_the_model_once(cache, retriever):
+    summarizer = LLMSummarizer()
+    summarizer.client = MagicMock()
+    summarizer.client.chat.completions.create.return_value = _completion(" Summary ")
+
+    with patch("summarizer.llm_summarizer.get_llm_cache", return_value=cache):
+        first = summarizer.summarize_with_structure(retriever, "query", TEST_DOC_TYPE, pages=2)
+        second = summarizer.summarize_with_structure(retriever, "query", TEST_DOC_TYPE, pages=2)
+        retriever.get_top_chunks_for_model.return_value = ["different material"]
+        summarizer.summarize_with_structure(retriever, "query", TEST_DOC_TYPE, pages=2)
+
+    assert first == second
+    assert summarizer.client.chat.completions.create.call_count == 2
+
+
+def test_bypass_calls_the_model_without_reading_or_writing(cache, retriever):
+    summarizer = LLMSummarizer()
+    summarizer.client = MagicMock()
+    summarizer.client.chat.completions.create.return_value = _completion("Summary")
+
+    with patch("summarizer.llm_summarizer.get_llm_cache", return_value=cache):
+        summarizer.summarize_with_structure(retriever, "query", TEST_DOC_TYPE, pages=2, use_cache=False)
+        summarizer.summarize_with_structure(retriever, "query", TEST_DOC_TYPE, pages=2, use_cache=False)
+
+    assert summarizer.client.chat.completions.create.call_count == 2
+    assert cache.stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_streamed_completions_are_cached_and_replayed(cache, retriever):
+    summarizer = LLMSummarizer()
+    summarizer.async_client = MagicMock()
+
+    async def create(**request):
+        async def chunks():
+            for word in ("Streamed ", "summary."):
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=word))])
+        return chunks()
+    summarizer.async_client.chat.completions.create = MagicMock(side_effect=create)
+
+    async def run():
+        return [e async for e in summarizer.astream_with_structure(retriever, "query", TEST_DOC_TYPE, pages=2)]
+
+    with patch("summarizer.llm_summarizer.get_llm_cache", return_value=cache):
+        streamed = await run()
+        replayed = await run()
+
+    assert summarizer.async_client.chat.completions.create.call_count == 1
+    assert [e["text"] for e in replayed if e["event"] == "delta"] == ["Streamed summary."]
+    assert replayed[-1] == streamed[-1]
+    assert replayed[-1]["summary"]["content"] == "Streamed summary."
+
+
+@pytest.mark.asyncio
+async def test_async_paths_use_the_cache_off_the_event_loop(cache, retriever):
+    summarizer = LLMSummarizer()
+    summarizer.async_client = MagicMock()
+
+    async def create(**request):
+        return _completion("Summary")
+    summarizer.async_client.chat.completions.create = MagicMock(side_effect=create)
+
+    threads = []
+    for name in ("get", "put"):
+        method = getattr(cache, name)
+        def record(*args, _method=method):
+            threads.append(threading.get_ident())
+            return _method(*args)
+        setattr(cache, name, record)
+
+    with patch("summarizer.llm_summarizer.get_llm_cache", return_value=cache):
+        await summarizer.asummarize_with_structure(retriever, "query", TEST_DOC_TYPE, pages=2)
+        await summarizer.asummarize_with_structure(retriever, "query", TEST_DOC_TYPE, pages=2)
+
+    assert len(threads) == 3  # miss, put, hit
+    assert threading.get_ident() not in threads
+
+
+def test_web_endpoint_summarizes_and_honours_no_cache(test_app):
+    import api
+    from fastapi.testclient import TestClient
+
+    prepared = (MagicMock(), "query", {"query": "query", "raw_text": "text", "results": []})
+    with patch.object(api.web_service, "_prepare_web", return_value=prepared), \
+         patch.object(api.web_service, "summarize_and_save", return_value={"download_link": "/download/web.docx"}) as save:
+        client = TestClient(test_app)
+        cached = client.post("/summarize/web", data={"query": "query", "doc_type": TEST_DOC_TYPE})
+        bypassed = client.post("/summarize/web", data={"query": "query", "doc_type": TEST_DOC_TYPE, "no_cache": "true"})
+
+    assert cached.status_code == bypassed.status_code == 200
+    assert cached.json() == {"query": "query", "raw_text": "text", "results": [], "download_link": "/download/web.docx"}
+    assert [c.args[-1] for c in save.call_args_list] == [True, False]
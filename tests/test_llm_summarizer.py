@@ -0,0 +1,224 @@
+"""
+Tests for the structured LLM summarizer.
+"""
+import asyncio
+import time
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from config import Config
+from summarizer.llm_summarizer import LLMSummarizer, OUTLINE_MAX_TOKENS
+
+TEST_DOC_TYPE = "Blog Post"
+
+
+def _completion(text):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+
+@pytest.fixture
+def retriever():
+    retriever = MagicMock()
+    retriever.get_top_chunks_for_model.return_value = ["chunk one", "chunk two"]
+    return retriever
+
+
+@pytest.mark.asyncio
+async def test_async_path_matches_sync_path(retriever):
+    summarizer = LLMSummarizer()
+    summarizer.client = MagicMock()
+    summarizer.client.chat.completions.create.return_value = _completion(" Part ")
+    summarizer.async_client = MagicMock()
+
+    async def create(**request):
+        return _completion(" Part ")
+    summarizer.async_client.chat.completions.create = MagicMock(side_effect=create)
+
+    sync_result = summarizer.summarize_with_structure(retriever, "query", TEST_DOC_TYPE, pages=10)
+    async_result = await summarizer.asummarize_with_structure(retriever, "query", TEST_DOC_TYPE, pages=10)
+
+    assert async_result == sync_result
+    assert async_result["metadata"]["iterations"] == 2
+    assert async_result["content"] == "Part\n\nPart"
+
+    def prompts(mock):
+        return sorted(c.kwargs["messages"][1]["content"] for c in mock.call_args_list)
+    assert prompts(summarizer.async_client.chat.completions.create) == prompts(summarizer.client.chat.completions.create)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_summaries_do_not_block_each_other(retriever):
+    summarizer = LLMSummarizer()
+    summarizer.async_client = MagicMock()
+
+    async def slow_create(**request):
+        await asyncio.sleep(0.2)
+        return _completion("done")
+    summarizer.async_client.chat.completions.create = MagicMock(side_effect=slow_create)
+
+    start = time.monotonic()
+    results = await asyncio.gather(*(
+        summarizer.asummarize_with_structure(retriever, "query", TEST_DOC_TYPE, pages=2) for _ in range(20)
+    ))
+    elapsed = time.monotonic() - start
+
+    assert len(results) == 20
+    assert elapsed < 1.0  # twenty 200 ms calls overlap instead of taking 4 s
+
+
+def _slow_async_client(delay: float):
+    """Async client whose outline call returns a plan and whose part calls echo their part number."""
+    client = MagicMock()
+
+    async def create(**request):
+        await asyncio.sleep(delay)
+        prompt = request["messages"][1]["content"]
+        if prompt.startswith("Plan a"):
+            return _completion("Part 1:\n- intro\nPart 2:\n- body\nPart 3:\n- more\nPart 4:\n- conclusion")
+        part = prompt.split("Write ONLY Part ", 1)[1].split(" ", 1)[0]
+        return _completion(f"Text of part {part}")
+    client.chat.completions.create = MagicMock(side_effect=create)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_long_documents_are_outlined_then_written_in_parallel(retriever):
+    summarizer = LLMSummarizer()
+    summarizer.async_client = _slow_async_client(0.2)
+
+    with patch.object(Config, "LLM_MAX_PARALLEL_PARTS", 4):
+        start = time.monotonic()
+        result = await summarizer.asummarize_with_structure(retriever, "query", TEST_DOC_TYPE, pages=32)
+        elapsed = time.monotonic() - start
+
+    calls = summarizer.async_client.chat.completions.create.call_args_list
+    assert calls[0].kwargs["max_tokens"] == OUTLINE_MAX_TOKENS
+    assert all("Part 1:\n- intro" in c.kwargs["messages"][1]["content"] for c in calls[1:])
+    assert result["content"] == "\n\n".join(f"Text of part {i}" for i in range(1, 5))
+    assert result["metadata"]["parallel"] is True
+    assert result["metadata"]["outline"].startswith("Part 1:")
+    assert elapsed < 0.7  # outline + one part (0.4 s), not outline + four parts (1.0 s)
+
+
+@pytest.mark.asyncio
+async def test_parallel_parts_respect_the_concurrency_limit(retriever):
+    summarizer = LLMSummarizer()
+    summarizer.async_client = _slow_async_client(0.1)
+
+    with patch.object(Config, "LLM_MAX_PARALLEL_PARTS", 2):
+        start = time.monotonic()
+        result = await summarizer.asummarize_with_structure(retriever, "query", TEST_DOC_TYPE, pages=32)
+        elapsed = time.monotonic() - start
+
+    assert result["content"].endswith("Text of part 4")
+    assert elapsed >= 0.3  # outline, then two waves of two parts
+
+
+def test_parallel_mode_can_be_switched_off(retriever):
+    summarizer = LLMSummarizer()
+    summarizer.client = MagicMock()
+    summarizer.client.chat.completions.create.return_value = _completion("Part")
+
+    with patch.object(Config, "LLM_PARALLEL_PARTS", False):
+        result = summarizer.summarize_with_structure(retriever, "query", TEST_DOC_TYPE, pages=16)
+
+    prompts = [c.kwargs["messages"][1]["content"] for c in summarizer.client.chat.completions.create.call_args_list]
+    assert len(prompts) == 2
+    assert "Continue writing where the last part stopped" in prompts[1]
+    assert result["metadata"]["parallel"] is False
+
+
+@pytest.mark.asyncio
+async def test_sections_are_written_concurrently_in_template_order():
+    headings = ["Title", "Hook", "Body", "Conclusion", "Call-to-Action"]
+    retriever = MagicMock()
+    retriever.get_top_chunks_for_model.side_effect = lambda query, max_tokens: [f"chunk for {query.split(':')[0]}"]
+    summarizer = LLMSummarizer()
+    summarizer.async_client = MagicMock()
+
+    async def create(**request):
+        prompt = request["messages"][1]["content"]
+        heading = prompt.split("Write ONLY the section '", 1)[1].split("'", 1)[0]
+        assert f"chunk for {heading}" in prompt  # each section sees its own retrieval
+        await asyncio.sleep(0.05 * (len(headings) - headings.index(heading)))  # finish in reverse order
+        return _completion(f"## {heading}")
+    summarizer.async_client.chat.completions.create = MagicMock(side_effect=create)
+
+    with patch.object(Config, "LLM_GENERATION_MODE", "sections"), patch.object(Config, "LLM_MAX_PARALLEL_PARTS", 5):
+        start = time.monotonic()
+        result = await summarizer.asummarize_with_structure(retriever, "Solar power", TEST_DOC_TYPE, pages=2)
+        elapsed = time.monotonic() - start
+
+    assert result["content"] == "\n\n".join(f"## {h}" for h in headings)
+    assert [c.args[0] for c in retriever.get_top_chunks_for_model.call_args_list] == [
+        f"{h}: Solar power" for h in headings
+    ]
+    assert result["metadata"]["mode"] == "sections"
+    assert elapsed < 0.4  # the slowest section (250 ms), not the sum (750 ms)
+
+
+def test_a_failed_section_is_retried_on_its_own(retriever):
+    summarizer = LLMSummarizer()
+    summarizer.client = MagicMock()
+    failures = {"Body": 1}
+
+    def create(**request):
+        prompt = request["messages"][1]["content"]
+        heading = prompt.split("Write ONLY the section '", 1)[1].split("'", 1)[0]
+        if failures.get(heading):
+            failures[heading] -= 1
+            raise RuntimeError("rate limited")
+        return _completion(f"## {heading}")
+    summarizer.client.chat.completions.create.side_effect = create
+
+    with patch.object(Config, "LLM_GENERATION_MODE", "sections"), \
+         patch("summarizer.llm_summarizer.SECTION_RETRY_DELAY", 0):
+        result = summarizer.summarize_with_structure(retriever, "query", TEST_DOC_TYPE, pages=2)
+
+    assert summarizer.client.chat.completions.create.call_count == 6  # five sections + one retry
+    attempts = {s["heading"]: s["attempts"] for s in result["metadata"]["sections"]}
+    assert attempts == {"Title": 1, "Hook": 1, "Body": 2, "Conclusion": 1, "Call-to-Action": 1}
+    assert "## Body" in result["content"]
+
+
+def _streaming_client(part_delay):
+    """Async client whose stream=True calls yield one word at a time; part_delay(part) sets the pace."""
+    client = MagicMock()
+
+    async def create(stream=False, **request):
+        prompt = request["messages"][1]["content"]
+        if prompt.startswith("Plan a"):
+            return _completion("Part 1:\n- a\nPart 2:\n- b\nPart 3:\n- c")
+        part = int(prompt.split("Write ONLY Part ", 1)[1].split(" ", 1)[0])
+
+        async def deltas():
+            for word in (f"Part {part} ", "says ", "hello."):
+                await asyncio.sleep(part_delay(part))
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=word))])
+        return deltas()
+    client.chat.completions.create = MagicMock(side_effect=create)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_streamed_deltas_arrive_early_and_in_document_order(retriever):
+    summarizer = LLMSummarizer()
+    # Part 1 is the slowest, so later parts finish first and must be held back.
+    summarizer.async_client = _streaming_client(lambda part: 0.1 if part == 1 else 0.01)
+
+    start = time.monotonic()
+    first_delta_at = None
+    events = []
+    async for event in summarizer.astream_with_structure(retriever, "query", TEST_DOC_TYPE, pages=24):
+        if event["event"] == "delta" and first_delta_at is None:
+            first_delta_at = time.monotonic() - start
+        events.append(event)
+
+    assert events[0]["event"] == "outline"
+    summary = events[-1]["summary"]
+    streamed = "".join(e["text"] for e in events if e["event"] == "delta")
+    assert streamed == summary["content"]
+    assert summary["content"] == "\n\n".join(f"Part {i} says hello." for i in (1, 2, 3))
+    assert first_delta_at < 0.2  # the first word, not the whole 0.3 s part
+    assert summary["metadata"]["parallel"] is True
@@ -0,0 +1,95 @@
+"""
+Tests for batch PDF summarization.
+"""
+import asyncio
+import json
+import pytest
+from unittest.mock import AsyncMock, patch, MagicMock
+from fastapi.testclient import TestClient
+
+from services.pdf_service import PDFClass
+from sources.pdf_loader import PDFExtractionResult
+
+TEST_DOC_TYPE = "Research Paper Summary"
+FILES = [(f"paper_{i}.pdf", b"%PDF-1.4 fake") for i in range(5)]
+
+
+@pytest.fixture
+def pdf_service():
+    service = PDFClass()
+    service.new_retriever = MagicMock()
+    service.summarizer = MagicMock()
+    service.summarizer.asummarize_with_structure = AsyncMock(
+        side_effect=lambda retriever, text, doc_type, pages: {"content": f"Summary of {text}"}
+    )
+    return service
+
+
+async def collect(events):
+    return [event async for event in events]
+
+
+@pytest.mark.asyncio
+async def test_batch_summarizes_every_file_with_bounded_concurrency(pdf_service):
+    active = 0
+    peak = 0
+
+    async def fake_extract(self, pdf_bytes):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.05)
+        active -= 1
+        return PDFExtractionResult(text="body", metadata={"page_count": 1})
+
+    with patch("services.pdf_service.PDFManager.extract_bytes", fake_extract), \
+         patch("services.pdf_service.Config.BATCH_MAX_CONCURRENCY", 2):
+        events = await collect(pdf_service.process_pdf_batch(FILES, TEST_DOC_TYPE, 2))
+
+    assert peak == 2
+    assert events[0] == {"event": "accepted", "files": [name for name, _ in FILES]}
+    assert sum(e["event"] == "completed" for e in events) == len(FILES)
+    done = events[-1]
+    assert done["event"] == "done"
+    assert [r["file"] for r in done["results"]] == [name for name, _ in FILES]
+    assert "download_link" not in done
+
+
+@pytest.mark.asyncio
+async def test_batch_reports_failures_and_builds_combined_report(pdf_service):
+    async def fake_extract(self, pdf_bytes):
+        if pdf_bytes == b"broken":
+            raise RuntimeError("Error reading PDF: bad xref")
+        return PDFExtractionResult(text="body", metadata={})
+
+    files = [("good.pdf", b"%PDF"), ("bad.pdf", b"broken")]
+    with patch("services.pdf_service.PDFManager.extract_bytes", fake_extract), \
+         patch.object(pdf_service, "save_docx", return_value="combined.docx") as mock_save:
+        events = await collect(pdf_service.process_pdf_batch(files, TEST_DOC_TYPE, 2, combined_report=True))
+
+    failed = [e for e in events if e["event"] == "failed"]
+    assert failed == [{"event": "failed", "index": 1, "file": "bad.pdf", "error": "Error reading PDF: bad xref"}]
+    assert events[-1]["download_link"] == "/download/combined.docx"
+    combined = mock_save.call_args[0][0]
+    assert "# good.pdf" in combined["content"]
+    assert "bad.pdf" not in combined["content"]
+
+
+def test_batch_endpoint_streams_ndjson(test_app):
+    async def fake_summarize(name, pdf_bytes, doc_type_str, pages):
+        return {"file": name, "summary": {"content": "ok"}, "metadata": {}}
+
+    with patch("api.pdf_service._summarize_pdf_bytes", side_effect=fake_summarize):
+        client = TestClient(test_app)
+        response = client.post(
+            "/summarize/pdf/batch",
+            files=[("files", (name, data, "application/pdf")) for name, data in FILES[:2]],
+            data={"doc_type": TEST_DOC_TYPE, "pages": "1"}
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert events[0]["event"] == "accepted"
+    assert events[-1]["event"] == "done"
+    assert len(events[-1]["results"]) == 2
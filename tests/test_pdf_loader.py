@@ -0,0 +1,67 @@
+"""
+Tests for PDF text extraction in sources.pdf_loader.
+"""
+import threading
+import time
+import pytest
+from unittest.mock import patch
+
+from sources.pdf_loader import PDFExtractor
+from tests import pdf_fakes
+from tests.pdf_fakes import FakeReader
+
+
+def test_slow_page_is_skipped_and_reported():
+    """A page that exceeds the per-page budget is skipped; the rest are still extracted."""
+    with patch("sources.pdf_loader.PdfReader", FakeReader):
+        start = time.monotonic()
+        result = PDFExtractor.extract_text_with_deadlines(b"%PDF", page_timeout=0.5, document_timeout=20)
+        elapsed = time.monotonic() - start
+
+    assert elapsed < 10
+    assert "Page one text" in result.text
+    assert "Page four text" in result.text
+    assert "never finishes" not in result.text
+    assert result.metadata["page_count"] == 4
+    assert result.metadata["skipped_pages"][0] == {"page": 2, "reason": "page_timeout"}
+    assert result.metadata["skipped_pages"][1]["page"] == 3
+    assert result.metadata["skipped_pages"][1]["reason"].startswith("error:")
+
+
+def test_document_budget_skips_remaining_pages():
+    """Once the document budget is spent, every unextracted page is reported as skipped."""
+    with patch("sources.pdf_loader.PdfReader", FakeReader):
+        result = PDFExtractor.extract_text_with_deadlines(b"%PDF", page_timeout=5, document_timeout=0.5)
+
+    assert "Page one text" in result.text
+    assert [p["page"] for p in result.metadata["skipped_pages"]] == [2, 3, 4]
+    assert all(p["reason"] == "document_timeout" for p in result.metadata["skipped_pages"])
+
+
+def test_unreadable_pdf_raises():
+    """Bytes that are not a PDF surface as a RuntimeError, as before."""
+    with pytest.raises(RuntimeError):
+        PDFExtractor.extract_text_with_deadlines(b"not a pdf", page_timeout=5, document_timeout=10)
+
+
+def test_extraction_is_safe_while_other_threads_hold_locks():
+    """Workers are not forked from this process, so a lock held by another thread cannot hang them."""
+    acquired, release = threading.Event(), threading.Event()
+
+    def hold():
+        with pdf_fakes.READER_LOCK:
+            acquired.set()
+            release.wait()
+
+    holder = threading.Thread(target=hold, daemon=True)
+    holder.start()
+    acquired.wait()
+    try:
+        with patch("sources.pdf_loader.PdfReader", pdf_fakes.LockingReader):
+            result = PDFExtractor.extract_text_with_deadlines(b"%PDF", page_timeout=2, document_timeout=10)
+    finally:
+        release.set()
+        holder.join()
+
+    assert result.pages == [f"Page {i} text" for i in range(1, 6)]
+    assert result.metadata["skipped_pages"] == []
@@ -0,0 +1,81 @@
+"""
+Tests for the shared DuckDuckGo result cache.
+"""
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+
+from sources.search_cache import SearchCache
+from sources.video_transcript import YouTubeSearch
+from sources.web_search import WebSearchManager
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SearchCache(path=str(tmp_path / "searches.sqlite3"), ttl=60, stale_ttl=3600)
+
+
+def test_identical_queries_hit_ddgs_once(cache):
+    results = [{"title": "A", "href": "https://a.example"}]
+    with patch("sources.web_search.DDGS") as mock_ddgs:
+        mock_ddgs.return_value.__enter__.return_value.text.return_value = results
+        manager = WebSearchManager(max_results=5, search_cache=cache)
+
+        first = manager.search("Climate  Policy")
+        second = manager.search("climate policy")
+
+    assert first == second == results
+    assert mock_ddgs.return_value.__enter__.return_value.text.call_count == 1
+
+
+def test_web_and_youtube_results_are_cached_separately(cache):
+    with patch("sources.web_search.DDGS") as web_ddgs, patch("sources.video_transcript.DDGS") as yt_ddgs:
+        web_ddgs.return_value.__enter__.return_value.text.return_value = [{"href": "https://a.example"}]
+        yt_ddgs.return_value.__enter__.return_value.text.return_value = [
+            {"title": "Video", "href": "https://www.youtube.com/watch?v=abcdefghijk"}
+        ]
+
+        WebSearchManager(max_results=5, search_cache=cache).search("query")
+        videos = YouTubeSearch(max_results=5, search_cache=cache).search("query")
+
+    assert videos[0]["href"].endswith("abcdefghijk")
+
+
+def test_shared_caches_are_opened_on_first_search_not_at_construction(cache):
+    with patch("sources.web_search.get_search_cache", return_value=cache) as web_cache, \
+         patch("sources.web_search.get_http_cache") as http_cache, \
+         patch("sources.video_transcript.get_search_cache", return_value=cache) as yt_cache:
+        manager = WebSearchManager()
+        searcher = YouTubeSearch()
+        assert not (web_cache.called or http_cache.called or yt_cache.called)
+
+        assert manager.search_cache is cache and searcher.search_cache is cache
+
+
+def test_stale_entry_is_served_while_one_refresh_runs(cache):
+    key = SearchCache.make_key("web", "query", 5)
+    cache.get_or_fetch(key, lambda: [{"v": 1}])
+    cache.ttl = 0  # everything is now stale but within stale_ttl
+
+    refreshed = threading.Event()
+    fetch = MagicMock(side_effect=lambda: (time.sleep(0.2), refreshed.set(), [{"v": 2}])[-1])
+
+    start = time.monotonic()
+    assert cache.get_or_fetch(key, fetch) == [{"v": 1}]
+    assert cache.get_or_fetch(key, fetch) == [{"v": 1}]
+    assert time.monotonic() - start < 0.2  # neither call waited for the refresh
+
+    assert refreshed.wait(2)
+    time.sleep(0.05)
+    assert fetch.call_count == 1
+    cache.ttl = 60
+    assert cache.get_or_fetch(key, fetch) == [{"v": 2}]
+
+
+def test_expired_entry_is_fetched_inline(cache):
+    key = SearchCache.make_key("web", "query", 5)
+    cache.get_or_fetch(key, lambda: [{"v": 1}])
+    cache.ttl, cache.stale_ttl = 0, 0
+
+    assert cache.get_or_fetch(key, lambda: [{"v": 2}]) == [{"v": 2}]
@@ -0,0 +1,69 @@
+"""
+Tests for the paper section index in hicore_api_extended.utils.parsing.
+"""
+from hicore_api_extended.utils.parsing import build_section_index
+
+PAPER = """A Study of Things
+Abstract
+We study things.
+Contents
+1. Introduction 1
+2. Methods 3
+3. Results 5
+1. Introduction
+Things matter and have been studied before.
+2. Materials and Methods
+We measured the things carefully over a long period of time.
+3. Results and Discussion
+The things were measured.
+Conclusions:
+Things are measurable.
+References
+[1] Someone, Things, 2001.
+Appendix
+Extra tables.
+"""
+
+
+def body(text, index, name):
+    start, end = index[name]
+    return text[start:end].strip()
+
+
+def test_aliases_map_to_canonical_sections():
+    index = build_section_index(PAPER)
+
+    assert body(PAPER, index, "abstract").startswith("We study things.")
+    assert body(PAPER, index, "methods") == "We measured the things carefully over a long period of time."
+    assert body(PAPER, index, "results") == "The things were measured."
+    assert body(PAPER, index, "conclusion") == "Things are measurable."
+
+
+def test_table_of_contents_lines_are_not_headings():
+    index = build_section_index(PAPER)
+
+    # "1. Introduction 1" ends in a page number, so the body starts at the real heading
+    assert body(PAPER, index, "introduction") == "Things matter and have been studied before."
+
+
+def test_repeated_heading_keeps_the_longest_body():
+    text = "Introduction\nShort.\nMethods\nStep one.\nIntroduction\nThe real introduction is much longer than the first.\n"
+
+    index = build_section_index(text)
+
+    assert body(text, index, "introduction") == "The real introduction is much longer than the first."
+    assert body(text, index, "methods") == "Step one."
+
+
+def test_sections_after_the_references_are_dropped():
+    text = "Results\nNumbers.\nReferences\n[1] A paper.\nSummary\nA stray heading in the bibliography.\n"
+
+    index = build_section_index(text)
+
+    assert set(index) == {"results", "references"}
+    assert body(text, index, "references") == "[1] A paper."
+
+
+def test_text_without_headings_has_no_sections():
+    assert build_section_index("Just a paragraph of text.") == {}
+    assert build_section_index("") == {}
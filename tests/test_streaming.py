@@ -0,0 +1,68 @@
+"""
+Tests for streamed /summarize responses.
+"""
+import json
+from unittest.mock import MagicMock, patch
+from fastapi.testclient import TestClient
+
+TEST_DOC_TYPE = "Blog Post"
+
+
+async def _fake_stream(retriever, query, doc_type, pages, use_cache=True):
+    for word in ("Hello ", "streamed ", "world."):
+        yield {"event": "delta", "text": word}
+    yield {"event": "summary", "summary": {"content": "Hello streamed world."}}
+
+
+def _post_text(test_app, stream):
+    import api
+    with patch.object(api.text_service, "new_retriever", return_value=MagicMock()), \
+         patch.object(api.text_service.summarizer, "astream_with_structure", side_effect=_fake_stream), \
+         patch.object(api.text_service, "save_docx", return_value="text.docx") as save_docx:
+        response = TestClient(test_app).post(
+            "/summarize/text", data={"text": "Some text", "doc_type": TEST_DOC_TYPE, "stream": stream}
+        )
+    return response, save_docx
+
+
+def test_text_summary_streams_ndjson_deltas_then_the_download_link(test_app):
+    response, save_docx = _post_text(test_app, "ndjson")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [e["event"] for e in events] == ["started", "generating", "delta", "delta", "delta", "done"]
+    assert "".join(e["text"] for e in events if e["event"] == "delta") == "Hello streamed world."
+    assert events[-1]["download_link"] == "/download/text.docx"
+    assert events[-1]["raw_text"] == "Some text"
+    save_docx.assert_called_once_with({"content": "Hello streamed world."}, "text", TEST_DOC_TYPE)
+
+
+def test_text_summary_streams_server_sent_events(test_app):
+    response, _ = _post_text(test_app, "sse")
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    messages = [m for m in response.text.split("\n\n") if m]
+    assert messages[0] == 'event: started\ndata: {"event": "started"}'
+    last_event, last_data = messages[-1].split("\n")
+    assert last_event == "event: done"
+    assert json.loads(last_data[len("data: "):])["download_link"] == "/download/text.docx"
+
+
+def test_stream_failures_end_with_an_error_event(test_app):
+    import api
+    with patch.object(api.text_service, "new_retriever", side_effect=RuntimeError("index failed")):
+        response = TestClient(test_app).post(
+            "/summarize/text", data={"text": "Some text", "doc_type": TEST_DOC_TYPE, "stream": "ndjson"}
+        )
+
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert events[-1] == {"event": "error", "error": "index failed"}
+
+
+def test_unknown_stream_format_is_rejected(test_app):
+    response = TestClient(test_app).post(
+        "/summarize/text", data={"text": "Some text", "doc_type": TEST_DOC_TYPE, "stream": "xml"}
+    )
+
+    assert response.status_code == 400
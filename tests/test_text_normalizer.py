@@ -0,0 +1,58 @@
+"""
+Tests for the PDF text normalization pass.
+"""
+from sources.text_normalizer import TextNormalizer
+
+
+def make_page(number: int, body: str) -> str:
+    return (
+        "Journal of Testing, Vol. 12\n"
+        f"{body}\n"
+        f"Page {number} of 4\n"
+    )
+
+
+def test_running_headers_and_page_numbers_are_removed():
+    pages = [make_page(i, f"Body text for page {i} with  several   spaces.") for i in range(1, 5)]
+
+    result = TextNormalizer().normalize_pages(pages)
+
+    assert "Journal of Testing" not in result.text
+    assert "Page 1 of 4" not in result.text
+    assert "Body text for page 3 with several spaces." in result.text
+    assert result.metadata["running_lines_removed"] == 8
+    assert result.metadata["chars_removed"] > 0
+    assert result.metadata["est_tokens_removed"] == result.metadata["chars_removed"] // 4
+    assert result.metadata["chars_after"] == len(result.text)
+
+
+def test_dehyphenation_and_whitespace_collapse():
+    text = "The infor-\nmation was   ex-\n  tracted.\n\n\n\nNext paragraph.\n12\n"
+
+    result = TextNormalizer().normalize(text)
+
+    assert result.text == "The information was extracted.\n\nNext paragraph."
+    assert result.metadata["hyphenations_joined"] == 2
+    assert result.metadata["page_numbers_removed"] == 1
+
+
+def test_short_documents_keep_their_first_lines():
+    """Header detection needs enough pages to be meaningful; two pages are left alone."""
+    pages = ["Title\nIntro text", "Title\nMore text"]
+
+    result = TextNormalizer().normalize_pages(pages)
+
+    assert result.text.count("Title") == 2
+    assert result.metadata["running_lines_removed"] == 0
+
+
+def test_numbers_inside_the_body_are_not_page_numbers():
+    pages = [
+        "7\nRevenue by year\n2023\n1250\n2024\n1400\nEnd of table",
+        "Results continue here.\n8",
+    ]
+
+    result = TextNormalizer().normalize_pages(pages)
+
+    assert result.text == "Revenue by year\n2023\n1250\n2024\n1400\nEnd of table\nResults continue here."
+    assert result.metadata["page_numbers_removed"] == 2
@@ -0,0 +1,40 @@
+"""
+Tests for the compact transcript and timestamp-aligned chunking.
+"""
+from sources.transcript import Transcript, chunk_transcript
+
+
+def _snippets(texts, seconds=2.0):
+    return [{"text": text, "start": i * seconds, "duration": seconds} for i, text in enumerate(texts)]
+
+
+def test_chunks_keep_whole_snippets_and_their_time_span():
+    transcript = Transcript.from_snippets(_snippets([f"word{i} and more words here" for i in range(40)]))
+
+    chunks = chunk_transcript(transcript, max_chars=200, max_seconds=1000)
+
+    assert " ".join(chunk.text for chunk in chunks) == transcript.text
+    assert all(len(chunk.text) <= 200 for chunk in chunks)
+    assert chunks[0].start == 0.0
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert chunk.start == previous.end
+    assert chunks[-1].end == 80.0
+
+
+def test_chunks_close_at_sentence_ends_once_half_full():
+    texts = ["this is the first part", "of a sentence.", "another one starts", "and ends here."] * 5
+    transcript = Transcript.from_snippets(_snippets(texts))
+
+    chunks = chunk_transcript(transcript, max_chars=100, max_seconds=1000)
+
+    assert all(chunk.text.endswith(".") for chunk in chunks)
+
+
+def test_chunks_respect_the_time_window():
+    transcript = Transcript.from_snippets(_snippets(["short"] * 30, seconds=10.0))
+
+    chunks = chunk_transcript(transcript, max_chars=10000, max_seconds=60)
+
+    assert len(chunks) == 5
+    assert all(chunk.end - chunk.start <= 60 for chunk in chunks)
+    assert chunks[1].metadata() == {"start": 60.0, "end": 120.0, "words_per_second": 0.1}
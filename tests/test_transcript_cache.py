@@ -0,0 +1,99 @@
+"""
+Tests for the persistent YouTube transcript cache.
+"""
+import random
+import string
+import zlib
+import pytest
+from unittest.mock import patch
+
+from sources.transcript import Transcript
+from sources.transcript_cache import TranscriptCache
+from sources.video_transcript import YouTubeTranscriptFetcher
+
+VIDEO_URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+VIDEO_ID = "dQw4w9WgXcQ"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return TranscriptCache(path=str(tmp_path / "transcripts.sqlite3"), max_bytes=1024 * 1024)
+
+
+def _transcript(text: str) -> Transcript:
+    return Transcript.from_snippets([{"text": text, "start": 0.0, "duration": 2.5}])
+
+
+def test_round_trip_is_keyed_by_video_and_language(cache):
+    cache.put(VIDEO_ID, "en", _transcript("hello world"))
+    cache.put(VIDEO_ID, "de", _transcript("hallo welt"))
+
+    assert cache.get(VIDEO_ID, "en").text == "hello world"
+    assert cache.get(VIDEO_ID, "de").text == "hallo welt"
+    assert cache.get(VIDEO_ID, "fr") is None
+    assert cache.get("otherVideo1", "en") is None
+
+
+def test_snippet_timings_survive_the_round_trip(cache):
+    snippets = [
+        {"text": "first line", "start": 0.0, "duration": 1.5},
+        {"text": "it's \"quoted\"", "start": 1.5, "duration": 2.25},
+        {"text": "ünïcode", "start": 3.75, "duration": 1.0},
+    ]
+    cache.put(VIDEO_ID, "en", Transcript.from_snippets(snippets))
+    cached = cache.get(VIDEO_ID, "en")
+
+    assert cached.text == 'first line it\'s "quoted" ünïcode'
+    assert list(cached.starts) == [0.0, 1.5, 3.75]
+    assert list(cached.durations) == [1.5, 2.25, 1.0]
+    assert [cached.text[o:].split()[0] for o in cached.offsets] == ["first", "it's", "ünïcode"]
+
+
+def test_transcripts_are_stored_compressed(cache):
+    transcript = _transcript("never gonna give you up " * 500)
+    cache.put(VIDEO_ID, "en", transcript)
+
+    assert cache.total_bytes() == len(zlib.compress(transcript.to_bytes(), 6))
+    assert cache.total_bytes() < len(transcript.text) / 10
+
+
+def test_least_recently_read_transcripts_are_evicted(tmp_path):
+    def noise(seed):
+        # Random printable text compresses poorly, so each entry takes ~2.5 KB on disk.
+        rng = random.Random(seed)
+        return "".join(rng.choice(string.ascii_letters + string.digits) for _ in range(3000))
+
+    cache = TranscriptCache(path=str(tmp_path / "t.sqlite3"), max_bytes=6000)
+    cache.put("video_00001", "en", _transcript(noise(1)))
+    cache.put("video_00002", "en", _transcript(noise(2)))
+    cache.get("video_00001", "en")
+    cache.put("video_00003", "en", _transcript(noise(3)))
+
+    assert cache.total_bytes() <= 6000
+    assert cache.get("video_00002", "en") is None
+    assert cache.get("video_00001", "en").text == noise(1)
+    assert cache.get("video_00003", "en").text == noise(3)
+
+
+def test_repeated_fetch_skips_the_network(cache):
+    with patch("sources.video_transcript.get_transcript_cache", return_value=cache), \
+         patch("sources.video_transcript.YouTubeTranscriptApi") as mock_api:
+        mock_api.return_value.fetch.return_value = [{"text": "cached transcript text"}]
+
+        first = YouTubeTranscriptFetcher.get_transcript_direct(VIDEO_URL)
+        second = YouTubeTranscriptFetcher.get_transcript_direct(f"https://youtu.be/{VIDEO_ID}")
+
+    assert first == second
+    assert "cached transcript text" in second
+    assert mock_api.return_value.fetch.call_count == 1
+
+
+def test_errors_are_not_cached(cache):
+    with patch("sources.video_transcript.get_transcript_cache", return_value=cache), \
+         patch("sources.video_transcript.YouTubeTranscriptApi") as mock_api:
+        mock_api.return_value.fetch.side_effect = Exception("Transcripts are disabled")
+
+        result = YouTubeTranscriptFetcher.get_transcript_direct(VIDEO_URL)
+
+    assert result.startswith("Error:")
+    assert cache.get(VIDEO_ID, "en") is None
@@ -0,0 +1,45 @@
+"""
+Tests for URL canonicalization and content fingerprints in sources.url_dedup.
+"""
+import pytest
+
+from sources.url_dedup import canonicalize_url, content_fingerprint, dedupe_results, is_near_duplicate
+
+ARTICLE = " ".join(f"Sentence {i} of the syndicated story about grid storage." for i in range(40))
+
+
+@pytest.mark.parametrize("variant", [
+    "http://www.example.com/news/story?utm_source=twitter&utm_medium=social",
+    "https://m.example.com/news/story/",
+    "https://example.com/news/story/amp",
+    "https://amp.example.com/news/story.amp",
+    "https://EXAMPLE.com:443/news//story#comments",
+    "https://example.com/news/story?fbclid=abc",
+])
+def test_variants_share_one_canonical_url(variant):
+    assert canonicalize_url(variant) == "https://example.com/news/story"
+
+
+def test_meaningful_query_parameters_are_kept_and_sorted():
+    assert canonicalize_url("https://example.com/search?q=solar&page=2&utm_campaign=x") == \
+        "https://example.com/search?page=2&q=solar"
+    assert canonicalize_url("https://example.com/a?id=1") != canonicalize_url("https://example.com/a?id=2")
+
+
+def test_dedupe_results_keeps_the_first_ranked_copy():
+    results = [
+        {"title": "Original", "href": "https://www.example.com/story?utm_source=x"},
+        {"title": "Other", "href": "https://other.example/page"},
+        {"title": "Mobile copy", "href": "https://m.example.com/story"},
+    ]
+
+    assert [r["title"] for r in dedupe_results(results)] == ["Original", "Other"]
+
+
+def test_near_duplicate_text_is_detected():
+    mirror = "Mirror Daily | Republished. " + ARTICLE[: len(ARTICLE) * 3 // 4]
+    unrelated = " ".join(f"Recipe step {i}: whisk the eggs and fold in the flour." for i in range(40))
+
+    assert is_near_duplicate(content_fingerprint(ARTICLE), content_fingerprint(mirror))
+    assert not is_near_duplicate(content_fingerprint(ARTICLE), content_fingerprint(unrelated))
+    assert not is_near_duplicate(content_fingerprint(""), content_fingerprint(ARTICLE))
@@ -0,0 +1,238 @@
+"""
+Tests for page fetching in sources.web_search.
+"""
+import time
+import pytest
+from unittest.mock import patch
+
+from sources.pdf_loader import PDFExtractionResult
+from sources.web_search import WebSearchManager
+
+ARTICLE = b"<html><body><nav>menu</nav><article>" + b"Useful article text. " * 20 + b"</article></body></html>"
+
+
+def _results(server, paths):
+    return [{"title": path, "href": f"{server.url}/{path}"} for path in paths]
+
+
+def _article(topic):
+    sentences = " ".join(f"{topic} article sentence {i}." for i in range(20))
+    return f"<html><body><nav>menu</nav><article>{sentences}</article></body></html>".encode()
+
+
+@pytest.mark.asyncio
+async def test_pages_are_fetched_concurrently(local_http_server):
+    topics = ["Solar", "Wind", "Hydro", "Nuclear", "Tidal"]
+    for i, topic in enumerate(topics):
+        local_http_server.routes[f"/page{i}"] = {"body": _article(topic), "delay": 0.5}
+
+    manager = WebSearchManager(per_host_delay=0)
+    start = time.monotonic()
+    pages = await manager.fetch_pages(_results(local_http_server, [f"page{i}" for i in range(5)]))
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 1.5  # serial fetching would take 2.5s+
+    assert [p.text.split()[0] for p in pages] == topics
+    assert all(p.error is None for p in pages)
+    assert "menu" not in pages[0].text
+
+
+@pytest.mark.asyncio
+async def test_requests_to_one_host_are_spaced_out(local_http_server):
+    for i in range(3):
+        local_http_server.routes[f"/page{i}"] = {"body": ARTICLE}
+
+    await WebSearchManager(per_host_delay=0.3).fetch_pages(_results(local_http_server, ["page0", "page1", "page2"]))
+
+    starts = sorted(t for _, _, t in local_http_server.requests)
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert len(starts) == 3
+    assert all(gap >= 0.25 for gap in gaps)
+
+
+@pytest.mark.asyncio
+async def test_arun_keeps_rank_order_and_reports_errors(local_http_server):
+    local_http_server.routes["/slow"] = {"body": ARTICLE, "delay": 0.3}
+    search_results = [
+        {"title": "Slow page", "href": f"{local_http_server.url}/slow"},
+        {"title": "Missing page", "href": f"{local_http_server.url}/missing"},
+    ]
+
+    manager = WebSearchManager(per_host_delay=0)
+    with patch.object(manager, "search", return_value=search_results):
+        text = await manager.arun("test query")
+
+    assert text.index("1. Slow page") < text.index("2. Missing page")
+    assert "Content: Useful article text." in text
+    assert "Content: Error extracting content:" in text
+
+
+def test_large_pages_are_cut_at_the_byte_cap(local_http_server):
+    local_http_server.routes["/huge"] = {"body": ARTICLE * 500}
+    manager = WebSearchManager(max_page_bytes=4096)
+
+    text = manager.extract_page_content(f"{local_http_server.url}/huge")
+
+    assert text.startswith("Useful article text.")
+    assert len(text) < 4096
+
+
+def test_a_pdf_of_exactly_the_cap_is_kept():
+    manager = WebSearchManager()
+    pdf = b"%PDF-1.4" + b"0" * 1016
+
+    assert manager._read_capped(iter([pdf[:512], pdf[512:]]), "pdf", 1024) == pdf
+    with pytest.raises(ValueError, match="PDF exceeded 1024 bytes"):
+        manager._read_capped(iter([pdf, b"0"]), "pdf", 1024)
+
+
+def test_binary_downloads_are_rejected_from_headers(local_http_server):
+    local_http_server.routes["/image"] = {"body": b"\x89PNG" * 1000, "headers": {"Content-Type": "image/png"}}
+
+    text = WebSearchManager().extract_page_content(f"{local_http_server.url}/image")
+
+    assert text == "Error extracting content: Unsupported content type: image/png"
+
+
+@pytest.mark.asyncio
+async def test_pdf_results_go_to_the_pdf_extractor(local_http_server):
+    local_http_server.routes["/paper.pdf"] = {"body": b"%PDF-1.4 body", "headers": {"Content-Type": "application/pdf"}}
+    local_http_server.routes["/big.pdf"] = {"body": b"%PDF-1.4" + b"0" * 5000, "headers": {"Content-Type": "application/pdf"}}
+    manager = WebSearchManager(per_host_delay=0, max_pdf_bytes=1024)
+
+    with patch(
+        "sources.web_search.PDFManager.extract_bytes_sync",
+        return_value=PDFExtractionResult(text="Extracted   paper text", metadata={})
+    ) as mock_extract:
+        paper, big = await manager.fetch_pages(_results(local_http_server, ["paper.pdf", "big.pdf"]))
+
+    assert (paper.text, paper.error) == ("Extracted paper text", None)
+    mock_extract.assert_called_once_with(b"%PDF-1.4 body")
+    assert big.text == ""
+    assert big.error.startswith("PDF too large")
+
+
+@pytest.mark.asyncio
+async def test_asearch_pages_returns_full_structured_records(local_http_server):
+    local_http_server.routes["/long"] = {"body": b"<html><body><article>" + b"Useful article text. " * 100 + b"</article></body></html>"}
+    search_results = [
+        {"title": "Long page", "href": f"{local_http_server.url}/long"},
+        {"title": "Missing page", "href": f"{local_http_server.url}/missing"},
+    ]
+
+    manager = WebSearchManager(per_host_delay=0, max_snippet_length=50)
+    with patch.object(manager, "search", return_value=search_results):
+        pages = await manager.asearch_pages("test query")
+
+    long_page, missing = pages
+    assert (long_page.rank, long_page.title, long_page.url) == (1, "Long page", search_results[0]["href"])
+    assert len(long_page.text) > 1000  # not cut to max_snippet_length
+    assert long_page.error is None
+    assert long_page.fetch_seconds > 0
+    assert missing.rank == 2
+    assert missing.text == ""
+    assert "404" in missing.error
+
+
+@pytest.mark.asyncio
+async def test_fetching_stops_once_the_content_budget_is_met(local_http_server):
+    def page(topic):
+        sentences = " ".join(f"{topic} sentence number {i}." for i in range(20))
+        return f"<html><body><article>{sentences}</article></body></html>".encode()
+
+    local_http_server.routes["/fast1"] = {"body": page("Article text first")}
+    local_http_server.routes["/copy"] = {"body": page("Article text first")}
+    local_http_server.routes["/fast2"] = {"body": page("Article text second")}
+    local_http_server.routes["/offtopic"] = {"body": page("Cooking recipe")}
+    local_http_server.routes["/slow"] = {"body": page("Article text slow"), "delay": 3}
+    search_results = [
+        {"title": name, "href": f"{local_http_server.url}/{name}"}
+        for name in ("offtopic", "fast1", "copy", "fast2", "slow")
+    ]
+
+    manager = WebSearchManager(per_host_delay=0)
+    start = time.monotonic()
+    pages = await manager.fetch_pages(search_results, query="article text", char_budget=800)
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 2  # the slow page was cancelled, not awaited
+    titles = [p.title for p in pages]
+    assert "slow" not in titles
+    assert {"fast1", "fast2"} <= set(titles)
+    assert [p.rank for p in pages] == sorted(p.rank for p in pages)
+
+
+@pytest.mark.asyncio
+async def test_a_slow_top_result_is_not_crowded_out_by_faster_pages(local_http_server):
+    def page(topic):
+        sentences = " ".join(f"{topic} sentence number {i}." for i in range(20))
+        return f"<html><body><article>{sentences}</article></body></html>".encode()
+
+    local_http_server.routes["/slow"] = {"body": page("Article text slow"), "delay": 0.5}
+    for name in ("fast1", "fast2", "fast3"):
+        local_http_server.routes[f"/{name}"] = {"body": page(f"Article text {name}")}
+    search_results = [
+        {"title": name, "href": f"{local_http_server.url}/{name}"}
+        for name in ("slow", "fast1", "fast2", "fast3")
+    ]
+
+    pages = await WebSearchManager(per_host_delay=0).fetch_pages(search_results, query="article text", char_budget=800)
+
+    # The fast pages alone would fill the budget; counting in rank order keeps rank 1
+    assert pages[0].title == "slow"
+    assert pages[0].text.startswith("Article text slow")
+
+
+def test_content_budget_counts_unique_relevant_text():
+    from sources.web_search import ContentBudget, WebPage
+
+    budget = ContentBudget(char_budget=60, query="solar power")
+    page = WebPage(rank=1, url="u", text="Solar power is growing. Costs are falling.")
+
+    assert not budget.add(WebPage(rank=2, url="u", text="Nothing relevant here at all. " * 10))
+    assert not budget.add(page)
+    assert not budget.add(page)  # the same sentences again add nothing
+    assert budget.collected == len("solar power is growing.") + len("costs are falling.")
+    assert budget.add(WebPage(rank=3, url="u", text="Solar power needs storage too."))
+
+
+@pytest.mark.asyncio
+async def test_duplicate_urls_and_mirrors_are_fetched_or_kept_once(local_http_server):
+    story = " ".join(f"Battery storage paragraph {i} explains grid balancing." for i in range(30))
+    article = f"<html><body><article>{story}</article></body></html>".encode()
+    local_http_server.routes["/story"] = {"body": article}
+    local_http_server.routes["/story?utm_source=feed"] = {"body": article}
+    local_http_server.routes["/mirror"] = {"body": b"<html><body><article>Mirror copy. " + story.encode() + b"</article></body></html>"}
+    local_http_server.routes["/syndicated"] = {
+        "body": b'<html><head><link rel="canonical" href="/story"></head><body><p>Short teaser only.</p></body></html>'
+    }
+    search_results = [
+        {"title": "Story", "href": f"{local_http_server.url}/story"},
+        {"title": "Tracked", "href": f"{local_http_server.url}/story?utm_source=feed"},
+        {"title": "Mirror", "href": f"{local_http_server.url}/mirror"},
+        {"title": "Syndicated", "href": f"{local_http_server.url}/syndicated"},
+    ]
+
+    pages = await WebSearchManager(per_host_delay=0).fetch_pages(search_results)
+
+    assert [p.title for p in pages] == ["Story"]
+    assert pages[0].duplicates == [f"{local_http_server.url}/mirror", f"{local_http_server.url}/syndicated"]
+    assert "/story?utm_source=feed" not in [path for path, _, _ in local_http_server.requests]
+
+
+@pytest.mark.asyncio
+async def test_manager_runs_offline_against_the_fixture_server():
+    from benchmarks.fixture_server import FixtureServer
+
+    server = FixtureServer(hosts=2, synthetic_pages=6).start()
+    try:
+        manager = WebSearchManager(max_results=4, per_host_delay=0, search_endpoint=server.search_url)
+        with patch("sources.web_search.DDGS") as mock_ddgs:
+            pages = await manager.asearch_pages("grid storage")
+    finally:
+        server.stop()
+
+    mock_ddgs.assert_not_called()
+    assert [p.rank for p in pages] == [1, 2, 3, 4]
+    assert all(p.error is None and p.text.startswith("Story") for p in pages)
+    assert {p.url.split("/")[2].split(":")[0] for p in pages} == {"127.0.0.1", "127.0.0.2"}
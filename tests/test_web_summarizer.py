@@ -2,9 +2,10 @@
 Tests for the web summarization functionality.
 """
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from fastapi import status
 from services.types import DocumentTypeEnum
+from sources.web_search import WebPage
 
 # Test data
 TEST_QUERY = "test query"
@@ -24,8 +25,11 @@ class TestWebSummarizer:
              patch('api.LLMSummarizer') as mock_summarizer:
             
             # Setup mocks
-            mock_web_manager.return_value.run.return_value = "Test web content"
-            mock_retriever.return_value.process_text.return_value = None
+            mock_web_manager.return_value.asearch_pages = AsyncMock(return_value=[
+                WebPage(rank=1, url="https://example.com", title="Example", text="Test web content")
+            ])
+            mock_web_manager.return_value.format_results.return_value = "Test web content"
+            mock_retriever.return_value.process_documents.return_value = None
             mock_summarizer.return_value.summarize_with_structure.return_value = TEST_SUMMARY
             
             # Make the request
@@ -74,7 +78,7 @@ class TestWebSummarizer:
     async def test_summarize_web_error_handling(self, async_client):
         """Test error handling in web summarization."""
         with patch('services.web_service.WebSearchManager') as mock_web_manager:
-            mock_web_manager.return_value.run.side_effect = Exception("Test error")
+            mock_web_manager.return_value.asearch_pages = AsyncMock(side_effect=Exception("Test error"))
             
             response = await async_client.post(
                 "/summarize/web",
@@ -87,3 +91,32 @@ class TestWebSummarizer:
             
             assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
             assert "error" in response.json()
+
+
+@pytest.mark.asyncio
+async def test_each_page_is_indexed_as_its_own_document():
+    from services.web_service import WebClass
+
+    pages = [
+        WebPage(rank=1, url="https://a.example", title="A", text="Alpha content"),
+        WebPage(rank=2, url="https://b.example", title="B", error="HTTP 404"),
+        WebPage(rank=3, url="https://c.example", title="C", text="Gamma content"),
+    ]
+    service = WebClass.__new__(WebClass)
+    retriever = MagicMock()
+    service.new_retriever = MagicMock(return_value=retriever)
+    service.summarizer = MagicMock()
+    service.summarizer.asummarize_with_structure = AsyncMock(return_value={"content": TEST_SUMMARY})
+    service.save_docx = MagicMock(return_value="web.docx")
+
+    with patch('services.web_service.WebSearchManager') as mock_web_manager:
+        mock_web_manager.return_value.asearch_pages = AsyncMock(return_value=pages)
+        mock_web_manager.return_value.format_results.return_value = "formatted"
+        result = await service.process(TEST_QUERY, DocumentTypeEnum(TEST_DOC_TYPE), TEST_PAGES)
+
+    texts, metadatas = retriever.process_documents.call_args[0]
+    assert texts == ["Alpha content", "Gamma content"]
+    assert [m["url"] for m in metadatas] == ["https://a.example", "https://c.example"]
+    assert metadatas[0]["title"] == "A" and metadatas[0]["source"] == "web"
+    assert [r["error"] for r in result["results"]] == [None, "HTTP 404", None]
+    assert result["results"][0]["chars"] == len("Alpha content")
@@ -0,0 +1,143 @@
+"""
+Tests for batch and playlist YouTube summarization.
+"""
+import json
+import time
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from fastapi.testclient import TestClient
+
+from config import Config
+from services.youtube_service import YouTubeClass
+from sources.transcript import Transcript
+from sources.video_transcript import parse_playlist_export
+
+TEST_DOC_TYPE = "Blog Post"
+IDS = ["aaaaaaaaaa1", "bbbbbbbbbb2", "cccccccccc3", "brokenvid04"]
+URLS = [f"https://www.youtube.com/watch?v={video_id}" for video_id in IDS]
+
+
+def _fake_get_transcript(url, language="en"):
+    video_id = url.rsplit("=", 1)[-1]
+    if video_id == "brokenvid04":
+        raise RuntimeError("Transcripts are disabled")
+    time.sleep(0.05)
+    return Transcript.from_snippets([
+        {"text": f"Video {video_id} opens with a point.", "start": 0.0, "duration": 4.0},
+        {"text": "Then it makes another one.", "start": 4.0, "duration": 3.0},
+    ])
+
+
+@pytest.fixture
+def youtube_service():
+    service = YouTubeClass()
+    service.new_retriever = MagicMock(return_value=MagicMock(chunk_size=1000))
+    service.summarizer = MagicMock()
+    service.summarizer.asummarize_with_structure = AsyncMock(return_value={"content": "Combined summary"})
+    return service
+
+
+async def collect(events):
+    return [event async for event in events]
+
+
+def test_parse_playlist_export_formats():
+    yt_dlp = json.dumps({"entries": [
+        {"id": IDS[0], "url": URLS[0]},
+        {"id": IDS[1], "url": f"https://youtu.be/{IDS[1]}"},
+        {"id": IDS[0], "url": URLS[0]},
+    ]}).encode()
+    takeout = f"Video ID,Playlist Video Creation Timestamp\n{IDS[2]},2024-01-01T00:00:00+00:00\n{IDS[0]},2024-01-02T00:00:00+00:00\n".encode()
+    lines = f"{URLS[1]}&list=PL123\n\nnot a video\nhttps://www.youtube.com/embed/{IDS[2]}\n".encode()
+
+    assert parse_playlist_export(yt_dlp) == URLS[:2]
+    assert parse_playlist_export(takeout) == [URLS[2], URLS[0]]
+    assert parse_playlist_export(lines) == [URLS[1], URLS[2]]
+    assert parse_playlist_export(json.dumps(IDS[:2]).encode()) == URLS[:2]
+
+
+@pytest.mark.asyncio
+async def test_batch_builds_one_index_and_one_summary(youtube_service):
+    with patch("services.youtube_service.YouTubeTranscriptFetcher.get_transcript", side_effect=_fake_get_transcript), \
+         patch.object(youtube_service, "save_docx", return_value="batch.docx"):
+        events = await collect(youtube_service.process_youtube_batch(URLS, TEST_DOC_TYPE, 2))
+
+    assert events[0] == {"event": "accepted", "videos": URLS}
+    assert sorted(e["index"] for e in events if e["event"] == "started") == [0, 1, 2, 3]
+    failed = [e for e in events if e["event"] == "failed"]
+    assert [(e["index"], e["error"]) for e in failed] == [(3, "Transcripts are disabled")]
+    assert events[-2] == {"event": "summarizing", "videos": 3}
+
+    done = events[-1]
+    assert done["summary"] == {"content": "Combined summary"}
+    assert done["download_link"] == "/download/batch.docx"
+    assert [v["ok"] for v in done["videos"]] == [True, True, True, False]
+
+    # One index over every fetched video, each chunk tagged with its video and offset
+    retriever = youtube_service.new_retriever.return_value
+    retriever.process_chunks.assert_called_once()
+    chunks, metadatas = retriever.process_chunks.call_args[0]
+    assert {m["video_id"] for m in metadatas} == set(IDS[:3])
+    assert metadatas[0]["url"] == f"{URLS[0]}&t=0s"
+    youtube_service.summarizer.asummarize_with_structure.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_batch_fetches_transcripts_concurrently(youtube_service):
+    urls = [f"https://www.youtube.com/watch?v=video{i:06d}" for i in range(5)]
+    with patch.object(Config, "YOUTUBE_MAX_WORKERS", 5), \
+         patch("services.youtube_service.YouTubeTranscriptFetcher.get_transcript", side_effect=_fake_get_transcript), \
+         patch.object(youtube_service, "save_docx", return_value="batch.docx"):
+        start = time.monotonic()
+        events = await collect(youtube_service.process_youtube_batch(urls, TEST_DOC_TYPE, 2))
+        elapsed = time.monotonic() - start
+
+    assert elapsed < 0.2  # five 50 ms fetches in parallel, not 250 ms in sequence
+    assert all(v["ok"] for v in events[-1]["videos"])
+
+
+def test_batch_endpoint_streams_ndjson(test_app):
+    async def fake_batch(urls, doc_type, pages):
+        yield {"event": "accepted", "videos": urls}
+        yield {"event": "done", "videos": [{"index": i, "url": u, "ok": True} for i, u in enumerate(urls)]}
+
+    with patch("api.youtube_service.process_youtube_batch", side_effect=fake_batch):
+        client = TestClient(test_app)
+        response = client.post(
+            "/summarize/youtube/batch",
+            data={"urls": URLS[0], "doc_type": TEST_DOC_TYPE, "pages": "1"},
+            files={"playlist": ("playlist.txt", f"{URLS[1]}\n{URLS[0]}\n".encode(), "text/plain")}
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert events[0] == {"event": "accepted", "videos": URLS[:2]}
+    assert events[-1]["event"] == "done"
+
+
+def test_batch_endpoint_rejects_requests_without_videos(test_app):
+    client = TestClient(test_app)
+    response = client.post("/summarize/youtube/batch", data={"urls": "nothing here", "doc_type": TEST_DOC_TYPE})
+
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_batch_reports_hung_videos_as_timed_out(youtube_service):
+    def hanging_get_transcript(url, language="en"):
+        if url == URLS[0]:
+            time.sleep(2)
+        return _fake_get_transcript(url, language)
+
+    with patch.object(Config, "YOUTUBE_MAX_WORKERS", 2), patch.object(Config, "YOUTUBE_VIDEO_TIMEOUT", 0.3), \
+         patch("services.youtube_service.YouTubeTranscriptFetcher.get_transcript", side_effect=hanging_get_transcript), \
+         patch.object(youtube_service, "save_docx", return_value="batch.docx"):
+        start = time.monotonic()
+        events = await collect(youtube_service.process_youtube_batch(URLS[:3], TEST_DOC_TYPE, 2))
+        elapsed = time.monotonic() - start
+
+    assert elapsed < 1  # the per-video timeout applies, not the 2s hang
+    assert [(e["index"], e["error"]) for e in events if e["event"] == "failed"] == [(0, "timeout")]
+    assert [v["ok"] for v in events[-1]["videos"]] == [False, True, True]
+    assert events[-1]["summary"] == {"content": "Combined summary"}
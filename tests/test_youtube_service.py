@@ -2,9 +2,11 @@ import pytest
 from unittest.mock import MagicMock, patch, AsyncMock
 from fastapi import HTTPException
 from fastapi.responses import JSONResponse
+from youtube_transcript_api import FetchedTranscriptSnippet
 
 # Import the service to test
 from services.youtube_service import YouTubeClass
+from sources.transcript import Transcript
 from sources.video_transcript import YouTubeTranscriptFetcher, YouTubeSearch, YouTubeTranscriptManager
 from services.types import DocumentTypeEnum
 
@@ -36,7 +38,7 @@ def youtube_service():
 
 @pytest.fixture
 def mock_transcript_fetcher():
-    with patch('sources.video_transcript.YouTubeTranscriptFetcher') as mock:
+    with patch('services.youtube_service.YouTubeTranscriptFetcher') as mock:
         yield mock
 
 @pytest.fixture
@@ -88,6 +90,22 @@ def test_get_transcript_direct():
         # Verify the API was called with the correct video ID
         mock_api.return_value.fetch.assert_called_once_with(TEST_VIDEO_ID)
 
+def test_get_transcript_reads_snippet_objects():
+    """Snippets are read field by field, so quotes in the text survive intact."""
+    snippets = [
+        FetchedTranscriptSnippet(text="He said 'hello'", start=0.0, duration=2.0),
+        FetchedTranscriptSnippet(text="and\nthen left", start=2.0, duration=3.5),
+    ]
+    with patch('sources.video_transcript.YouTubeTranscriptApi') as mock_api:
+        mock_api.return_value.fetch.return_value = snippets
+
+        transcript = YouTubeTranscriptFetcher.get_transcript(TEST_VIDEO_URL)
+
+    assert transcript.text == "He said 'hello' and then left"
+    assert list(transcript.starts) == [0.0, 2.0]
+    assert list(transcript.durations) == [2.0, 3.5]
+    assert list(transcript.offsets) == [0, 16]
+
 def test_youtube_search():
     """Test searching for YouTube videos."""
     # Create a mock for the search results
@@ -128,13 +146,17 @@ async def test_process_youtube_success(youtube_service):
     test_filename = "test_doc.docx"
     
     # Mock the YouTubeTranscriptFetcher
-    with patch('sources.video_transcript.YouTubeTranscriptFetcher') as mock_fetcher:
+    with patch('services.youtube_service.YouTubeTranscriptFetcher') as mock_fetcher:
         # Setup the fetcher mock
-        mock_fetcher.return_value.get_transcript_direct.return_value = test_transcript
+        mock_fetcher.get_transcript.return_value = Transcript.from_snippets(
+            [{'text': test_transcript, 'start': 42.0, 'duration': 3.0}]
+        )
+        mock_fetcher.timestamp_url.side_effect = YouTubeTranscriptFetcher.timestamp_url
         
         # Mock the retriever and summarizer
-        youtube_service.retriever.process_text = MagicMock()
-        youtube_service.summarizer.summarize_with_structure = MagicMock(return_value=test_summary)
+        retriever = MagicMock(chunk_size=1000)
+        youtube_service.new_retriever = MagicMock(return_value=retriever)
+        youtube_service.summarizer.asummarize_with_structure = AsyncMock(return_value=test_summary)
         
         # Mock the save_docx method
         with patch.object(youtube_service, 'save_docx', return_value=test_filename) as mock_save_docx:
@@ -151,16 +173,19 @@ async def test_process_youtube_success(youtube_service):
             assert result["download_link"] == f"/download/{test_filename}"
             
             # Verify the mocks were called correctly
-            mock_fetcher.return_value.get_transcript_direct.assert_called_once_with(TEST_VIDEO_URL)
-            youtube_service.retriever.process_text.assert_called_once()
-            youtube_service.summarizer.summarize_with_structure.assert_called_once()
+            mock_fetcher.get_transcript.assert_called_once_with(TEST_VIDEO_URL)
+            chunks, metadatas = retriever.process_chunks.call_args[0]
+            assert chunks == [test_transcript]
+            assert metadatas[0]["start"] == 42.0
+            assert metadatas[0]["url"] == f"https://www.youtube.com/watch?v={TEST_VIDEO_ID}&t=42s"
+            youtube_service.summarizer.asummarize_with_structure.assert_awaited_once()
             mock_save_docx.assert_called_once()
 
 @pytest.mark.asyncio
 async def test_process_youtube_error(youtube_service, mock_transcript_fetcher):
     """Test error handling in process_youtube."""
     # Setup mock to raise an exception
-    mock_transcript_fetcher.return_value.get_transcript_direct.side_effect = Exception("Test error")
+    mock_transcript_fetcher.get_transcript.side_effect = Exception("Test error")
     
     # Call the method and check the error response
     result = await youtube_service.process_youtube(
@@ -173,3 +198,70 @@ async def test_process_youtube_error(youtube_service, mock_transcript_fetcher):
     assert isinstance(result, JSONResponse)
     assert result.status_code == 500
     assert "error" in result.body.decode()
+
+
+def _fake_transcript(url):
+    """Per-video behaviour keyed on the URL: slow, hanging, failing or normal."""
+    import time
+    video = url.rsplit("=", 1)[-1]
+    if video == "hang":
+        time.sleep(3)
+    elif video == "broken":
+        raise RuntimeError("Transcripts are disabled")
+    time.sleep(0.3)
+    return Transcript.from_snippets([{"text": f"Transcript of {video}", "start": 0.0, "duration": 1.0}])
+
+
+def test_transcripts_are_fetched_concurrently_in_rank_order():
+    import time
+    videos = [{"rank": i + 1, "title": f"V{i}", "href": f"https://www.youtube.com/watch?v=vid{i}"} for i in range(5)]
+    manager = YouTubeTranscriptManager(max_workers=5, video_timeout=5)
+    manager.fetcher = MagicMock(get_transcript=MagicMock(side_effect=_fake_transcript))
+
+    start = time.monotonic()
+    result = manager.fetch_transcripts(videos)
+
+    assert time.monotonic() - start < 1.2  # serial fetching takes 1.5s+
+    assert result.text == "\n\n".join(f"Transcript of vid{i}" for i in range(5))
+    assert result.metadata["succeeded"] == 5
+    assert all(v["ok"] and v["seconds"] >= 0.3 for v in result.metadata["videos"])
+
+
+def test_failed_and_slow_videos_leave_partial_results():
+    import time
+    videos = [
+        {"rank": 1, "title": "Hangs", "href": "https://www.youtube.com/watch?v=hang"},
+        {"rank": 2, "title": "Broken", "href": "https://www.youtube.com/watch?v=broken"},
+        {"rank": 3, "title": "Fine", "href": "https://www.youtube.com/watch?v=fine"},
+    ]
+    manager = YouTubeTranscriptManager(max_workers=3, video_timeout=1)
+    manager.fetcher = MagicMock(get_transcript=MagicMock(side_effect=_fake_transcript))
+
+    start = time.monotonic()
+    result = manager.fetch_transcripts(videos)
+
+    assert time.monotonic() - start < 2
+    assert result.text == "Transcript of fine"
+    hang, broken, fine = result.metadata["videos"]
+    assert (hang["ok"], hang["error"]) == (False, "timeout")
+    assert (broken["ok"], broken["error"]) == (False, "Transcripts are disabled")
+    assert fine["ok"] and fine["rank"] == 3
+    assert result.metadata["failed"] == 2
+
+
+def test_hung_fetches_cannot_hold_queued_videos_past_the_deadline():
+    import time
+    videos = [
+        {"rank": 1, "title": "Hangs", "href": "https://www.youtube.com/watch?v=hang"},
+        {"rank": 2, "title": "Queued", "href": "https://www.youtube.com/watch?v=queued"},
+    ]
+    manager = YouTubeTranscriptManager(max_workers=1, video_timeout=0.5)
+    manager.fetcher = MagicMock(get_transcript=MagicMock(side_effect=_fake_transcript))
+
+    start = time.monotonic()
+    result = manager.fetch_transcripts(videos)
+
+    assert time.monotonic() - start < 1.5  # ceil(2 / 1) * 0.5s, not the 3s hang
+    hang, queued = result.metadata["videos"]
+    assert (hang["ok"], hang["error"]) == (False, "timeout")
+    assert (queued["ok"], queued["error"], queued["seconds"]) == (False, "timeout", 0)